@@ -1,5 +1,95 @@
 import sqlite3
 import os
+import threading
+import time
+from contextlib import contextmanager
+
+from app.db.migrations import aplicar_migraciones
+from app.db.query_stats import CursorInstrumentado, EstadisticasConsultas, origen_llamada
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    Conexión SQLite de larga vida, una por hilo.
+
+    Los servicios siguen el patrón `conn = db.get_connection() ... conn.close()`;
+    aquí `close()` solo devuelve el préstamo al pool. La conexión física queda
+    abierta (con su caché de sentencias y esquema ya parseado) para el siguiente uso.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._prestamos = 0
+        self._savepoints = 0  # Bloques transaction() anidados abiertos
+        self._en_bloque = False  # Hay un transaction() abierto: él confirma o deshace
+
+    def close(self):
+        if self._prestamos > 0:
+            self._prestamos -= 1
+        # Igual que un close() real: lo no confirmado se descarta al soltar el último préstamo
+        if self._prestamos == 0 and self.in_transaction:
+            self.rollback()
+
+    def close_physical(self):
+        super().close()
+
+    # --- Instrumentación (ver app/db/query_stats.py) ---
+
+    _instrumentada = False
+
+    def instrumentar(self):
+        """Mide cada sentencia (cursores instrumentados) y cuenta las que SQLite ejecuta (trace)."""
+        self._instrumentada = True
+        self._sentencias = 0
+        self.set_trace_callback(self._trazar)
+
+    def _trazar(self, sentencia):
+        self._sentencias += 1
+
+    def cursor(self, factory=None):
+        if factory is None:
+            factory = CursorInstrumentado if self._instrumentada else sqlite3.Cursor
+        return super().cursor(factory)
+
+    # Connection.execute* (en C) no pasan por cursor(): se redirigen para que se midan
+    def execute(self, sql, parametros=()):
+        if not self._instrumentada:
+            return super().execute(sql, parametros)
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, secuencia):
+        if not self._instrumentada:
+            return super().executemany(sql, secuencia)
+        return self.cursor().executemany(sql, secuencia)
+
+    def executescript(self, script):
+        if not self._instrumentada:
+            return super().executescript(script)
+        return self.cursor().executescript(script)
+
+    def _sin_bloque_abierto(self, operacion):
+        # La conexión es la misma para todo el hilo: un commit()/rollback() suelto dentro de
+        # transaction() confirmaría o descartaría el trabajo de quien abrió el bloque
+        if self._en_bloque:
+            raise sqlite3.ProgrammingError(
+                f"{operacion}() dentro de Database.transaction(): el bloque confirma o deshace al salir"
+            )
+
+    def rollback(self):
+        self._sin_bloque_abierto("rollback")
+        super().rollback()
+
+    def commit(self):
+        self._sin_bloque_abierto("commit")
+        # El COMMIT es donde el WAL escribe a disco: se registra como una sentencia más
+        if not (self._instrumentada and self.in_transaction):
+            return super().commit()
+        origen = origen_llamada()
+        inicio = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            EstadisticasConsultas().registrar("COMMIT", (time.perf_counter() - inicio) * 1000, origen=origen)
 
 
 class Database:
@@ -9,89 +99,132 @@ class Database:
     DB_DIR = os.path.join(os.environ.get('APPDATA', os.path.expanduser('~')), 'SmartCredit')
     DB_NAME = os.path.join(DB_DIR, 'smartcredit.db')
 
+    # PRAGMAs aplicados a cada conexión nueva del pool.
+    # cache_size negativo = KiB (aprox. 16 MB); mmap_size en bytes (64 MB).
+    PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    }
+    # Medición de consultas (latencia, filas, origen) para el panel de diagnóstico. Desactivada
+    # por defecto: cuesta unos µs por sentencia. main.py la activa según la configuración
+    INSTRUMENTAR = False
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(Database, cls).__new__(cls)
+            cls._instance._local = threading.local()
+            cls._instance._lock = threading.Lock()
+            cls._instance._conexiones = []
             # CHANGE: Crear directorio si no existe
             # REASON: Garantizar que la carpeta existe antes de conectar
             os.makedirs(cls.DB_DIR, exist_ok=True)
             cls._instance.init_db()
         return cls._instance
 
+    @classmethod
+    def reset(cls, db_dir=None):
+        """
+        Cierra todas las conexiones del pool y descarta el singleton.
+        Si se indica `db_dir`, la próxima instancia usará esa carpeta (tests, modo portable).
+        """
+        if cls._instance is not None:
+            cls._instance.close_all()
+            cls._instance = None
+        if db_dir is not None:
+            cls.DB_DIR = db_dir
+            cls.DB_NAME = os.path.join(db_dir, 'smartcredit.db')
+
+    def _create_connection(self):
+        # check_same_thread=False solo para que close_all() pueda cerrarlas desde el hilo principal;
+        # cada conexión se usa exclusivamente desde el hilo que la creó.
+        conn = sqlite3.connect(self.DB_NAME, factory=PooledConnection, check_same_thread=False)
+        for pragma, valor in self.PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma} = {valor}")
+        if self.INSTRUMENTAR:
+            conn.instrumentar()
+        with self._lock:
+            self._conexiones.append(conn)
+        return conn
+
     def get_connection(self):
-        return sqlite3.connect(self.DB_NAME)
+        """Devuelve la conexión reutilizable del hilo actual (crearla si no existe)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._create_connection()
+            self._local.conn = conn
+        conn._prestamos += 1
+        return conn
 
-    def init_db(self):
+    @contextmanager
+    def connection(self):
+        """Préstamo de la conexión del hilo para lecturas: `with db.connection() as conn:`."""
         conn = self.get_connection()
-        cursor = conn.cursor()
-
-        # Tabla Inventario (Telefonos)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS inventario (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT NOT NULL,
-                costo_original_usd REAL NOT NULL,
-                stock INTEGER NOT NULL,
-                ruta_imagen TEXT
-            )
-        """)
-
-        # Tabla Clientes
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS clientes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT NOT NULL,
-                cedula TEXT UNIQUE NOT NULL,
-                telefono TEXT
-            )
-        """)
-
-        # Tabla Ventas
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ventas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                id_cliente INTEGER NOT NULL,
-                id_telefono INTEGER NOT NULL,
-                fecha TEXT NOT NULL,
-                tipo_venta TEXT NOT NULL,
-                precio_final_usd REAL NOT NULL,
-                pago_inicial_usd REAL,
-                saldo_pendiente_usd REAL,
-                cuotas_totales INTEGER,
-                monto_cuota_usd REAL,
-                tasa_cambio_usada REAL NOT NULL,
-                estado TEXT NOT NULL,
-                FOREIGN KEY (id_cliente) REFERENCES clientes (id),
-                FOREIGN KEY (id_telefono) REFERENCES inventario (id)
-            )
-        """)
-
-        # Tabla Abonos (Pagos Parciales)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS abonos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                venta_id INTEGER NOT NULL,
-                fecha TEXT NOT NULL,
-                monto_usd REAL NOT NULL,
-                tasa_cambio REAL NOT NULL,
-                monto_bs REAL NOT NULL,
-                notas TEXT,
-                FOREIGN KEY (venta_id) REFERENCES ventas (id)
-            )
-        """)
-
-        # Tabla Cuotas (Plan de Pagos)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS cuotas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                venta_id INTEGER NOT NULL,
-                numero_cuota INTEGER NOT NULL,
-                fecha_vencimiento TEXT NOT NULL,
-                monto_usd REAL NOT NULL,
-                estado TEXT NOT NULL DEFAULT 'Pendiente',
-                FOREIGN KEY (venta_id) REFERENCES ventas (id)
-            )
-        """)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def transaction(self, immediate=False):
+        """
+        Transacción explícita: commit al salir, rollback ante cualquier excepción.
+        `immediate=True` toma el lock de escritura al inicio (BEGIN IMMEDIATE).
+
+        La conexión es la misma para todo el hilo: si ya hay una transacción abierta, el
+        bloque es un SAVEPOINT dentro de ella. Al salir se libera (el commit lo hace quien
+        abrió la transacción) y ante un error solo se deshace lo del bloque. Mientras el
+        bloque está abierto, `conn.commit()`/`conn.rollback()` sueltos lanzan ProgrammingError.
+        """
+        conn = self.get_connection()
+        try:
+            if conn.in_transaction:
+                conn._savepoints += 1
+                nombre = f"sp_{conn._savepoints}"
+                conn.execute(f"SAVEPOINT {nombre}")
+                try:
+                    yield conn
+                    conn.execute(f"RELEASE {nombre}")
+                except BaseException:
+                    conn.execute(f"ROLLBACK TO {nombre}")
+                    conn.execute(f"RELEASE {nombre}")
+                    raise
+                finally:
+                    conn._savepoints -= 1
+                return
 
-        conn.commit()
-        conn.close()
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                conn._en_bloque = True
+                try:
+                    yield conn
+                finally:
+                    conn._en_bloque = False
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        finally:
+            conn.close()
+
+    def close_all(self):
+        """Cierra físicamente todas las conexiones del pool (al salir de la app)."""
+        with self._lock:
+            conexiones, self._conexiones = self._conexiones, []
+        for conn in conexiones:
+            try:
+                conn.close_physical()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def init_db(self):
+        """Lleva el esquema a la última versión (ver app/db/migrations.py)."""
+        conn = self.get_connection()
+        try:
+            aplicar_migraciones(conn)
+        finally:
+            conn.close()
@@ -0,0 +1,365 @@
+"""
+Migraciones versionadas del esquema.
+La versión aplicada vive en `PRAGMA user_version`; al arrancar solo se ejecutan
+las migraciones con número mayor, cada una en su propia transacción.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+
+logger = logging.getLogger("SmartCredit")
+
+
+def _v1_esquema_base(cursor):
+    """Tablas originales. IF NOT EXISTS porque las BD previas ya las tienen (user_version = 0)."""
+    # Tabla Inventario (Telefonos)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS inventario (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            costo_original_usd REAL NOT NULL,
+            stock INTEGER NOT NULL,
+            ruta_imagen TEXT
+        )
+    """)
+
+    # Tabla Clientes
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS clientes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            cedula TEXT UNIQUE NOT NULL,
+            telefono TEXT
+        )
+    """)
+
+    # Tabla Ventas
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ventas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id_cliente INTEGER NOT NULL,
+            id_telefono INTEGER NOT NULL,
+            fecha TEXT NOT NULL,
+            tipo_venta TEXT NOT NULL,
+            precio_final_usd REAL NOT NULL,
+            pago_inicial_usd REAL,
+            saldo_pendiente_usd REAL,
+            cuotas_totales INTEGER,
+            monto_cuota_usd REAL,
+            tasa_cambio_usada REAL NOT NULL,
+            estado TEXT NOT NULL,
+            FOREIGN KEY (id_cliente) REFERENCES clientes (id),
+            FOREIGN KEY (id_telefono) REFERENCES inventario (id)
+        )
+    """)
+
+    # Tabla Abonos (Pagos Parciales)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS abonos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            venta_id INTEGER NOT NULL,
+            fecha TEXT NOT NULL,
+            monto_usd REAL NOT NULL,
+            tasa_cambio REAL NOT NULL,
+            monto_bs REAL NOT NULL,
+            notas TEXT,
+            FOREIGN KEY (venta_id) REFERENCES ventas (id)
+        )
+    """)
+
+    # Tabla Cuotas (Plan de Pagos)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS cuotas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            venta_id INTEGER NOT NULL,
+            numero_cuota INTEGER NOT NULL,
+            fecha_vencimiento TEXT NOT NULL,
+            monto_usd REAL NOT NULL,
+            estado TEXT NOT NULL DEFAULT 'Pendiente',
+            FOREIGN KEY (venta_id) REFERENCES ventas (id)
+        )
+    """)
+
+
+def _v2_abonos_metodo(cursor):
+    """Columna `metodo` en abonos (antes la agregaba PaymentService._ensure_schema)."""
+    cursor.execute("PRAGMA table_info(abonos)")
+    columns = [info[1] for info in cursor.fetchall()]
+    if "metodo" not in columns:
+        cursor.execute("ALTER TABLE abonos ADD COLUMN metodo TEXT DEFAULT 'Efectivo'")
+
+
+def _v3_indices_consultas(cursor):
+    """Índices para las consultas calientes (alertas, historial por cliente, abonos por venta)."""
+    # Parcial: solo cuotas pendientes, ordenadas por vencimiento (badge, alertas)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_cuotas_pendientes_fecha
+        ON cuotas (fecha_vencimiento, venta_id) WHERE estado = 'Pendiente'
+    """)
+    # Plan de una venta (join ventas -> cuotas)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cuotas_venta ON cuotas (venta_id, numero_cuota)")
+    # Historial de un cliente ordenado por fecha
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ventas_cliente_fecha ON ventas (id_cliente, fecha)")
+    # Abonos de una venta ordenados por fecha
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_abonos_venta_fecha ON abonos (venta_id, fecha)")
+
+
+def _v4_venta_items(cursor):
+    """Líneas de venta (carrito). Las ventas previas se respaldan como una línea de 1 unidad."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS venta_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            venta_id INTEGER NOT NULL,
+            id_telefono INTEGER NOT NULL,
+            cantidad INTEGER NOT NULL CHECK (cantidad > 0),
+            precio_unitario_usd REAL NOT NULL,
+            subtotal_usd REAL NOT NULL,
+            FOREIGN KEY (venta_id) REFERENCES ventas (id),
+            FOREIGN KEY (id_telefono) REFERENCES inventario (id)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_venta_items_venta ON venta_items (venta_id)")
+    cursor.execute("""
+        INSERT INTO venta_items (venta_id, id_telefono, cantidad, precio_unitario_usd, subtotal_usd)
+        SELECT v.id, v.id_telefono, 1, v.precio_final_usd, v.precio_final_usd
+        FROM ventas v
+        WHERE NOT EXISTS (SELECT 1 FROM venta_items vi WHERE vi.venta_id = v.id)
+    """)
+
+
+def _v5_feriados(cursor):
+    """Calendario local de feriados: los vencimientos que caen en estas fechas se corren al siguiente día hábil."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS feriados (
+            fecha TEXT PRIMARY KEY,
+            descripcion TEXT
+        )
+    """)
+
+
+def _v6_imputacion_cuotas(cursor):
+    """
+    Monto pagado por cuota y estado 'Parcial'. El índice parcial pasa a cubrir toda cuota
+    no pagada ('Pendiente' o 'Parcial'), y lo ya abonado se imputa a las cuotas más antiguas.
+    """
+    cursor.execute("PRAGMA table_info(cuotas)")
+    if "monto_pagado_usd" not in [info[1] for info in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE cuotas ADD COLUMN monto_pagado_usd REAL NOT NULL DEFAULT 0")
+
+    cursor.execute("DROP INDEX IF EXISTS idx_cuotas_pendientes_fecha")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_cuotas_abiertas_fecha
+        ON cuotas (fecha_vencimiento, venta_id) WHERE estado <> 'Pagada'
+    """)
+
+    # Lo cubierto de cada venta = suma de sus cuotas - saldo pendiente, repartido en orden
+    cursor.execute("""
+        WITH cubierto AS (
+            SELECT v.id AS venta_id, MAX(SUM(q.monto_usd) - v.saldo_pendiente_usd, 0) AS monto
+            FROM ventas v JOIN cuotas q ON q.venta_id = v.id
+            WHERE v.estado <> 'Pagada'
+            GROUP BY v.id
+        ),
+        imputacion AS (
+            SELECT q.id,
+                   MIN(q.monto_usd, MAX(c.monto - COALESCE(SUM(q.monto_usd) OVER (
+                       PARTITION BY q.venta_id ORDER BY q.numero_cuota
+                       ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING), 0), 0)) AS aplicado
+            FROM cuotas q JOIN cubierto c ON c.venta_id = q.venta_id
+        )
+        UPDATE cuotas
+        SET monto_pagado_usd = imputacion.aplicado,
+            estado = CASE WHEN cuotas.monto_usd - imputacion.aplicado < 0.01 THEN 'Pagada' ELSE 'Parcial' END
+        FROM imputacion
+        WHERE cuotas.id = imputacion.id AND imputacion.aplicado > 0
+    """)
+    cursor.execute("UPDATE cuotas SET monto_pagado_usd = monto_usd WHERE estado = 'Pagada'")
+
+
+def _v7_estado_creditos(cursor):
+    """Resumen materializado por venta para el panel de control (ver ServicioEstadoCreditos)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS estado_creditos (
+            venta_id INTEGER PRIMARY KEY,
+            id_cliente INTEGER NOT NULL,
+            id_telefono INTEGER NOT NULL,
+            saldo_pendiente_usd REAL NOT NULL,
+            proxima_cuota_numero INTEGER NOT NULL,
+            proxima_cuota_fecha TEXT NOT NULL,
+            proxima_cuota_monto REAL NOT NULL,
+            FOREIGN KEY (venta_id) REFERENCES ventas (id)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_estado_creditos_fecha ON estado_creditos (proxima_cuota_fecha)")
+    cursor.execute("DELETE FROM estado_creditos")
+    cursor.execute("""
+        INSERT INTO estado_creditos (
+            venta_id, id_cliente, id_telefono, saldo_pendiente_usd,
+            proxima_cuota_numero, proxima_cuota_fecha, proxima_cuota_monto
+        )
+        SELECT v.id, v.id_cliente, v.id_telefono, v.saldo_pendiente_usd,
+               q.numero_cuota, q.fecha_vencimiento, q.monto_usd - q.monto_pagado_usd
+        FROM ventas v
+        JOIN cuotas q ON q.id = (
+            SELECT id FROM cuotas
+            WHERE venta_id = v.id AND estado <> 'Pagada'
+            ORDER BY fecha_vencimiento, numero_cuota
+            LIMIT 1
+        )
+        WHERE v.saldo_pendiente_usd > 0
+    """)
+
+
+def _v8_tasas_cambio(cursor):
+    """Historial de tasas (vigente desde una fecha). Se respalda con las tasas usadas en ventas y abonos."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tasas_cambio (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            vigente_desde TEXT NOT NULL UNIQUE,
+            tasa REAL NOT NULL CHECK (tasa > 0),
+            fuente TEXT NOT NULL DEFAULT 'manual'
+        )
+    """)
+    # UNIQUE crea el índice por fecha que usan las búsquedas puntuales y por rango
+    cursor.execute("""
+        INSERT OR IGNORE INTO tasas_cambio (vigente_desde, tasa, fuente)
+        SELECT fecha, tasa, fuente FROM (
+            SELECT fecha, tasa_cambio_usada AS tasa, 'venta' AS fuente FROM ventas WHERE tasa_cambio_usada > 0
+            UNION ALL
+            SELECT fecha, tasa_cambio, 'abono' FROM abonos WHERE tasa_cambio > 0
+        )
+        ORDER BY fecha
+    """)
+    # La tasa que el usuario tiene configurada es la vigente, no la de la última venta o abono
+    tasa = _tasa_configurada(cursor)
+    ultima = cursor.execute("SELECT tasa FROM tasas_cambio ORDER BY vigente_desde DESC LIMIT 1").fetchone()
+    if tasa is not None and ultima is not None and ultima[0] != tasa:
+        cursor.execute(
+            "INSERT OR IGNORE INTO tasas_cambio (vigente_desde, tasa, fuente) VALUES (?, ?, 'configuracion')",
+            (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), tasa),
+        )
+
+
+def _tasa_configurada(cursor):
+    """
+    `tasa_cambio` de config.json (junto a la BD o, en versiones previas, en el directorio
+    de trabajo), o None. Se lee el archivo directamente: ConfigService depende de Database.
+    """
+    archivo = cursor.execute("PRAGMA database_list").fetchone()[2]
+    rutas = [os.path.join(os.path.dirname(archivo), "config.json")] if archivo else []
+    rutas.append("config.json")
+    for ruta in rutas:
+        if not os.path.exists(ruta):
+            continue
+        try:
+            with open(ruta, "r") as f:
+                tasa = float(json.load(f).get("tasa_cambio"))
+        except (OSError, TypeError, ValueError):
+            return None
+        return tasa if tasa > 0 else None
+    return None
+
+
+def _v9_indice_historial(cursor):
+    """Paginación por cursor (fecha, id) del historial de ventas, recorrida en orden descendente."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ventas_fecha_id ON ventas (fecha, id)")
+
+
+# Tablas FTS5 de contenido externo: el texto vive en la tabla original y los triggers
+# mantienen el índice. unicode61 sin diacríticos ("jose" encuentra "José"); los índices
+# de prefijo de 2 y 3 letras abaratan las búsquedas mientras se escribe.
+_FTS_TABLAS = {
+    "clientes": ("nombre", "cedula", "telefono"),
+    "inventario": ("nombre",),
+}
+
+
+def _v10_busqueda_fts(cursor):
+    """Índices FTS5 de clientes e inventario. Si el SQLite no trae FTS5, la búsqueda usa LIKE."""
+    for tabla, columnas in _FTS_TABLAS.items():
+        lista = ", ".join(columnas)
+        nuevos = ", ".join(f"new.{c}" for c in columnas)
+        viejos = ", ".join(f"old.{c}" for c in columnas)
+        try:
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {tabla}_fts USING fts5(
+                    {lista}, content='{tabla}', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 no disponible ({e}): la búsqueda de {tabla} usará LIKE.")
+            continue
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {tabla}_fts_ai AFTER INSERT ON {tabla} BEGIN
+                INSERT INTO {tabla}_fts (rowid, {lista}) VALUES (new.id, {nuevos});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {tabla}_fts_ad AFTER DELETE ON {tabla} BEGIN
+                INSERT INTO {tabla}_fts ({tabla}_fts, rowid, {lista}) VALUES ('delete', old.id, {viejos});
+            END
+        """)
+        # Solo cuando cambia una columna indexada (el stock cambia en cada venta)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {tabla}_fts_au AFTER UPDATE OF {lista} ON {tabla} BEGIN
+                INSERT INTO {tabla}_fts ({tabla}_fts, rowid, {lista}) VALUES ('delete', old.id, {viejos});
+                INSERT INTO {tabla}_fts (rowid, {lista}) VALUES (new.id, {nuevos});
+            END
+        """)
+        cursor.execute(f"INSERT INTO {tabla}_fts ({tabla}_fts) VALUES ('rebuild')")
+
+
+# (versión, descripción, función). Agregar siempre al final con número consecutivo.
+MIGRACIONES = [
+    (1, "Esquema base", _v1_esquema_base),
+    (2, "Columna abonos.metodo", _v2_abonos_metodo),
+    (3, "Índices de consultas frecuentes", _v3_indices_consultas),
+    (4, "Tabla venta_items (ventas con carrito)", _v4_venta_items),
+    (5, "Tabla feriados (calendario de cuotas)", _v5_feriados),
+    (6, "Imputación de abonos por cuota (monto_pagado_usd, estado Parcial)", _v6_imputacion_cuotas),
+    (7, "Tabla estado_creditos (panel de control)", _v7_estado_creditos),
+    (8, "Tabla tasas_cambio (historial de tasas)", _v8_tasas_cambio),
+    (9, "Índice del historial de ventas por fecha", _v9_indice_historial),
+    (10, "Búsqueda de texto completo (FTS5) en clientes e inventario", _v10_busqueda_fts),
+]
+
+VERSION_ACTUAL = MIGRACIONES[-1][0]
+
+
+def obtener_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def aplicar_migraciones(conn):
+    """
+    Aplica las migraciones pendientes y retorna la versión final del esquema.
+    Si la BD ya está al día, el costo es una sola lectura de `PRAGMA user_version`.
+    """
+    version = obtener_version(conn)
+    if version >= VERSION_ACTUAL:
+        return version
+
+    for numero, descripcion, migracion in MIGRACIONES:
+        if numero <= version:
+            continue
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            # Otro proceso pudo migrar mientras esperábamos el lock
+            if obtener_version(conn) >= numero:
+                conn.rollback()
+                continue
+            migracion(cursor)
+            cursor.execute(f"PRAGMA user_version = {numero}")
+            conn.commit()
+            logger.info(f"Migración {numero} aplicada: {descripcion}")
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error en migración {numero} ({descripcion}): {e}")
+            raise
+    return obtener_version(conn)
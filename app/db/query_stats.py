@@ -0,0 +1,274 @@
+"""
+Instrumentación de consultas: latencia, filas y origen de cada sentencia SQL.
+
+Con `Database.INSTRUMENTAR` (opción `instrumentar_consultas` de la configuración) las
+conexiones del pool usan `CursorInstrumentado`: mide cada sentencia desde `execute()`
+hasta que se terminan de leer sus filas (solo el tiempo dentro de las llamadas, no el
+que el servicio pasa procesando entre un fetch y otro) y la atribuye al método de
+servicio que la ejecutó. El `set_trace_callback` de la conexión cuenta las sentencias
+que SQLite corre de verdad: una inserción que dispara triggers (índices FTS) cuenta más
+de una.
+
+`EstadisticasConsultas` agrega por texto SQL (llamadas, tiempo total/máximo, filas,
+histograma por cubos) y escribe en el log las que superan `umbral_lenta_ms`.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from functools import lru_cache
+
+logger = logging.getLogger("SmartCredit")
+
+# Límite superior (ms) de cada cubo del histograma; lo que pase el último cae en un cubo extra
+CUBOS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
+# Marcos que no cuentan como origen de una consulta (la capa de BD y la stdlib)
+_ARCHIVOS_INTERNOS = {os.path.abspath(__file__), os.path.abspath(os.path.join(os.path.dirname(__file__), "database.py"))}
+_origen_por_codigo = {}
+
+
+@lru_cache(maxsize=1024)
+def normalizar_sql(sql):
+    """'SELECT *\\n   FROM t' -> 'SELECT * FROM t' (clave de agregación)."""
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def origen_llamada():
+    """'sales_service.ServiceVentas.obtener_estado_cuenta': primer marco fuera de la capa de BD."""
+    marco = sys._getframe(1)
+    while marco is not None:
+        codigo = marco.f_code
+        if codigo.co_filename not in _ARCHIVOS_INTERNOS and not codigo.co_filename.endswith("contextlib.py"):
+            origen = _origen_por_codigo.get(codigo)
+            if origen is None:
+                modulo = os.path.splitext(os.path.basename(codigo.co_filename))[0]
+                nombre = getattr(codigo, "co_qualname", codigo.co_name)
+                origen = _origen_por_codigo.setdefault(codigo, f"{modulo}.{nombre}")
+            return origen
+        marco = marco.f_back
+    return "?"
+
+
+def _cubo(duracion_ms):
+    for i, limite in enumerate(CUBOS_MS):
+        if duracion_ms <= limite:
+            return i
+    return len(CUBOS_MS)
+
+
+class EstadisticaConsulta:
+    """Agregado de una sentencia (por texto SQL normalizado)."""
+
+    __slots__ = ("sql", "llamadas", "total_ms", "max_ms", "filas", "sentencias", "histograma", "origenes")
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.llamadas = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.filas = 0
+        self.sentencias = 0  # Ejecutadas por SQLite (incluye las de triggers)
+        self.histograma = [0] * (len(CUBOS_MS) + 1)
+        self.origenes = {}  # origen -> llamadas
+
+    @property
+    def promedio_ms(self):
+        return self.total_ms / self.llamadas if self.llamadas else 0.0
+
+    def percentil_ms(self, p):
+        """Límite superior del cubo donde cae el percentil `p` (0-100); inf si es el último."""
+        objetivo = self.llamadas * p / 100
+        acumulado = 0
+        for i, cantidad in enumerate(self.histograma):
+            acumulado += cantidad
+            if cantidad and acumulado >= objetivo:
+                return CUBOS_MS[i] if i < len(CUBOS_MS) else float("inf")
+        return 0.0
+
+    def copia(self):
+        otra = EstadisticaConsulta(self.sql)
+        for campo in self.__slots__[1:]:
+            valor = getattr(self, campo)
+            setattr(otra, campo, valor.copy() if isinstance(valor, (list, dict)) else valor)
+        return otra
+
+
+class EstadisticasConsultas:
+    """
+    Registro en memoria de todas las consultas del proceso (singleton, seguro entre hilos).
+
+    `umbral_lenta_ms` se toma de la configuración al arrancar (ver main.py); `top()`
+    alimenta el panel de diagnóstico.
+    """
+
+    _instance = None
+    UMBRAL_LENTA_MS = 100.0
+    MAX_SENTENCIAS = 500  # Textos distintos que se guardan; el resto se agrupa en OTRAS
+    OTRAS = "(otras sentencias)"
+    ORDENES = {
+        "total": lambda e: e.total_ms,
+        "promedio": lambda e: e.promedio_ms,
+        "maximo": lambda e: e.max_ms,
+        "llamadas": lambda e: e.llamadas,
+        "filas": lambda e: e.filas,
+    }
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(EstadisticasConsultas, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance.umbral_lenta_ms = cls.UMBRAL_LENTA_MS
+            cls._instance.reiniciar()
+        return cls._instance
+
+    def reiniciar(self):
+        with self._lock:
+            self._consultas = {}  # sql normalizado -> EstadisticaConsulta
+            self._desde = time.time()
+
+    def registrar(self, sql, duracion_ms, filas=0, origen="?", sentencias=1):
+        clave = normalizar_sql(sql)
+        with self._lock:
+            estadistica = self._consultas.get(clave)
+            if estadistica is None:
+                if len(self._consultas) >= self.MAX_SENTENCIAS:
+                    clave = self.OTRAS
+                    estadistica = self._consultas.get(clave)
+                if estadistica is None:
+                    estadistica = self._consultas[clave] = EstadisticaConsulta(clave)
+            estadistica.llamadas += 1
+            estadistica.total_ms += duracion_ms
+            estadistica.max_ms = max(estadistica.max_ms, duracion_ms)
+            estadistica.filas += filas
+            estadistica.sentencias += sentencias
+            estadistica.histograma[_cubo(duracion_ms)] += 1
+            estadistica.origenes[origen] = estadistica.origenes.get(origen, 0) + 1
+
+        if duracion_ms >= self.umbral_lenta_ms:
+            # Solo el texto con sus `?`: los valores (nombres, teléfonos, montos) no van al log
+            logger.warning(f"Consulta lenta: {duracion_ms:.1f} ms, {filas} filas, en {origen}: {clave[:300]}")
+
+    def top(self, n=20, orden="total"):
+        """Las `n` sentencias con mayor `orden` (ver ORDENES), como copias."""
+        with self._lock:
+            copias = [e.copia() for e in self._consultas.values()]
+        return sorted(copias, key=self.ORDENES[orden], reverse=True)[:n]
+
+    def totales(self):
+        """(llamadas, ms totales, segundos desde el último reinicio)."""
+        with self._lock:
+            llamadas = sum(e.llamadas for e in self._consultas.values())
+            total = sum(e.total_ms for e in self._consultas.values())
+            return llamadas, total, time.time() - self._desde
+
+    def resumen(self, n=10, orden="total"):
+        """Texto con las `n` sentencias más costosas, una por línea (log al cerrar, panel)."""
+        lineas = [f"{'llamadas':>8} {'total ms':>10} {'prom ms':>8} {'max ms':>8} {'filas':>8}  sentencia"]
+        for e in self.top(n, orden):
+            origen = max(e.origenes, key=e.origenes.get) if e.origenes else "?"
+            lineas.append(
+                f"{e.llamadas:>8} {e.total_ms:>10.1f} {e.promedio_ms:>8.2f} {e.max_ms:>8.1f} {e.filas:>8}"
+                f"  [{origen}] {e.sql[:120]}"
+            )
+        return "\n".join(lineas)
+
+
+class CursorInstrumentado(sqlite3.Cursor):
+    """
+    Cursor que registra cada sentencia en `EstadisticasConsultas`.
+
+    La medición queda abierta mientras haya filas por leer y se cierra cuando se agotan
+    (fetchall, fetchone que devuelve None, fin de la iteración), al ejecutar otra sentencia
+    o al liberar el cursor (`conn.execute(...).fetchone()` suelta el cursor enseguida).
+    """
+
+    _medicion = None  # [sql, segundos, filas, origen, sentencias]
+
+    def _abrir(self, sql, ejecutar):
+        self._cerrar()
+        conn = self.connection
+        origen = origen_llamada()
+        trazadas = getattr(conn, "_sentencias", 0)
+        inicio = time.perf_counter()
+        try:
+            ejecutar()
+        finally:
+            duracion = time.perf_counter() - inicio
+            sentencias = max(getattr(conn, "_sentencias", 0) - trazadas, 1)
+            self._medicion = [sql, duracion, 0, origen, sentencias]
+            if self.description is None:
+                # Escritura o error: no hay filas por leer
+                self._medicion[2] = max(self.rowcount, 0)
+                self._cerrar()
+        return self
+
+    def _cerrar(self):
+        medicion, self._medicion = self._medicion, None
+        if medicion is not None:
+            sql, duracion, filas, origen, sentencias = medicion
+            EstadisticasConsultas().registrar(sql, duracion * 1000, filas, origen, sentencias)
+
+    def _leer(self, leer):
+        inicio = time.perf_counter()
+        resultado = leer()
+        if self._medicion is not None:
+            self._medicion[1] += time.perf_counter() - inicio
+        return resultado
+
+    def execute(self, sql, parametros=()):
+        return self._abrir(sql, lambda: super(CursorInstrumentado, self).execute(sql, parametros))
+
+    def executemany(self, sql, secuencia):
+        return self._abrir(sql, lambda: super(CursorInstrumentado, self).executemany(sql, secuencia))
+
+    def executescript(self, script):
+        return self._abrir(script, lambda: super(CursorInstrumentado, self).executescript(script))
+
+    def fetchone(self):
+        fila = self._leer(super().fetchone)
+        if fila is None:
+            self._cerrar()
+        elif self._medicion is not None:
+            self._medicion[2] += 1
+        return fila
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        filas = self._leer(lambda: super(CursorInstrumentado, self).fetchmany(size))
+        if self._medicion is not None:
+            self._medicion[2] += len(filas)
+        if len(filas) < size:
+            self._cerrar()
+        return filas
+
+    def fetchall(self):
+        filas = self._leer(super().fetchall)
+        if self._medicion is not None:
+            self._medicion[2] += len(filas)
+        self._cerrar()
+        return filas
+
+    def __next__(self):
+        try:
+            fila = self._leer(super().__next__)
+        except StopIteration:
+            self._cerrar()
+            raise
+        if self._medicion is not None:
+            self._medicion[2] += 1
+        return fila
+
+    def close(self):
+        self._cerrar()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._cerrar()
+        except Exception:
+            pass  # Al cerrar el intérprete los módulos ya pueden no estar
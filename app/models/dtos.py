@@ -4,6 +4,9 @@ Estructuras inmutables para pasar datos entre capas con tipado fuerte.
 """
 
 from dataclasses import dataclass
+from functools import cached_property
+
+from app.utils.notification_templates import NotificationTemplates
 
 
 @dataclass(frozen=True)
@@ -29,6 +32,19 @@ class CalculoVentaDTO:
     monto_cuota_bs: float
 
 
+@dataclass(frozen=True)
+class ItemCarritoDTO:
+    """Línea de una venta con carrito (producto, cantidad y precio unitario final)."""
+
+    id_telefono: int
+    cantidad: int
+    precio_unitario_usd: float
+
+    @property
+    def subtotal_usd(self) -> float:
+        return self.cantidad * self.precio_unitario_usd
+
+
 @dataclass(frozen=True)
 class ResumenVentaDTO:
     """Para mostrar ventas en listados o reportes"""
@@ -42,6 +58,34 @@ class ResumenVentaDTO:
     saldo_usd: float
 
 
+@dataclass(frozen=True)
+class FiltroVentasDTO:
+    """Filtros del historial de ventas. `desde`/`hasta` son fechas 'YYYY-MM-DD' inclusivas."""
+
+    desde: str = None
+    hasta: str = None
+    id_cliente: int = None
+    tipo_venta: str = None
+    estado: str = None
+
+
+@dataclass(frozen=True)
+class PaginaVentasDTO:
+    """Una página del historial. `siguiente` es el cursor (fecha, id) de la próxima página, None al final."""
+
+    ventas: tuple
+    siguiente: tuple = None
+
+
+@dataclass(frozen=True)
+class TotalesVentasDTO:
+    """Agregados del historial filtrado (sin traer las filas)."""
+
+    cantidad: int
+    total_usd: float
+    saldo_usd: float
+
+
 @dataclass(frozen=True)
 class AbonoDTO:
     """Representa un pago parcial registrado."""
@@ -55,6 +99,43 @@ class AbonoDTO:
     metodo: str = "Efectivo"
 
 
+@dataclass(frozen=True)
+class CuotaDTO:
+    """Una cuota del plan de pagos de una venta."""
+
+    venta_id: int
+    numero: int
+    fecha_vencimiento: str
+    monto_usd: float
+    monto_pagado_usd: float
+    estado: str
+
+
+@dataclass(frozen=True)
+class VentaCuentaDTO:
+    """Una venta del estado de cuenta con su plan de cuotas y sus abonos (más recientes primero)."""
+
+    venta: ResumenVentaDTO
+    cuotas: tuple = ()
+    abonos: tuple = ()
+
+
+@dataclass(frozen=True)
+class EstadoCuentaDTO:
+    """Estado de cuenta de un cliente: sus ventas (más recientes primero) con cuotas y abonos."""
+
+    id_cliente: int
+    ventas: tuple = ()
+
+    @property
+    def total_usd(self) -> float:
+        return sum(v.venta.total_usd for v in self.ventas)
+
+    @property
+    def saldo_usd(self) -> float:
+        return sum(v.venta.saldo_usd for v in self.ventas)
+
+
 @dataclass(frozen=True)
 class AlertaCuotaDTO:
     """Datos para notificar una cuota próxima a vencer (Legacy/Simple)."""
@@ -65,7 +146,13 @@ class AlertaCuotaDTO:
     monto_cuota: float
     fecha_vencimiento: str
     saldo_venta_actual: float
-    mensaje_cliente: str = ""
+
+    @cached_property
+    def mensaje_cliente(self) -> str:
+        """Se genera al primer acceso (la mayoría de alertas nunca se copian)."""
+        return NotificationTemplates.render_recordatorio(
+            self.cliente_nombre, self.producto_nombre, self.num_cuota, self.monto_cuota, self.fecha_vencimiento
+        )
 
 
 @dataclass(frozen=True)
@@ -84,4 +171,21 @@ class EstadoCreditoDTO:
     proxima_cuota_fecha: str
     proxima_cuota_monto: float
     dias_mora: int = 0
-    mensaje_sugerido: str = ""
+    proxima_cuota_numero: int = 0
+
+    @property
+    def entrada_mensaje(self) -> tuple:
+        """Entradas de NotificationTemplates.render_mensaje: cobro si está en mora, recordatorio si no."""
+        return (
+            self.dias_mora > 0,
+            self.cliente_nombre,
+            self.producto_nombre,
+            self.proxima_cuota_numero,
+            self.proxima_cuota_monto,
+            self.proxima_cuota_fecha,
+        )
+
+    @cached_property
+    def mensaje_sugerido(self) -> str:
+        """Se genera al primer acceso (el usuario copia pocos mensajes por sesión)."""
+        return NotificationTemplates.render_mensaje(*self.entrada_mensaje)
@@ -0,0 +1,126 @@
+import hashlib
+import logging
+import os
+from app.db.database import Database
+from app.services.event_bus import BusCambios
+
+logger = logging.getLogger("SmartCredit")
+
+
+class ServicioImagenes:
+    """
+    Almacén de imágenes gestionado por la app (DB_DIR/assets).
+
+    Cada foto seleccionada se copia normalizada (resolución acotada, JPEG o PNG si
+    tiene transparencia) y se nombra por el hash de su contenido: la misma foto
+    usada en varios productos se guarda una sola vez. En la BD se guarda la ruta
+    relativa a DB_DIR, así mover la carpeta de datos no rompe las imágenes.
+    """
+
+    ASSETS_SUBDIR = "assets"
+    MAX_LADO = 1024
+    CALIDAD_JPEG = 85
+
+    def __init__(self):
+        self.db = Database()
+
+    @classmethod
+    def assets_dir(cls):
+        return os.path.join(Database.DB_DIR, cls.ASSETS_SUBDIR)
+
+    @classmethod
+    def es_gestionada(cls, ruta_imagen):
+        return bool(ruta_imagen) and ruta_imagen.replace("\\", "/").startswith(cls.ASSETS_SUBDIR + "/")
+
+    @classmethod
+    def resolver_ruta(cls, ruta_imagen):
+        """Ruta absoluta para abrir la imagen (las gestionadas se guardan relativas a DB_DIR)."""
+        if cls.es_gestionada(ruta_imagen):
+            return os.path.join(Database.DB_DIR, *ruta_imagen.replace("\\", "/").split("/"))
+        return ruta_imagen
+
+    @staticmethod
+    def _hash_archivo(ruta):
+        h = hashlib.sha256()
+        with open(ruta, "rb") as f:
+            for bloque in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(bloque)
+        return h.hexdigest()
+
+    def importar_imagen(self, ruta_origen):
+        """
+        Copia `ruta_origen` al almacén y retorna la ruta relativa gestionada.
+        Si ya es una imagen gestionada (o viene vacía) se retorna tal cual.
+        """
+        if not ruta_origen or self.es_gestionada(ruta_origen):
+            return ruta_origen
+
+        digest = self._hash_archivo(ruta_origen)
+        carpeta_rel = f"{self.ASSETS_SUBDIR}/{digest[:2]}"
+        carpeta = os.path.join(Database.DB_DIR, self.ASSETS_SUBDIR, digest[:2])
+
+        # Deduplicación: mismo contenido -> mismo asset
+        for extension in (".jpg", ".png"):
+            if os.path.exists(os.path.join(carpeta, digest + extension)):
+                return f"{carpeta_rel}/{digest}{extension}"
+
+        from PIL import Image, ImageOps  # Diferido: PIL no se carga al abrir la app
+
+        img = Image.open(ruta_origen)
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((self.MAX_LADO, self.MAX_LADO))
+
+        con_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        if con_alpha:
+            img = img.convert("RGBA")
+            extension, opciones = ".png", {"format": "PNG", "optimize": True}
+        else:
+            img = img.convert("RGB")
+            extension, opciones = ".jpg", {"format": "JPEG", "quality": self.CALIDAD_JPEG, "optimize": True}
+
+        os.makedirs(carpeta, exist_ok=True)
+        destino = os.path.join(carpeta, digest + extension)
+        temporal = f"{destino}.{os.getpid()}.tmp"
+        img.save(temporal, **opciones)
+        os.replace(temporal, destino)
+
+        logger.info(f"Imagen importada al almacén: {ruta_origen} -> {carpeta_rel}/{digest}{extension}")
+        return f"{carpeta_rel}/{digest}{extension}"
+
+    def migrar_imagenes_existentes(self):
+        """
+        Importa al almacén las imágenes de inventario que aún apuntan a rutas externas.
+        Retorna (migradas, fallidas). Las que no existen en disco se dejan como están.
+        """
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "SELECT id, ruta_imagen FROM inventario WHERE ruta_imagen IS NOT NULL AND ruta_imagen != ''"
+            )
+            pendientes = [(pid, ruta) for pid, ruta in cursor.fetchall() if not self.es_gestionada(ruta)]
+        finally:
+            conn.close()
+
+        if not pendientes:
+            return 0, 0
+
+        # Las importaciones (I/O y decodificación) se hacen fuera de la transacción
+        actualizaciones = []
+        fallidas = 0
+        for phone_id, ruta in pendientes:
+            if not os.path.exists(ruta):
+                continue
+            try:
+                actualizaciones.append((self.importar_imagen(ruta), phone_id))
+            except Exception as e:
+                fallidas += 1
+                logger.warning(f"No se pudo importar la imagen de producto {phone_id} ({ruta}): {e}")
+
+        if actualizaciones:
+            with self.db.transaction() as conn:
+                conn.executemany("UPDATE inventario SET ruta_imagen = ? WHERE id = ?", actualizaciones)
+            BusCambios().publicar("inventario", [phone_id for _, phone_id in actualizaciones])
+            logger.info(f"Migración de imágenes: {len(actualizaciones)} productos actualizados.")
+
+        return len(actualizaciones), fallidas
@@ -0,0 +1,118 @@
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from app.services.event_bus import BusCambios
+from app.services.notification_service import NotificationService
+
+logger = logging.getLogger("SmartCredit")
+
+
+class ServicioBadge:
+    """
+    Contador de la campanita con caché.
+
+    Un hilo de fondo recalcula `get_urgent_badge_count` cada `intervalo` segundos, al
+    pasar la medianoche (cambia qué es "hoy y mañana") o cuando BusCambios publica
+    un cambio en ventas/cuotas. La UI solo lee `obtener()`/`version`, que nunca tocan la BD.
+    """
+
+    _instance = None
+    INTERVALO_DEFECTO = 300  # segundos
+    TABLAS = ("ventas", "cuotas")  # Cambios que pueden mover el conteo
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ServicioBadge, cls).__new__(cls)
+            cls._instance._init_estado()
+        return cls._instance
+
+    @classmethod
+    def reset(cls):
+        """Detiene el hilo y suelta la suscripción al bus de la instancia actual (pruebas)."""
+        if cls._instance is not None:
+            cls._instance.detener()
+            BusCambios().desuscribir(cls._instance._on_cambio)
+            cls._instance = None
+
+    def _init_estado(self):
+        self._lock = threading.Lock()
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+        self._hilo = None
+        self._conteo = None
+        self._fecha = None  # Día en que se calculó el conteo
+        self._sucio = True
+        self.version = 0  # Aumenta en cada recálculo (la UI compara contra su última versión)
+        self.intervalo = self.INTERVALO_DEFECTO
+        BusCambios().suscribir(self._on_cambio)
+
+    def _on_cambio(self, tabla, ids):
+        if tabla in self.TABLAS:
+            self.invalidar()
+
+    @staticmethod
+    def _hoy():
+        return date.today()
+
+    def obtener(self):
+        """Último conteo calculado (None si aún no hay uno). No consulta la BD."""
+        return self._conteo
+
+    def invalidar(self):
+        """Marca el conteo como obsoleto y despierta al hilo (ventas, abonos)."""
+        with self._lock:
+            self._sucio = True
+        self._despertar.set()
+
+    def refrescar(self):
+        """Recalcula el conteo en el hilo que llama. Retorna el nuevo valor."""
+        with self._lock:
+            self._sucio = False
+        conteo = NotificationService().get_urgent_badge_count()
+        with self._lock:
+            self._conteo = conteo
+            self._fecha = self._hoy()
+            self.version += 1
+        return conteo
+
+    def _necesita_refresco(self):
+        with self._lock:
+            return self._sucio or self._fecha != self._hoy()
+
+    def _segundos_hasta_medianoche(self):
+        ahora = datetime.now()
+        manana = datetime.combine(ahora.date() + timedelta(days=1), datetime.min.time())
+        return max((manana - ahora).total_seconds(), 1)
+
+    def iniciar(self, intervalo=None):
+        """Arranca el hilo de refresco (idempotente)."""
+        if intervalo:
+            self.intervalo = max(int(intervalo), 5)
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._ciclo, name="SmartCreditBadge", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+        self._despertar.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout=2)
+            self._hilo = None
+
+    def _ciclo(self):
+        while not self._detener.is_set():
+            try:
+                self.refrescar()
+            except Exception as e:
+                logger.error(f"Error actualizando el badge de notificaciones: {e}")
+
+            # Duerme hasta el próximo intervalo, la medianoche o una invalidación
+            espera = min(self.intervalo, self._segundos_hasta_medianoche())
+            while not self._detener.is_set():
+                despertado = self._despertar.wait(espera)
+                self._despertar.clear()
+                if not despertado or self._necesita_refresco():
+                    break
+                espera = min(self.intervalo, self._segundos_hasta_medianoche())
@@ -0,0 +1,102 @@
+import logging
+import sqlite3
+import threading
+from app.db.database import Database
+from app.services.event_bus import BusCambios
+
+logger = logging.getLogger("SmartCredit")
+
+
+class CacheLecturas:
+    """
+    Caché de lecturas completas de tablas (catálogo, clientes) con contador de generación.
+
+    Cada tabla tiene una generación que se incrementa con cada cambio publicado en
+    BusCambios (los servicios publican DESPUÉS de confirmar la escritura). Una entrada
+    guarda las generaciones de las tablas de las que depende y solo se recarga cuando
+    alguna cambió.
+
+    Escrituras de otro proceso (otra instancia de la app sobre la misma BD) se detectan
+    con `PRAGMA data_version` en una conexión centinela que nunca escribe: si cambia sin
+    que este proceso haya invalidado nada, se descartan todas las entradas.
+
+    Los valores se comparten entre llamadas: quien los reciba no debe modificarlos.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(CacheLecturas, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._generaciones = {}
+            cls._instance._entradas = {}
+            cls._instance._centinela = None
+            cls._instance._ruta_db = None
+            cls._instance._data_version = None
+            BusCambios().suscribir(cls._instance._on_cambio)
+        return cls._instance
+
+    def _on_cambio(self, tabla, ids):
+        self.invalidar(tabla)
+
+    # --- Detección de cambios externos ---
+
+    def _leer_data_version(self):
+        # Llamar con el lock tomado
+        if self._centinela is None or self._ruta_db != Database.DB_NAME:
+            if self._centinela is not None:
+                self._centinela.close()
+            # La BD cambió de carpeta (tests, modo portable): nada de lo cacheado aplica
+            self._entradas.clear()
+            self._ruta_db = Database.DB_NAME
+            self._centinela = sqlite3.connect(self._ruta_db, check_same_thread=False)
+        return self._centinela.execute("PRAGMA data_version").fetchone()[0]
+
+    def _sincronizar(self):
+        # Llamar con el lock tomado
+        version = self._leer_data_version()
+        if self._data_version is not None and version != self._data_version:
+            logger.debug("Cambio externo en la BD detectado: caché de lecturas descartada.")
+            self._entradas.clear()
+        self._data_version = version
+
+    # --- API ---
+
+    def obtener(self, clave, tablas, cargar):
+        """
+        Retorna el valor cacheado de `clave` o lo carga con `cargar()`.
+        `tablas`: tablas de las que depende (se recarga si alguna fue invalidada).
+        """
+        with self._lock:
+            self._sincronizar()
+            firma = tuple(self._generaciones.get(t, 0) for t in tablas)
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada[0] == firma:
+                return entrada[1]
+
+        # Carga fuera del lock; si hubo una escritura mientras tanto, la firma vieja
+        # hace que la próxima lectura recargue.
+        valor = cargar()
+        with self._lock:
+            self._entradas[clave] = (firma, valor)
+        return valor
+
+    def invalidar(self, *tablas):
+        """Marca `tablas` como modificadas. Llamar después del commit."""
+        with self._lock:
+            for tabla in tablas:
+                self._generaciones[tabla] = self._generaciones.get(tabla, 0) + 1
+            # El commit propio también movió data_version: se absorbe para no descartar todo
+            self._data_version = self._leer_data_version()
+
+    def generacion(self, tabla):
+        return self._generaciones.get(tabla, 0)
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            if self._centinela is not None:
+                self._centinela.close()
+                self._centinela = None
+            self._data_version = None
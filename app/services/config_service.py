@@ -1,46 +1,159 @@
 import json
+import logging
 import os
+import tempfile
+import threading
+from app.db.database import Database
+
+logger = logging.getLogger("SmartCredit")
 
 
 class ConfigService:
+    """
+    Configuración de la app en DB_DIR/config.json.
+
+    Los cambios se validan al recibirlos y quedan en memoria; se escriben al disco
+    `DEBOUNCE_SEG` segundos después del último cambio (escribir "36.75" en la barra
+    superior produce una sola escritura) y al cerrar con `flush()`. La escritura es
+    atómica: archivo temporal + rename.
+    """
+
     _instance = None
     CONFIG_FILE = "config.json"
+    DEBOUNCE_SEG = 1.0
 
-    DEFAULT_CONFIG = {"tasa_cambio": "40.0", "margen_ganancia": "65"}
+    DEFAULT_CONFIG = {
+        "tasa_cambio": "40.0",
+        "margen_ganancia": "65",
+        "intervalo_badge_seg": "300",
+        "umbral_consulta_lenta_ms": "100",
+        "instrumentar_consultas": "0",
+    }
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ConfigService, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._escritura = threading.Lock()  # Serializa escritura + rename del archivo
+            cls._instance._timer = None
+            cls._instance._pendiente = False
             cls._instance._load_config()
         return cls._instance
 
+    @classmethod
+    def config_path(cls):
+        return os.path.join(Database.DB_DIR, cls.CONFIG_FILE)
+
     def _load_config(self):
         self.config = self.DEFAULT_CONFIG.copy()
-        if os.path.exists(self.CONFIG_FILE):
+        ruta = self.config_path()
+        if not os.path.exists(ruta) and os.path.exists(self.CONFIG_FILE):
+            # Versiones previas lo guardaban en el directorio de trabajo: se migra al guardar
+            ruta = self.CONFIG_FILE
+            self._pendiente = True
+        if os.path.exists(ruta):
             try:
-                with open(self.CONFIG_FILE, "r") as f:
+                with open(ruta, "r") as f:
                     saved_config = json.load(f)
                     self.config.update(saved_config)
             except Exception as e:
-                print(f"Error loading config: {e}")  # We'll replace this with logger later
+                logger.error(f"Error cargando configuración ({ruta}): {e}")
+        if self._pendiente:
+            self._programar_guardado()
+
+    # --- Persistencia ---
+
+    def _programar_guardado(self):
+        with self._lock:
+            self._pendiente = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.DEBOUNCE_SEG, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Escribe los cambios pendientes (si hay). Llamar al cerrar la app."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pendiente:
+                return
+            self._pendiente = False
+
+        ruta = self.config_path()
+        # El timer y el flush del cierre pueden coincidir: una escritura a la vez, cada una
+        # con su propio temporal, y la última en entrar deja los datos más recientes
+        with self._escritura:
+            with self._lock:
+                datos = dict(self.config)
+            temporal = None
+            try:
+                os.makedirs(os.path.dirname(ruta), exist_ok=True)
+                with tempfile.NamedTemporaryFile(
+                    "w", dir=os.path.dirname(ruta), prefix=f"{self.CONFIG_FILE}.", suffix=".tmp", delete=False
+                ) as f:
+                    temporal = f.name
+                    json.dump(datos, f, indent=4)
+                os.replace(temporal, ruta)
+            except Exception as e:
+                logger.error(f"Error guardando configuración: {e}")
+                if temporal is not None and os.path.exists(temporal):
+                    os.remove(temporal)
 
     def save_config(self):
+        self.flush()
+
+    def _set(self, clave, valor):
+        if self.config.get(clave) == valor:
+            return
+        self.config[clave] = valor
+        self._programar_guardado()
+
+    @staticmethod
+    def _numero_valido(valor, minimo):
         try:
-            with open(self.CONFIG_FILE, "w") as f:
-                json.dump(self.config, f, indent=4)
-        except Exception as e:
-            print(f"Error saving config: {e}")
+            return float(valor) >= minimo
+        except (TypeError, ValueError):
+            return False
+
+    # --- Valores ---
 
     def get_tasa(self):
         return self.config.get("tasa_cambio", "40.0")
 
     def set_tasa(self, tasa: str):
-        self.config["tasa_cambio"] = tasa
-        self.save_config()
+        """Guarda la tasa si es un número positivo. Retorna False (sin cambios) si no lo es."""
+        if not self._numero_valido(tasa, 0) or float(tasa) == 0:
+            return False
+        self._set("tasa_cambio", tasa)
+        return True
 
     def get_margen(self):
         return self.config.get("margen_ganancia", "65")
 
     def set_margen(self, margen: str):
-        self.config["margen_ganancia"] = margen
-        self.save_config()
+        """Guarda el margen si es un número >= 0. Retorna False (sin cambios) si no lo es."""
+        if not self._numero_valido(margen, 0):
+            return False
+        self._set("margen_ganancia", margen)
+        return True
+
+    def get_intervalo_badge(self):
+        """Segundos entre recálculos del badge de notificaciones."""
+        try:
+            return int(self.config.get("intervalo_badge_seg", "300"))
+        except (TypeError, ValueError):
+            return 300
+
+    def get_umbral_consulta_lenta(self):
+        """Milisegundos a partir de los cuales una consulta se escribe en el log como lenta."""
+        try:
+            return float(self.config.get("umbral_consulta_lenta_ms", "100"))
+        except (TypeError, ValueError):
+            return 100.0
+
+    def get_instrumentar_consultas(self):
+        """True si se miden las consultas SQL (panel de diagnóstico, log de consultas lentas)."""
+        return str(self.config.get("instrumentar_consultas", "0")).strip().lower() in ("1", "true", "si", "sí")
@@ -0,0 +1,85 @@
+import json
+import logging
+import sys
+from app.db.database import Database
+
+logger = logging.getLogger("SmartCredit")
+
+
+class ServicioEstadoCreditos:
+    """
+    Tabla resumen `estado_creditos`: una fila por venta con saldo, con su próxima cuota abierta.
+
+    Los servicios que tocan ventas o cuotas llaman `actualizar(cursor, venta_ids)` dentro
+    de su propia transacción, así el panel de control lee una sola tabla indexada en vez
+    de agrupar todas las cuotas. `reconstruir()` la recalcula desde cero y
+    `verificar()` reporta las ventas cuya fila materializada no coincide.
+    """
+
+    # Próxima cuota = la abierta más antigua (subconsulta correlacionada: todos los
+    # valores salen de la misma fila, a diferencia de MIN() con columnas sueltas).
+    SQL_CALCULO = """
+        SELECT v.id, v.id_cliente, v.id_telefono, v.saldo_pendiente_usd,
+               q.numero_cuota, q.fecha_vencimiento, q.monto_usd - q.monto_pagado_usd
+        FROM ventas v
+        JOIN cuotas q ON q.id = (
+            SELECT id FROM cuotas
+            WHERE venta_id = v.id AND estado <> 'Pagada'
+            ORDER BY fecha_vencimiento, numero_cuota
+            LIMIT 1
+        )
+        WHERE v.saldo_pendiente_usd > 0 {filtro}
+    """
+
+    SQL_INSERTAR = """
+        INSERT INTO estado_creditos (
+            venta_id, id_cliente, id_telefono, saldo_pendiente_usd,
+            proxima_cuota_numero, proxima_cuota_fecha, proxima_cuota_monto
+        )
+    """
+
+    FILTRO_VENTAS = "AND v.id IN (SELECT value FROM json_each(?))"
+
+    def __init__(self):
+        self.db = Database()
+
+    @classmethod
+    def actualizar(cls, cursor, venta_ids):
+        """Recalcula las filas de `venta_ids`. Debe llamarse dentro de la transacción que modificó las ventas."""
+        ids = json.dumps(list(venta_ids))
+        cursor.execute("DELETE FROM estado_creditos WHERE venta_id IN (SELECT value FROM json_each(?))", (ids,))
+        cursor.execute(cls.SQL_INSERTAR + cls.SQL_CALCULO.format(filtro=cls.FILTRO_VENTAS), (ids,))
+
+    def reconstruir(self):
+        """Recalcula toda la tabla desde ventas/cuotas. Retorna la cantidad de créditos abiertos."""
+        with self.db.transaction(immediate=True) as conn:
+            conn.execute("DELETE FROM estado_creditos")
+            conn.execute(self.SQL_INSERTAR + self.SQL_CALCULO.format(filtro=""))
+            total = conn.execute("SELECT COUNT(*) FROM estado_creditos").fetchone()[0]
+        logger.info(f"estado_creditos reconstruida: {total} créditos abiertos.")
+        return total
+
+    def verificar(self):
+        """Retorna los venta_id cuya fila materializada difiere del cálculo desde cero (vacío = consistente)."""
+        with self.db.connection() as conn:
+            esperado = {row[0]: row for row in conn.execute(self.SQL_CALCULO.format(filtro=""))}
+            actual = {
+                row[0]: row
+                for row in conn.execute(
+                    """
+                    SELECT venta_id, id_cliente, id_telefono, saldo_pendiente_usd,
+                           proxima_cuota_numero, proxima_cuota_fecha, proxima_cuota_monto
+                    FROM estado_creditos
+                """
+                )
+            }
+        return sorted(k for k in esperado.keys() | actual.keys() if esperado.get(k) != actual.get(k))
+
+
+if __name__ == "__main__":
+    # python -m app.services.credit_status_service [--reconstruir]
+    servicio = ServicioEstadoCreditos()
+    diferencias = servicio.verificar()
+    print(f"Ventas con diferencias: {len(diferencias)} {diferencias[:20]}")
+    if "--reconstruir" in sys.argv:
+        print(f"Reconstruida: {servicio.reconstruir()} créditos abiertos")
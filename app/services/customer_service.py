@@ -1,4 +1,7 @@
 from app.db.database import Database
+from app.services.cache_service import CacheLecturas
+from app.services.event_bus import BusCambios
+from app.services.inventory_service import ServiceInventario
 from app.models.cliente import Cliente
 import logging
 
@@ -8,28 +11,29 @@ logger = logging.getLogger("SmartCredit")
 class ServicioClientes:
     def __init__(self):
         self.db = Database()
+        self.cache = CacheLecturas()
 
     def registrar_cliente(self, nombre, cedula, telefono):
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
         try:
-            cursor.execute(
-                """
-                INSERT INTO clientes (nombre, cedula, telefono)
-                VALUES (?, ?, ?)
-            """,
-                (nombre, cedula, telefono),
-            )
-            conn.commit()
-            logger.info(f"Cliente registrado: {nombre} (Cédula: {cedula})")
+            with self.db.transaction() as conn:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO clientes (nombre, cedula, telefono)
+                    VALUES (?, ?, ?)
+                """,
+                    (nombre, cedula, telefono),
+                )
         except Exception as e:
             logger.error(f"Error al registrar cliente: {e}")
-            conn.rollback()
             raise ValueError(f"Error al registrar cliente: {e}")
-        finally:
-            conn.close()
+        BusCambios().publicar("clientes", [cursor.lastrowid])
+        logger.info(f"Cliente registrado: {nombre} (Cédula: {cedula})")
 
     def obtener_todos_clientes(self):
+        """Clientes ordenados por nombre. Cacheado hasta el próximo registro de cliente."""
+        return self.cache.obtener("clientes:todos", ("clientes",), self._cargar_todos_clientes)
+
+    def _cargar_todos_clientes(self):
         conn = self.db.get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM clientes ORDER BY nombre ASC")
@@ -49,10 +53,9 @@ class ServicioClientes:
         conn = self.db.get_connection()
         cursor = conn.cursor()
         cursor.execute(
-            """
-            SELECT v.fecha, t.nombre, v.tipo_venta, v.precio_final_usd
+            f"""
+            SELECT v.fecha, {ServiceInventario.sql_productos_venta("v.id")}, v.tipo_venta, v.precio_final_usd
             FROM ventas v
-            JOIN inventario t ON v.id_telefono = t.id
             WHERE v.id_cliente = ?
             ORDER BY v.fecha DESC
         """,
@@ -0,0 +1,51 @@
+import logging
+import threading
+
+logger = logging.getLogger("SmartCredit")
+
+
+class BusCambios:
+    """
+    Notificaciones de cambios en los datos: los servicios publican `(tabla, ids)`
+    DESPUÉS de confirmar cada escritura.
+
+    Los suscriptores (caché de lecturas, badge, marcas de "vista desactualizada")
+    se llaman de forma síncrona en el hilo que publicó, que puede no ser el de Tk:
+    deben ser rápidos y no tocar widgets.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(BusCambios, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._suscriptores = []
+        return cls._instance
+
+    def suscribir(self, callback):
+        """`callback(tabla, ids)`; `ids` es un frozenset o None (cambio sin detalle de filas)."""
+        with self._lock:
+            if callback not in self._suscriptores:
+                self._suscriptores.append(callback)
+
+    def desuscribir(self, callback):
+        with self._lock:
+            if callback in self._suscriptores:
+                self._suscriptores.remove(callback)
+
+    def publicar(self, tabla, ids=None):
+        """`ids`: filas afectadas de `tabla`; en cuotas y abonos son los id de venta."""
+        ids = frozenset(ids) if ids is not None else None
+        with self._lock:
+            suscriptores = list(self._suscriptores)
+        for callback in suscriptores:
+            try:
+                callback(tabla, ids)
+            except Exception as e:
+                logger.error(f"Error notificando cambio en '{tabla}': {e}")
+
+    def publicar_varios(self, cambios):
+        """`cambios`: {tabla: ids | None}."""
+        for tabla, ids in cambios.items():
+            self.publicar(tabla, ids)
@@ -0,0 +1,142 @@
+import bisect
+import logging
+import threading
+from datetime import datetime
+from app.db.database import Database
+from app.services.config_service import ConfigService
+from app.services.event_bus import BusCambios
+
+logger = logging.getLogger("SmartCredit")
+
+
+class ServicioTasas:
+    """
+    Historial de tasas de cambio (Bs por USD) con vigencia por fecha.
+
+    La tasa vigente se mantiene en memoria: la UI la lee sin tocar la BD. Para
+    reportes, `convertidor(desde, hasta)` carga de una vez las tasas del rango y
+    resuelve cada fecha con búsqueda binaria.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ServicioTasas, cls).__new__(cls)
+            cls._instance.db = Database()
+            cls._instance._lock = threading.Lock()
+            cls._instance._actual = None  # (vigente_desde, tasa)
+        return cls._instance
+
+    @staticmethod
+    def _ahora():
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def tasa_actual(self) -> float:
+        """Tasa vigente (caché en memoria). Sin historial, usa la de la configuración."""
+        with self._lock:
+            if self._actual is not None:
+                return self._actual[1]
+
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT vigente_desde, tasa FROM tasas_cambio ORDER BY vigente_desde DESC LIMIT 1")
+        row = cursor.fetchone()
+        conn.close()
+
+        if row is None:
+            try:
+                row = (None, float(ConfigService().get_tasa()))
+            except ValueError:
+                row = (None, float(ConfigService.DEFAULT_CONFIG["tasa_cambio"]))
+        with self._lock:
+            self._actual = row
+        return row[1]
+
+    def registrar_tasa(self, tasa: float, fuente: str = "manual", vigente_desde: str = None) -> bool:
+        """
+        Registra una nueva tasa vigente desde `vigente_desde` (ahora por defecto).
+        No inserta nada si coincide con la vigente. Retorna True si hubo cambio.
+        """
+        tasa = float(tasa)
+        if tasa <= 0:
+            raise ValueError("La tasa debe ser mayor a 0.")
+        if vigente_desde is None and tasa == self.tasa_actual():
+            return False
+
+        vigente_desde = vigente_desde or self._ahora()
+        with self.db.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO tasas_cambio (vigente_desde, tasa, fuente) VALUES (?, ?, ?)
+                ON CONFLICT (vigente_desde) DO UPDATE SET tasa = excluded.tasa, fuente = excluded.fuente
+            """,
+                (vigente_desde, tasa, fuente),
+            )
+
+        with self._lock:
+            if self._actual is None or self._actual[0] is None or vigente_desde >= self._actual[0]:
+                self._actual = (vigente_desde, tasa)
+        BusCambios().publicar("tasas_cambio")
+        logger.info(f"Tasa de cambio registrada: {tasa} Bs/USD desde {vigente_desde} ({fuente})")
+        return True
+
+    def tasa_en(self, fecha: str):
+        """Tasa vigente en `fecha` ('YYYY-MM-DD[ HH:MM:SS]') o None si no hay historial previo."""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT tasa FROM tasas_cambio WHERE vigente_desde <= ? ORDER BY vigente_desde DESC LIMIT 1",
+            (self._fin_del_dia(fecha),),
+        )
+        row = cursor.fetchone()
+        conn.close()
+        return row[0] if row else None
+
+    @staticmethod
+    def _fin_del_dia(fecha):
+        # Una fecha sin hora cubre todo el día
+        return f"{fecha} 23:59:59" if len(fecha) == 10 else fecha
+
+    def convertidor(self, desde: str, hasta: str):
+        """
+        Retorna `tasa_para(fecha)` para fechas dentro de [desde, hasta], con una sola consulta:
+        la tasa vigente al inicio del rango más todos los cambios dentro de él.
+        """
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT vigente_desde, tasa FROM (
+                SELECT vigente_desde, tasa FROM tasas_cambio WHERE vigente_desde < ?
+                ORDER BY vigente_desde DESC LIMIT 1
+            )
+            UNION ALL
+            SELECT vigente_desde, tasa FROM tasas_cambio WHERE vigente_desde >= ? AND vigente_desde <= ?
+            ORDER BY vigente_desde
+        """,
+            (desde, desde, self._fin_del_dia(hasta)),
+        )
+        rows = cursor.fetchall()
+        conn.close()
+
+        fechas = [r[0] for r in rows]
+        tasas = [r[1] for r in rows]
+
+        def tasa_para(fecha):
+            i = bisect.bisect_right(fechas, self._fin_del_dia(fecha)) - 1
+            return tasas[i] if i >= 0 else None
+
+        return tasa_para
+
+    def convertir_a_bs(self, movimientos, desde: str, hasta: str):
+        """
+        Convierte [(fecha, monto_usd)] a [(fecha, monto_usd, tasa, monto_bs)] en una pasada.
+        Los movimientos sin tasa conocida a esa fecha quedan con tasa/monto_bs None.
+        """
+        tasa_para = self.convertidor(desde, hasta)
+        resultado = []
+        for fecha, monto_usd in movimientos:
+            tasa = tasa_para(fecha)
+            resultado.append((fecha, monto_usd, tasa, monto_usd * tasa if tasa is not None else None))
+        return resultado
@@ -1,4 +1,6 @@
 from app.db.database import Database
+from app.services.cache_service import CacheLecturas
+from app.services.event_bus import BusCambios
 from app.models.telefono import Telefono
 import logging
 
@@ -8,31 +10,51 @@ logger = logging.getLogger("SmartCredit")
 class ServiceInventario:
     def __init__(self):
         self.db = Database()
+        self.cache = CacheLecturas()
+        self.bus = BusCambios()
+
+    @staticmethod
+    def sql_productos_venta(columna_venta):
+        """
+        Subconsulta con los productos de una venta tomados de `venta_items`, en el orden del
+        carrito: 'Telefono, 2x Forro'. `columna_venta` es la columna con el id (p. ej. 'v.id').
+        `ventas.id_telefono` solo guarda el primer producto.
+        """
+        return f"""(
+            SELECT GROUP_CONCAT(producto, ', ') FROM (
+                SELECT CASE WHEN vi.cantidad > 1 THEN vi.cantidad || 'x ' ELSE '' END
+                       || COALESCE(p.nombre, '(eliminado)') AS producto
+                FROM venta_items vi
+                LEFT JOIN inventario p ON p.id = vi.id_telefono
+                WHERE vi.venta_id = {columna_venta}
+                ORDER BY vi.id
+            )
+        )"""
 
     def agregar_telefono(self, nombre, costo_original_usd, stock, ruta_imagen):
         if stock < 0:
             raise ValueError("El stock no puede ser negativo.")
 
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
         try:
-            cursor.execute(
-                """
-                INSERT INTO inventario (nombre, costo_original_usd, stock, ruta_imagen)
-                VALUES (?, ?, ?, ?)
-            """,
-                (nombre, costo_original_usd, stock, ruta_imagen),
-            )
-            conn.commit()
-            logger.info(f"Teléfono registrado: {nombre} (Stock: {stock}, Costo: ${costo_original_usd})")
+            with self.db.transaction() as conn:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO inventario (nombre, costo_original_usd, stock, ruta_imagen)
+                    VALUES (?, ?, ?, ?)
+                """,
+                    (nombre, costo_original_usd, stock, ruta_imagen),
+                )
         except Exception as e:
             logger.error(f"Error al registrar teléfono: {e}")
-            conn.rollback()
             raise ValueError(f"Error al registrar teléfono: {e}")
-        finally:
-            conn.close()
+        self.bus.publicar("inventario", [cursor.lastrowid])
+        logger.info(f"Teléfono registrado: {nombre} (Stock: {stock}, Costo: ${costo_original_usd})")
 
     def obtener_todos_telefonos(self):
+        """Catálogo completo ordenado por nombre. Cacheado hasta la próxima escritura en inventario."""
+        return self.cache.obtener("inventario:todos", ("inventario",), self._cargar_todos_telefonos)
+
+    def _cargar_todos_telefonos(self):
         conn = self.db.get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM inventario ORDER BY nombre ASC")
@@ -52,10 +74,8 @@ class ServiceInventario:
         if stock < 0:
             raise ValueError("El stock no puede ser negativo.")
 
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        try:
-            cursor.execute(
+        with self.db.transaction() as conn:
+            conn.execute(
                 """
                 UPDATE inventario
                 SET nombre = ?, costo_original_usd = ?, stock = ?, ruta_imagen = ?
@@ -63,18 +83,12 @@ class ServiceInventario:
             """,
                 (nombre, costo_original_usd, stock, ruta_imagen, phone_id),
             )
-            conn.commit()
-        finally:
-            conn.close()
+        self.bus.publicar("inventario", [phone_id])
 
     def eliminar_telefono(self, phone_id):
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        try:
-            cursor.execute("DELETE FROM inventario WHERE id = ?", (phone_id,))
-            conn.commit()
-        finally:
-            conn.close()
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM inventario WHERE id = ?", (phone_id,))
+        self.bus.publicar("inventario", [phone_id])
 
     def actualizar_stock(self, phone_id, cambio_cantidad, cursor=None):
         """
@@ -84,42 +98,32 @@ class ServiceInventario:
             phone_id: ID del teléfono
             cambio_cantidad: Cantidad a sumar (positivo) o restar (negativo)
             cursor: Cursor de base de datos opcional para transacciones externas.
-                    Si es None, se crea una nueva conexión y se hace commit.
+                    Si es None, se abre una transacción propia (un SAVEPOINT si el
+                    hilo ya está dentro de `transaction()`) y se publica el cambio.
+                    Con cursor externo, quien confirma debe publicar el cambio en BusCambios.
         """
-        local_conn = None
         if cursor is None:
-            local_conn = self.db.get_connection()
-            cursor = local_conn.cursor()
-
-        try:
-            # Verificar stock actual dentro de la misma transacción (o auto-commit si es local)
+            with self.db.transaction() as conn:
+                self.actualizar_stock(phone_id, cambio_cantidad, conn.cursor())
+            self.bus.publicar("inventario", [phone_id])
+            return
+
+        # Una sola sentencia: la condición evita stock negativo sin SELECT previo
+        cursor.execute(
+            "UPDATE inventario SET stock = stock + ? WHERE id = ? AND stock + ? >= 0",
+            (cambio_cantidad, phone_id, cambio_cantidad),
+        )
+
+        if cursor.rowcount == 0:
+            # Solo en el camino de error: distinguir producto inexistente de stock insuficiente
             cursor.execute("SELECT stock FROM inventario WHERE id = ?", (phone_id,))
             row = cursor.fetchone()
-
             if not row:
                 raise ValueError(f"Producto con ID {phone_id} no encontrado.")
-
-            stock_actual = row[0]
-            nuevo_stock = stock_actual + cambio_cantidad
-
-            if nuevo_stock < 0:
-                raise ValueError(
-                    f"No hay suficiente stock disponible. Stock actual: {stock_actual}, "
-                    f"Solicitado: {abs(cambio_cantidad)}"
-                )
-
-            cursor.execute("UPDATE inventario SET stock = ? WHERE id = ?", (nuevo_stock, phone_id))
-
-            if local_conn:
-                local_conn.commit()
-
-        except Exception as e:
-            if local_conn:
-                local_conn.rollback()
-            raise e
-        finally:
-            if local_conn:
-                local_conn.close()
+            raise ValueError(
+                f"No hay suficiente stock disponible. Stock actual: {row[0]}, "
+                f"Solicitado: {abs(cambio_cantidad)}"
+            )
 
     def verificar_stock_bajo(self, umbral=5):
         """
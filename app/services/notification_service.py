@@ -1,35 +1,31 @@
 from datetime import datetime, timedelta
 from app.db.database import Database
 from app.models.dtos import AlertaCuotaDTO, EstadoCreditoDTO
-from app.services.notification_templates import NotificationTemplates
+from app.services.inventory_service import ServiceInventario
+from app.services.schedule_service import ServicioCronogramas
+from app.utils.enums import FrecuenciaCuotas
+from app.utils.notification_templates import NotificationTemplates
 
 
 class NotificationService:
     def __init__(self):
         self.db = Database()
-
-    def generar_plan_cuotas(self, venta_id: int, cuotas_totales: int, monto_cuota: float, cursor) -> None:
+        self.cronogramas = ServicioCronogramas()
+
+    def generar_plan_cuotas(
+        self,
+        venta_id: int,
+        cuotas_totales: int,
+        monto_cuota: float,
+        cursor,
+        frecuencia: FrecuenciaCuotas = FrecuenciaCuotas.QUINCENAL,
+        dia_mes: int = None,
+    ) -> None:
         """
-        Genera el cronograma de pagos quincenales.
+        Genera el cronograma de pagos (quincenal por defecto) con ServicioCronogramas.
         Debe llamarse dentro de una transacción activa (usando el cursor provisto).
         """
-        if cuotas_totales <= 0:
-            return
-
-        fecha_actual = datetime.now()
-
-        for i in range(1, cuotas_totales + 1):
-            # Cada 14 días (Quincenal)
-            dias_sumar = i * 14
-            fecha_venc = (fecha_actual + timedelta(days=dias_sumar)).strftime("%Y-%m-%d")
-
-            cursor.execute(
-                """
-                INSERT INTO cuotas (venta_id, numero_cuota, fecha_vencimiento, monto_usd, estado)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (venta_id, i, fecha_venc, monto_cuota, "Pendiente"),
-            )
+        self.cronogramas.generar_plan(cursor, venta_id, cuotas_totales, monto_cuota, None, frecuencia, dia_mes)
 
     def obtener_alertas_proximas(self, dias_anticipacion=1) -> list[AlertaCuotaDTO]:
         """
@@ -54,7 +50,7 @@ class NotificationService:
             FROM cuotas q
             JOIN ventas v ON q.venta_id = v.id
             WHERE q.fecha_vencimiento IN (?, ?)
-            AND q.estado = 'Pendiente'
+            AND q.estado <> 'Pagada'
             AND v.saldo_pendiente_usd > 0
         """
 
@@ -75,25 +71,14 @@ class NotificationService:
         conn = self.db.get_connection()
         cursor = conn.cursor()
 
-        # Obtenemos ventas activas y su cuota pendiente MÁS ANTIGUA (o próxima)
-        # Esto asume que si debes la cuota 1 y 2, la urgencia la dicta la 1.
-        query = """
-            SELECT 
-                v.id, 
-                c.nombre, 
-                i.nombre, 
-                MIN(q.fecha_vencimiento) as proxima_fecha,
-                q.monto_usd,
-                v.saldo_pendiente_usd,
-                q.numero_cuota
-            FROM ventas v
-            JOIN clientes c ON v.id_cliente = c.id
-            JOIN inventario i ON v.id_telefono = i.id
-            JOIN cuotas q ON v.id = q.venta_id
-            WHERE v.saldo_pendiente_usd > 0 
-            AND q.estado = 'Pendiente'
-            GROUP BY v.id
-            ORDER BY proxima_fecha ASC
+        # Lectura directa del resumen materializado (ServicioEstadoCreditos), ya ordenado
+        # por el índice de fecha. La urgencia la dicta la cuota abierta más antigua.
+        query = f"""
+            SELECT e.venta_id, c.nombre, {ServiceInventario.sql_productos_venta("e.venta_id")},
+                   e.proxima_cuota_fecha, e.proxima_cuota_monto, e.saldo_pendiente_usd, e.proxima_cuota_numero
+            FROM estado_creditos e
+            JOIN clientes c ON e.id_cliente = c.id
+            ORDER BY e.proxima_cuota_fecha ASC
         """
 
         cursor.execute(query)
@@ -119,15 +104,7 @@ class NotificationService:
             elif 0 <= delta_days <= 3:
                 estado_label = "🟠 Próximo"
 
-            # Generar mensaje sugerido
-            mensaje = NotificationTemplates.render_recordatorio(
-                cliente_nombre=cliente,
-                producto_nombre=producto,
-                num_cuota=num_cuota,
-                monto_usd=monto_cuota,
-                fecha_vence=fecha_venc_str,
-            )
-
+            # El mensaje sugerido se genera al primer acceso (EstadoCreditoDTO.mensaje_sugerido)
             resultados.append(
                 EstadoCreditoDTO(
                     venta_id=venta_id,
@@ -138,12 +115,21 @@ class NotificationService:
                     proxima_cuota_fecha=fecha_venc_str,
                     proxima_cuota_monto=monto_cuota,
                     dias_mora=dias_mora,
-                    mensaje_sugerido=mensaje,
+                    proxima_cuota_numero=num_cuota,
                 )
             )
 
         return resultados
 
+    def generar_mensajes(self, creditos) -> dict[int, str]:
+        """
+        Mensajes sugeridos de varios créditos de una vez ({venta_id: mensaje}).
+        Los que están en mora usan la plantilla de cobro (render_vencimiento).
+        """
+        creditos = list(creditos)
+        mensajes = NotificationTemplates.render_lote(c.entrada_mensaje for c in creditos)
+        return {c.venta_id: m for c, m in zip(creditos, mensajes)}
+
     def _query_alerts_by_date_range(self, days_ahead: int) -> list[AlertaCuotaDTO]:
         target_dates = []
         for i in range(days_ahead + 1):
@@ -156,13 +142,13 @@ class NotificationService:
         cursor = conn.cursor()
 
         query = f"""
-            SELECT c.nombre, i.nombre, q.numero_cuota, q.monto_usd, q.fecha_vencimiento, v.saldo_pendiente_usd
+            SELECT c.nombre, {ServiceInventario.sql_productos_venta("v.id")}, q.numero_cuota,
+                   q.monto_usd - q.monto_pagado_usd, q.fecha_vencimiento, v.saldo_pendiente_usd
             FROM cuotas q
             JOIN ventas v ON q.venta_id = v.id
             JOIN clientes c ON v.id_cliente = c.id
-            JOIN inventario i ON v.id_telefono = i.id
             WHERE q.fecha_vencimiento IN ({placeholders})
-            AND q.estado = 'Pendiente'
+            AND q.estado <> 'Pagada'
             AND v.saldo_pendiente_usd > 0
         """
 
@@ -172,9 +158,6 @@ class NotificationService:
 
         alertas = []
         for row in rows:
-            mensaje = NotificationTemplates.render_recordatorio(
-                cliente_nombre=row[0], producto_nombre=row[1], num_cuota=row[2], monto_usd=row[3], fecha_vence=row[4]
-            )
             alertas.append(
                 AlertaCuotaDTO(
                     cliente_nombre=row[0],
@@ -183,7 +166,6 @@ class NotificationService:
                     monto_cuota=row[3],
                     fecha_vencimiento=row[4],
                     saldo_venta_actual=row[5],
-                    mensaje_cliente=mensaje,
                 )
             )
         return alertas
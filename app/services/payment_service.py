@@ -1,42 +1,59 @@
 from datetime import datetime
 from app.db.database import Database
 from app.models.dtos import AbonoDTO
+from app.services.event_bus import BusCambios
+from app.services.credit_status_service import ServicioEstadoCreditos
+from app.utils.enums import EstadoCuota, EstadoVenta
 from app.utils.exceptions import BusinessRuleError
 
 
 class PaymentService:
     def __init__(self):
         self.db = Database()
-        self._ensure_schema()
 
-    def _ensure_schema(self):
-        """Valida que la tabla abonos tenga las columnas necesarias (migración suave)."""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        try:
-            cursor.execute("PRAGMA table_info(abonos)")
-            columns = [info[1] for info in cursor.fetchall()]
-            if "metodo" not in columns:
-                cursor.execute("ALTER TABLE abonos ADD COLUMN metodo TEXT DEFAULT 'Efectivo'")
-                conn.commit()
-        finally:
-            conn.close()
+    # Imputa `monto` a las cuotas abiertas de una venta, de la más antigua a la más nueva.
+    # `previo` = lo que falta por pagar en las cuotas anteriores; a cada cuota le toca
+    # lo que quede del abono después de cubrirlas, hasta su propio pendiente.
+    SQL_IMPUTAR_ABONO = """
+        WITH abiertas AS (
+            SELECT id,
+                   monto_usd - monto_pagado_usd AS pendiente,
+                   COALESCE(SUM(monto_usd - monto_pagado_usd) OVER (
+                       ORDER BY numero_cuota ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING), 0) AS previo
+            FROM cuotas
+            WHERE venta_id = :venta_id AND estado <> 'Pagada'
+        ),
+        imputacion AS (
+            SELECT id, MIN(pendiente, MAX(:monto - previo, 0)) AS aplicado
+            FROM abiertas
+        )
+        UPDATE cuotas
+        SET monto_pagado_usd = CASE
+                WHEN cuotas.monto_usd - (cuotas.monto_pagado_usd + imputacion.aplicado) < 0.01 THEN cuotas.monto_usd
+                ELSE cuotas.monto_pagado_usd + imputacion.aplicado
+            END,
+            estado = CASE
+                WHEN cuotas.monto_usd - (cuotas.monto_pagado_usd + imputacion.aplicado) < 0.01 THEN 'Pagada'
+                ELSE 'Parcial'
+            END
+        FROM imputacion
+        WHERE cuotas.id = imputacion.id AND imputacion.aplicado > 0
+    """
 
     def registrar_abono(
         self, venta_id: int, monto_usd: float, tasa_cambio: float, metodo: str = "Efectivo", notas: str = ""
     ) -> bool:
         """
         # Región: Gestión de Abonos
-        Registra un abono, actualiza el saldo de la venta y marca cuotas como pagadas.
-        Transaccional y atómico.
+        Registra un abono, actualiza el saldo de la venta e imputa el monto a las cuotas
+        más antiguas (Pendiente -> Parcial -> Pagada). Transaccional y atómico.
         """
         if monto_usd <= 0:
             raise BusinessRuleError("El monto del abono debe ser mayor a 0.")
 
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
+        with self.db.transaction(immediate=True) as conn:
+            cursor = conn.cursor()
 
-        try:
             # 1. Verificar Estado Actual de la Venta
             cursor.execute("SELECT saldo_pendiente_usd, estado FROM ventas WHERE id = ?", (venta_id,))
             row = cursor.fetchone()
@@ -45,7 +62,7 @@ class PaymentService:
 
             saldo_actual, estado_venta = row
 
-            if estado_venta == "Pagada" or saldo_actual <= 0:
+            if estado_venta == EstadoVenta.PAGADA or saldo_actual <= 0:
                 raise BusinessRuleError("La venta ya está pagada por completo.")
 
             if monto_usd > saldo_actual:
@@ -69,7 +86,7 @@ class PaymentService:
             if nuevo_saldo < 0.01:
                 nuevo_saldo = 0
 
-            nuevo_estado = "Pagada" if nuevo_saldo == 0 else "Activa"
+            nuevo_estado = EstadoVenta.PAGADA if nuevo_saldo == 0 else EstadoVenta.ACTIVA
 
             cursor.execute(
                 """
@@ -80,27 +97,22 @@ class PaymentService:
                 (nuevo_saldo, nuevo_estado, venta_id),
             )
 
-            # 4. Conciliar Cuotas (Lógica Simplificada)
-            # Marcar cuotas como pagadas en orden de antigüedad hasta cubrir el monto abonado
-            # NOTA: Esta lógica asume que el abono se imputa a la cuota más antigua.
-            # Si el abono es parcial sobre una cuota, la cuota sigue "Pendiente" o podríamos manejar "Parcial".
-            # Por simplicidad y robustez: Si Saldo Venta == 0, todas las cuotas se marcan pagadas.
-            if nuevo_estado == "Pagada":
-                cursor.execute("UPDATE cuotas SET estado = 'Pagada' WHERE venta_id = ?", (venta_id,))
+            # 4. Imputar a cuotas (una sola sentencia, sin iterar en Python)
+            if nuevo_estado == EstadoVenta.PAGADA:
+                # Saldo en cero: se cierran todas (absorbe diferencias de redondeo)
+                cursor.execute(
+                    "UPDATE cuotas SET estado = ?, monto_pagado_usd = monto_usd WHERE venta_id = ?",
+                    (EstadoCuota.PAGADA, venta_id),
+                )
             else:
-                # Opcional: Podríamos marcar cuotas individuales si el usuario pagó el exacto.
-                # Para evitar complejidad, dejaremos las cuotas sincronizadas con el saldo global
-                # en futuras iteraciones.
-                pass
-
-            conn.commit()
-            return True
-
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+                cursor.execute(self.SQL_IMPUTAR_ABONO, {"venta_id": venta_id, "monto": monto_usd})
+
+            # 5. Resumen del panel de control
+            ServicioEstadoCreditos.actualizar(cursor, [venta_id])
+
+        # La cuota pudo dejar de estar pendiente (badge, estado de cuenta)
+        BusCambios().publicar_varios({"abonos": [venta_id], "ventas": [venta_id], "cuotas": [venta_id]})
+        return True
 
     def obtener_abonos_por_venta(self, venta_id: int) -> list[AbonoDTO]:
         conn = self.db.get_connection()
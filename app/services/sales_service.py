@@ -2,11 +2,24 @@ from datetime import datetime
 from app.db.database import Database
 
 # from app.models.venta import Venta
+from app.services.event_bus import BusCambios
+from app.services.credit_status_service import ServicioEstadoCreditos
 from app.services.inventory_service import ServiceInventario
 from app.services.notification_service import NotificationService
-from app.models.dtos import CalculoVentaDTO
-from app.utils.exceptions import BusinessRuleError
-from app.utils.enums import EstadoVenta, TipoVenta
+from app.models.dtos import (
+    AbonoDTO,
+    CalculoVentaDTO,
+    CuotaDTO,
+    EstadoCuentaDTO,
+    FiltroVentasDTO,
+    ItemCarritoDTO,
+    PaginaVentasDTO,
+    ResumenVentaDTO,
+    TotalesVentasDTO,
+    VentaCuentaDTO,
+)
+from app.utils.exceptions import BusinessRuleError, InventoryError
+from app.utils.enums import EstadoVenta, FrecuenciaCuotas, TipoVenta
 
 
 class ServiceVentas:
@@ -16,6 +29,9 @@ class ServiceVentas:
     Maneja cálculos de precios, procesamiento de ventas, y actualizaciones de stock.
     """
 
+    # Productos de cada venta `v` (todas sus líneas)
+    sql_productos = ServiceInventario.sql_productos_venta("v.id")
+
     def __init__(self):
         self.db = Database()
         self.servicio_inventario = ServiceInventario()
@@ -81,7 +97,98 @@ class ServiceVentas:
             monto_cuota_bs=monto_cuota_bs,
         )
 
+    def calcular_grilla_cotizaciones(self, costo_usd, margenes, pagos_iniciales_usd, opciones_cuotas, tasa_cambio):
+        """
+        Calcula de una vez todas las combinaciones margen x pago inicial x cuotas.
+
+        Retorna un dict {(margen, pago_inicial, cuotas): CalculoVentaDTO | None}; None marca
+        las combinaciones inválidas (pago inicial mayor al precio). Cada resultado es idéntico
+        al de `calcular_totales_venta`, pero el precio se calcula una vez por margen y el
+        saldo una vez por (margen, inicial): solo la división por cuotas queda en el ciclo interno.
+        """
+        grilla = {}
+        for margen in margenes:
+            precio_final_usd = self.calcular_precio_con_margen(costo_usd, margen)
+            precio_final_bs = precio_final_usd * tasa_cambio
+            contado = CalculoVentaDTO(
+                precio_final_usd=precio_final_usd,
+                pago_inicial_usd=precio_final_usd,
+                saldo_pendiente_usd=0.0,
+                cuotas_totales=0,
+                monto_cuota_usd=0.0,
+                estado=EstadoVenta.PAGADA,
+                es_contado=True,
+                precio_final_bs=precio_final_bs,
+                monto_cuota_bs=0.0,
+            )
+
+            for pago_inicial in pagos_iniciales_usd:
+                inicial = max(pago_inicial, 0)
+                if inicial > precio_final_usd:
+                    for cuotas in opciones_cuotas:
+                        grilla[(margen, pago_inicial, cuotas)] = None
+                    continue
+
+                saldo = max(precio_final_usd - inicial, 0)
+                for cuotas in opciones_cuotas:
+                    if cuotas == 0:
+                        grilla[(margen, pago_inicial, cuotas)] = contado
+                        continue
+                    monto_cuota_usd = saldo / cuotas if cuotas > 0 else 0
+                    grilla[(margen, pago_inicial, cuotas)] = CalculoVentaDTO(
+                        precio_final_usd=precio_final_usd,
+                        pago_inicial_usd=inicial,
+                        saldo_pendiente_usd=saldo,
+                        cuotas_totales=cuotas,
+                        monto_cuota_usd=monto_cuota_usd,
+                        estado=EstadoVenta.ACTIVA,
+                        es_contado=False,
+                        precio_final_bs=precio_final_bs,
+                        monto_cuota_bs=monto_cuota_usd * tasa_cambio,
+                    )
+        return grilla
+
     def procesar_venta(self, id_cliente, id_telefono, precio_final_usd, pago_inicial_usd, cuotas_totales, tasa_cambio):
+        """Venta de una unidad de un producto (atajo sobre procesar_venta_carrito)."""
+        item = ItemCarritoDTO(id_telefono=id_telefono, cantidad=1, precio_unitario_usd=precio_final_usd)
+        self.procesar_venta_carrito(id_cliente, [item], pago_inicial_usd, cuotas_totales, tasa_cambio)
+        return True
+
+    def procesar_venta_carrito(
+        self,
+        id_cliente,
+        items,
+        pago_inicial_usd,
+        cuotas_totales,
+        tasa_cambio,
+        frecuencia=FrecuenciaCuotas.QUINCENAL,
+        dia_mes=None,
+    ):
+        """
+        Registra una venta con N líneas (ItemCarritoDTO) en una sola transacción.
+        `frecuencia` / `dia_mes` definen el cronograma de cuotas (ver ServicioCronogramas).
+
+        El stock se descuenta con `UPDATE ... WHERE stock >= ?` dentro de BEGIN IMMEDIATE:
+        si otra venta (incluso de otro proceso) se llevó las unidades, la condición falla
+        y toda la venta se revierte. Retorna el id de la venta.
+        """
+        # Consolidar líneas repetidas del mismo producto al mismo precio; con precios distintos
+        # quedan como líneas separadas (cada una con su precio)
+        por_linea = {}
+        for item in items:
+            if item.cantidad <= 0:
+                raise BusinessRuleError("La cantidad de cada producto debe ser mayor a 0.")
+            clave = (item.id_telefono, item.precio_unitario_usd)
+            por_linea[clave] = por_linea.get(clave, 0) + item.cantidad
+        if not por_linea:
+            raise BusinessRuleError("El carrito está vacío.")
+
+        lineas = [(pid, cant, precio, cant * precio) for (pid, precio), cant in por_linea.items()]
+        precio_final_usd = sum(linea[3] for linea in lineas)
+        # El stock se descuenta por producto, sumando todas sus líneas
+        cantidades = {}
+        for id_telefono, cantidad, _, _ in lineas:
+            cantidades[id_telefono] = cantidades.get(id_telefono, 0) + cantidad
 
         # 1. Realizar cálculos finales (Source of Truth)
         calculos = self.calcular_totales_venta(precio_final_usd, pago_inicial_usd, cuotas_totales, tasa_cambio)
@@ -89,15 +196,25 @@ class ServiceVentas:
         tipo_venta = TipoVenta.CONTADO if calculos.es_contado else TipoVenta.FINANCIADO
         fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
+        with self.db.transaction(immediate=True) as conn:
+            cursor = conn.cursor()
 
-        try:
-            # 2. Actualizar Stock (Atomicidad: Pasamos el cursor)
-            # Restamos 1 al stock
-            self.servicio_inventario.actualizar_stock(id_telefono, -1, cursor=cursor)
+            # 2. Descontar Stock (condicional, sin SELECT previo)
+            for id_telefono, cantidad in cantidades.items():
+                cursor.execute(
+                    "UPDATE inventario SET stock = stock - ? WHERE id = ? AND stock >= ?",
+                    (cantidad, id_telefono, cantidad),
+                )
+                if cursor.rowcount == 0:
+                    cursor.execute("SELECT nombre, stock FROM inventario WHERE id = ?", (id_telefono,))
+                    row = cursor.fetchone()
+                    if not row:
+                        raise InventoryError(f"Producto con ID {id_telefono} no encontrado.")
+                    raise InventoryError(
+                        f"No hay suficiente stock de {row[0]}. Stock actual: {row[1]}, Solicitado: {cantidad}"
+                    )
 
-            # 3. Registrar Venta
+            # 3. Registrar Venta (cabecera). id_telefono = primer producto, por compatibilidad
             cursor.execute(
                 """
                 INSERT INTO ventas (
@@ -108,7 +225,7 @@ class ServiceVentas:
             """,
                 (
                     id_cliente,
-                    id_telefono,
+                    lineas[0][0],
                     fecha,
                     tipo_venta,
                     calculos.precio_final_usd,
@@ -120,33 +237,178 @@ class ServiceVentas:
                     calculos.estado,
                 ),
             )
+            venta_id = cursor.lastrowid
 
-            # 4. Generar Plan de Cuotas (Si aplica)
+            # 4. Líneas de la venta
+            cursor.executemany(
+                """
+                INSERT INTO venta_items (venta_id, id_telefono, cantidad, precio_unitario_usd, subtotal_usd)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                [(venta_id, *linea) for linea in lineas],
+            )
+
+            # 5. Generar Plan de Cuotas (Si aplica)
             if not calculos.es_contado:
-                # Obtenemos el ID de la venta recién creada
-                venta_id = cursor.lastrowid
                 self.servicio_notificacion.generar_plan_cuotas(
-                    venta_id, calculos.cuotas_totales, calculos.monto_cuota_usd, cursor
+                    venta_id, calculos.cuotas_totales, calculos.monto_cuota_usd, cursor, frecuencia, dia_mes
                 )
+                ServicioEstadoCreditos.actualizar(cursor, [venta_id])
+
+        # Stock descontado, venta y cuotas nuevas (caché, badge y vistas se enteran por el bus)
+        BusCambios().publicar_varios(
+            {"inventario": list(cantidades), "ventas": [venta_id], "cuotas": [venta_id]}
+        )
+        return venta_id
+
+    # --- Historial paginado ---
 
-            conn.commit()
-            return True
+    TAMANO_PAGINA = 100
 
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+    @staticmethod
+    def _filtros_historial(filtro: FiltroVentasDTO):
+        """Condiciones WHERE (sobre `v`) y parámetros de `filtro`."""
+        condiciones, params = [], []
+        if filtro.desde:
+            condiciones.append("v.fecha >= ?")
+            params.append(filtro.desde)
+        if filtro.hasta:
+            # 'YYYY-MM-DD' incluye todo el día
+            condiciones.append("v.fecha <= ?")
+            params.append(f"{filtro.hasta} 23:59:59" if len(filtro.hasta) == 10 else filtro.hasta)
+        if filtro.id_cliente:
+            condiciones.append("v.id_cliente = ?")
+            params.append(filtro.id_cliente)
+        if filtro.tipo_venta:
+            condiciones.append("v.tipo_venta = ?")
+            params.append(filtro.tipo_venta)
+        if filtro.estado:
+            condiciones.append("v.estado = ?")
+            params.append(filtro.estado)
+        return condiciones, params
+
+    def obtener_pagina_historial(
+        self, filtro: FiltroVentasDTO = FiltroVentasDTO(), despues_de: tuple = None, limite: int = None
+    ) -> PaginaVentasDTO:
+        """
+        Ventas más recientes primero, de a `limite` filas.
+        `despues_de` es el cursor (fecha, id) devuelto por la página anterior: la consulta
+        continúa desde ahí por el índice (fecha, id) en vez de saltar filas con OFFSET.
+        """
+        limite = limite or self.TAMANO_PAGINA
+        condiciones, params = self._filtros_historial(filtro)
+        if despues_de is not None:
+            condiciones.append("(v.fecha, v.id) < (?, ?)")
+            params.extend(despues_de)
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+
+        # LEFT JOIN: una venta no desaparece del historial si se borró su cliente; los
+        # productos salen de venta_items (todas las líneas del carrito)
+        query = f"""
+            SELECT v.id, v.fecha, COALESCE(c.nombre, ''), COALESCE({self.sql_productos}, ''),
+                   v.tipo_venta, v.precio_final_usd, COALESCE(v.saldo_pendiente_usd, 0)
+            FROM ventas v
+            LEFT JOIN clientes c ON v.id_cliente = c.id
+            {where}
+            ORDER BY v.fecha DESC, v.id DESC
+            LIMIT ?
+        """
+        with self.db.connection() as conn:
+            # Una fila de más indica si hay otra página
+            rows = conn.execute(query, (*params, limite + 1)).fetchall()
+
+        ventas = tuple(ResumenVentaDTO(*row) for row in rows[:limite])
+        siguiente = (ventas[-1].fecha, ventas[-1].id) if len(rows) > limite else None
+        return PaginaVentasDTO(ventas=ventas, siguiente=siguiente)
+
+    def obtener_totales_historial(self, filtro: FiltroVentasDTO = FiltroVentasDTO()) -> TotalesVentasDTO:
+        """Cantidad, total vendido y saldo pendiente del historial filtrado, agregados en SQL."""
+        condiciones, params = self._filtros_historial(filtro)
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        with self.db.connection() as conn:
+            cantidad, total, saldo = conn.execute(
+                f"""
+                SELECT COUNT(*), COALESCE(SUM(v.precio_final_usd), 0), COALESCE(SUM(v.saldo_pendiente_usd), 0)
+                FROM ventas v
+                {where}
+            """,
+                params,
+            ).fetchone()
+        return TotalesVentasDTO(cantidad=cantidad, total_usd=total, saldo_usd=saldo)
+
+    # --- Estado de cuenta ---
+
+    def obtener_estado_cuenta(self, id_cliente: int) -> EstadoCuentaDTO:
+        """
+        Ventas del cliente con sus cuotas y abonos, en tres consultas fijas (ventas, cuotas,
+        abonos) sin importar cuántas ventas tenga; cuotas y abonos se agrupan por venta en memoria.
+        Las tres lecturas van en una misma transacción: un abono registrado en medio no
+        deja el saldo de una venta desfasado de sus abonos.
+        """
+        with self.db.transaction() as conn:
+            ventas = conn.execute(
+                f"""
+                SELECT v.id, v.fecha, COALESCE(c.nombre, ''), COALESCE({self.sql_productos}, ''),
+                       v.tipo_venta, v.precio_final_usd, COALESCE(v.saldo_pendiente_usd, 0)
+                FROM ventas v
+                LEFT JOIN clientes c ON v.id_cliente = c.id
+                WHERE v.id_cliente = ?
+                ORDER BY v.fecha DESC, v.id DESC
+            """,
+                (id_cliente,),
+            ).fetchall()
+            if not ventas:
+                return EstadoCuentaDTO(id_cliente=id_cliente)
+
+            cuotas = conn.execute(
+                """
+                SELECT q.venta_id, q.numero_cuota, q.fecha_vencimiento, q.monto_usd, q.monto_pagado_usd, q.estado
+                FROM cuotas q
+                JOIN ventas v ON v.id = q.venta_id
+                WHERE v.id_cliente = ?
+                ORDER BY q.venta_id, q.numero_cuota
+            """,
+                (id_cliente,),
+            ).fetchall()
+            abonos = conn.execute(
+                """
+                SELECT a.venta_id, a.fecha, a.monto_usd, a.monto_bs, a.tasa_cambio,
+                       COALESCE(a.notas, ''), COALESCE(a.metodo, 'Efectivo')
+                FROM abonos a
+                JOIN ventas v ON v.id = a.venta_id
+                WHERE v.id_cliente = ?
+                ORDER BY a.venta_id, a.fecha DESC, a.id DESC
+            """,
+                (id_cliente,),
+            ).fetchall()
+
+        cuotas_por_venta, abonos_por_venta = {}, {}
+        for row in cuotas:
+            cuotas_por_venta.setdefault(row[0], []).append(CuotaDTO(*row))
+        for row in abonos:
+            abonos_por_venta.setdefault(row[0], []).append(AbonoDTO(*row))
+
+        return EstadoCuentaDTO(
+            id_cliente=id_cliente,
+            ventas=tuple(
+                VentaCuentaDTO(
+                    venta=ResumenVentaDTO(*row),
+                    cuotas=tuple(cuotas_por_venta.get(row[0], ())),
+                    abonos=tuple(abonos_por_venta.get(row[0], ())),
+                )
+                for row in ventas
+            ),
+        )
 
     def obtener_historial_ventas(self, customer_id=None):
         conn = self.db.get_connection()
         cursor = conn.cursor()
 
-        query = """
-            SELECT v.id, v.fecha, c.nombre, t.nombre, v.tipo_venta, v.precio_final_usd, v.saldo_pendiente_usd
+        query = f"""
+            SELECT v.id, v.fecha, c.nombre, {self.sql_productos}, v.tipo_venta, v.precio_final_usd,
+                   v.saldo_pendiente_usd
             FROM ventas v
             JOIN clientes c ON v.id_cliente = c.id
-            JOIN inventario t ON v.id_telefono = t.id
         """
 
         params = ()
@@ -0,0 +1,173 @@
+import calendar
+import json
+import logging
+from datetime import date, datetime, timedelta
+from app.db.database import Database
+from app.services.credit_status_service import ServicioEstadoCreditos
+from app.utils.enums import FrecuenciaCuotas
+
+logger = logging.getLogger("SmartCredit")
+
+
+class ServicioCronogramas:
+    """
+    Motor de cronogramas de cuotas.
+
+    Calcula las fechas de vencimiento según la frecuencia (semanal, quincenal,
+    mensual o un día fijo del mes) y corre al siguiente día hábil las que caen en
+    fin de semana o en un feriado de la tabla `feriados`. Las filas se insertan con
+    `executemany`, tanto para una venta como para regenerar planes en lote.
+    """
+
+    DIAS_POR_FRECUENCIA = {FrecuenciaCuotas.SEMANAL: 7, FrecuenciaCuotas.QUINCENAL: 14}
+    FINES_DE_SEMANA = (5, 6)  # sábado, domingo
+
+    SQL_INSERTAR = """
+        INSERT INTO cuotas (venta_id, numero_cuota, fecha_vencimiento, monto_usd, estado)
+        VALUES (?, ?, ?, ?, 'Pendiente')
+    """
+
+    # Lo ya cubierto de cada venta (suma de sus cuotas - saldo pendiente) se imputa a las
+    # cuotas nuevas de la más antigua a la más nueva, igual que la migración 6
+    SQL_REIMPUTAR = """
+        WITH cubierto AS (
+            SELECT v.id AS venta_id, MAX(SUM(q.monto_usd) - COALESCE(v.saldo_pendiente_usd, 0), 0) AS monto
+            FROM ventas v JOIN cuotas q ON q.venta_id = v.id
+            WHERE v.id IN (SELECT value FROM json_each(?))
+            GROUP BY v.id
+        ),
+        imputacion AS (
+            SELECT q.id,
+                   MIN(q.monto_usd, MAX(c.monto - COALESCE(SUM(q.monto_usd) OVER (
+                       PARTITION BY q.venta_id ORDER BY q.numero_cuota
+                       ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING), 0), 0)) AS aplicado
+            FROM cuotas q JOIN cubierto c ON c.venta_id = q.venta_id
+        )
+        UPDATE cuotas
+        SET monto_pagado_usd = CASE
+                WHEN cuotas.monto_usd - imputacion.aplicado < 0.01 THEN cuotas.monto_usd ELSE imputacion.aplicado
+            END,
+            estado = CASE WHEN cuotas.monto_usd - imputacion.aplicado < 0.01 THEN 'Pagada' ELSE 'Parcial' END
+        FROM imputacion
+        WHERE cuotas.id = imputacion.id AND imputacion.aplicado > 0
+    """
+
+    def __init__(self, omitir_fines_de_semana=True):
+        self.db = Database()
+        self.omitir_fines_de_semana = omitir_fines_de_semana
+
+    # --- Calendario ---
+
+    @staticmethod
+    def cargar_feriados(cursor):
+        cursor.execute("SELECT fecha FROM feriados")
+        return {row[0] for row in cursor.fetchall()}
+
+    def agregar_feriados(self, feriados):
+        """Registra feriados como [(fecha 'YYYY-MM-DD', descripcion)]. Las fechas repetidas se actualizan."""
+        with self.db.transaction() as conn:
+            conn.executemany("INSERT OR REPLACE INTO feriados (fecha, descripcion) VALUES (?, ?)", feriados)
+
+    def _dia_habil(self, fecha, feriados):
+        while (self.omitir_fines_de_semana and fecha.weekday() in self.FINES_DE_SEMANA) or (
+            fecha.isoformat() in feriados
+        ):
+            fecha += timedelta(days=1)
+        return fecha
+
+    # --- Fechas ---
+
+    @staticmethod
+    def _sumar_meses(fecha, meses, dia):
+        """Misma fecha `meses` después, con `dia` acotado al último día del mes destino."""
+        mes_total = fecha.month - 1 + meses
+        anio, mes = fecha.year + mes_total // 12, mes_total % 12 + 1
+        return date(anio, mes, min(dia, calendar.monthrange(anio, mes)[1]))
+
+    def calcular_fechas(
+        self, fecha_inicio, cuotas_totales, frecuencia=FrecuenciaCuotas.QUINCENAL, dia_mes=None, feriados=()
+    ):
+        """
+        Retorna las fechas de vencimiento ('YYYY-MM-DD') de las cuotas 1..N.
+        `fecha_inicio` es la fecha de la venta (date o datetime); la primera cuota nunca cae ese mismo día.
+        """
+        if isinstance(fecha_inicio, datetime):
+            fecha_inicio = fecha_inicio.date()
+        frecuencia = FrecuenciaCuotas(frecuencia)
+
+        if frecuencia in self.DIAS_POR_FRECUENCIA:
+            paso = self.DIAS_POR_FRECUENCIA[frecuencia]
+            nominales = (fecha_inicio + timedelta(days=i * paso) for i in range(1, cuotas_totales + 1))
+        elif frecuencia == FrecuenciaCuotas.MENSUAL:
+            nominales = (self._sumar_meses(fecha_inicio, i, fecha_inicio.day) for i in range(1, cuotas_totales + 1))
+        else:
+            if not dia_mes or not 1 <= dia_mes <= 31:
+                raise ValueError("El día de pago debe estar entre 1 y 31.")
+            # Primer mes cuyo día de pago es posterior a la venta
+            primer_mes = 0 if self._sumar_meses(fecha_inicio, 0, dia_mes) > fecha_inicio else 1
+            nominales = (self._sumar_meses(fecha_inicio, primer_mes + i, dia_mes) for i in range(cuotas_totales))
+
+        return [self._dia_habil(fecha, feriados).isoformat() for fecha in nominales]
+
+    # --- Persistencia ---
+
+    def generar_plan(
+        self,
+        cursor,
+        venta_id,
+        cuotas_totales,
+        monto_cuota,
+        fecha_inicio=None,
+        frecuencia=FrecuenciaCuotas.QUINCENAL,
+        dia_mes=None,
+    ):
+        """
+        Inserta el plan de una venta. Debe llamarse dentro de una transacción activa.
+        Retorna la cantidad de cuotas insertadas.
+        """
+        if cuotas_totales <= 0:
+            return 0
+        fechas = self.calcular_fechas(
+            fecha_inicio or datetime.now(), cuotas_totales, frecuencia, dia_mes, self.cargar_feriados(cursor)
+        )
+        cursor.executemany(
+            self.SQL_INSERTAR, [(venta_id, i, fecha, monto_cuota) for i, fecha in enumerate(fechas, start=1)]
+        )
+        return len(fechas)
+
+    def regenerar_planes(self, cursor, ventas, frecuencia=FrecuenciaCuotas.QUINCENAL, dia_mes=None):
+        """
+        Reemplaza en lote el plan de varias ventas (p. ej. desde una migración).
+        `ventas`: iterable de (venta_id, cuotas_totales, monto_cuota, fecha_inicio).
+        Las cuotas previas se borran y lo ya pagado de cada venta se vuelve a imputar a las
+        nuevas (más antiguas primero), así cuotas y estado_creditos siguen cuadrando con
+        `ventas.saldo_pendiente_usd`. Debe llamarse dentro de una transacción activa. Retorna la cantidad de cuotas insertadas.
+        """
+        feriados = self.cargar_feriados(cursor)
+        ids = []
+        filas = []
+        # Ventas del mismo día con el mismo número de cuotas comparten fechas
+        memo = {}
+        for venta_id, cuotas_totales, monto_cuota, fecha_inicio in ventas:
+            if isinstance(fecha_inicio, str):
+                fecha_inicio = date.fromisoformat(fecha_inicio[:10])
+            elif isinstance(fecha_inicio, datetime):
+                fecha_inicio = fecha_inicio.date()
+            ids.append(venta_id)
+            if cuotas_totales and cuotas_totales > 0:
+                clave = (fecha_inicio, cuotas_totales)
+                fechas = memo.get(clave)
+                if fechas is None:
+                    fechas = memo[clave] = self.calcular_fechas(
+                        fecha_inicio, cuotas_totales, frecuencia, dia_mes, feriados
+                    )
+                filas.extend((venta_id, i, fecha, monto_cuota) for i, fecha in enumerate(fechas, start=1))
+
+        # Un solo DELETE para todas las ventas (la lista viaja como arreglo JSON)
+        lista = json.dumps(ids)
+        cursor.execute("DELETE FROM cuotas WHERE venta_id IN (SELECT value FROM json_each(?))", (lista,))
+        cursor.executemany(self.SQL_INSERTAR, filas)
+        cursor.execute(self.SQL_REIMPUTAR, (lista,))
+        ServicioEstadoCreditos.actualizar(cursor, ids)
+        logger.info(f"Planes regenerados: {len(ids)} ventas, {len(filas)} cuotas.")
+        return len(filas)
@@ -0,0 +1,109 @@
+import logging
+import re
+from app.db.database import Database
+from app.models.cliente import Cliente
+from app.models.telefono import Telefono
+
+logger = logging.getLogger("SmartCredit")
+
+
+class ServicioBusqueda:
+    """
+    Búsqueda por prefijo en clientes (nombre, cédula, teléfono) e inventario (nombre).
+
+    Usa las tablas FTS5 `clientes_fts`/`inventario_fts` (migración 10): cada palabra
+    escrita se busca como prefijo y todas deben aparecer; los resultados se ordenan
+    por relevancia (bm25, el nombre pesa más que la cédula o el teléfono). Si el SQLite
+    no trae FTS5, cae a LIKE sobre la tabla original (mismo contrato, sin ranking ni
+    acentos: el prefijo va al inicio de la columna o de una palabra del nombre).
+
+    Un prefijo muy amplio ("j" con 50k clientes) coincide con miles de filas: calcular
+    bm25 para todas cuesta más que la búsqueda. Pasado `UMBRAL_RANKING` se devuelven
+    los más recientes (orden por id, que el índice FTS ya entrega ordenado).
+    """
+
+    LIMITE_DEFECTO = 50
+    UMBRAL_RANKING = 2000
+    # Pesos bm25 por columna, en el orden de la tabla FTS
+    PESOS = {"clientes": (10.0, 5.0, 1.0), "inventario": (1.0,)}
+    COLUMNAS = {"clientes": ("nombre", "cedula", "telefono"), "inventario": ("nombre",)}
+
+    _fts_disponible = {}  # DB_NAME -> {tabla: bool}
+
+    def __init__(self):
+        self.db = Database()
+
+    # --- Consulta ---
+
+    @staticmethod
+    def _terminos(texto):
+        # Palabras sin signos de FTS: "ana  v-12" -> ["ana", "v-12"]
+        return [t for t in re.split(r"\s+", (texto or "").replace('"', " ").strip()) if t]
+
+    @staticmethod
+    def consulta_fts(terminos):
+        """Expresión MATCH: cada término como prefijo entre comillas (sin operadores FTS)."""
+        return " ".join(f'"{t}"*' for t in terminos)
+
+    def _tiene_fts(self, conn, tabla):
+        disponibles = self._fts_disponible.setdefault(Database.DB_NAME, {})
+        if tabla not in disponibles:
+            fila = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{tabla}_fts",)
+            ).fetchone()
+            disponibles[tabla] = fila is not None
+            if fila is None:
+                logger.warning(f"Sin índice FTS para {tabla}: búsqueda con LIKE.")
+        return disponibles[tabla]
+
+    def _buscar(self, tabla, texto, limite):
+        terminos = self._terminos(texto)
+        if not terminos:
+            return []
+        columnas = self.COLUMNAS[tabla]
+
+        with self.db.connection() as conn:
+            if self._tiene_fts(conn, tabla):
+                consulta = self.consulta_fts(terminos)
+                coincidencias = conn.execute(
+                    f"SELECT COUNT(*) FROM (SELECT 1 FROM {tabla}_fts WHERE {tabla}_fts MATCH ? LIMIT ?)",
+                    (consulta, self.UMBRAL_RANKING + 1),
+                ).fetchone()[0]
+                if coincidencias > self.UMBRAL_RANKING:
+                    orden = "f.rowid DESC"
+                else:
+                    orden = f"bm25({tabla}_fts, {', '.join(str(p) for p in self.PESOS[tabla])}), t.nombre"
+                rows = conn.execute(
+                    f"""
+                    SELECT t.* FROM {tabla}_fts f
+                    JOIN {tabla} t ON t.id = f.rowid
+                    WHERE {tabla}_fts MATCH ?
+                    ORDER BY {orden}
+                    LIMIT ?
+                """,
+                    (consulta, limite),
+                ).fetchall()
+            else:
+                # Mismo contrato que FTS: cada término es prefijo de una columna o, en el
+                # nombre, de una de sus palabras ("ana" no encuentra "Mariana")
+                condiciones = [f"{c} LIKE ? ESCAPE '\\'" for c in columnas] + ["nombre LIKE ? ESCAPE '\\'"]
+                alguna = "(" + " OR ".join(condiciones) + ")"
+                params = []
+                for termino in terminos:
+                    prefijo = re.sub(r"([%_\\])", r"\\\1", termino) + "%"
+                    params.extend([prefijo] * len(columnas) + ["% " + prefijo])
+                rows = conn.execute(
+                    f"SELECT * FROM {tabla} WHERE {' AND '.join([alguna] * len(terminos))} ORDER BY nombre LIMIT ?",
+                    (*params, limite),
+                ).fetchall()
+        return rows
+
+    # --- API ---
+
+    def buscar_clientes(self, texto, limite=LIMITE_DEFECTO) -> list[Cliente]:
+        """Clientes cuyo nombre, cédula o teléfono empiezan por las palabras de `texto` ([] si está vacío)."""
+        return [Cliente.from_row(row) for row in self._buscar("clientes", texto, limite)]
+
+    def buscar_telefonos(self, texto, limite=LIMITE_DEFECTO) -> list[Telefono]:
+        """Productos cuyo nombre contiene palabras que empiezan por las de `texto` ([] si está vacío)."""
+        return [Telefono.from_row(row) for row in self._buscar("inventario", texto, limite)]
@@ -0,0 +1,69 @@
+import hashlib
+import logging
+import os
+from app.db.database import Database
+from app.services.asset_service import ServicioImagenes
+
+logger = logging.getLogger("SmartCredit")
+
+
+class ServicioMiniaturas:
+    """
+    Caché en disco de miniaturas pre-redimensionadas.
+
+    La clave incluye ruta, mtime y tamaño del archivo original: si la foto cambia,
+    la miniatura se regenera sola. Pensado para llamarse desde un hilo de fondo.
+    """
+
+    CACHE_SUBDIR = os.path.join("cache", "miniaturas")
+
+    def cache_dir(self):
+        return os.path.join(Database.DB_DIR, self.CACHE_SUBDIR)
+
+    @staticmethod
+    def clave(ruta_imagen, tamano):
+        """Clave de caché o None si el archivo no existe."""
+        ruta_imagen = ServicioImagenes.resolver_ruta(ruta_imagen)
+        try:
+            st = os.stat(ruta_imagen)
+        except (OSError, TypeError, ValueError):
+            return None
+        base = f"{os.path.abspath(ruta_imagen)}|{st.st_mtime_ns}|{st.st_size}|{tamano[0]}x{tamano[1]}"
+        return hashlib.sha1(base.encode("utf-8")).hexdigest()
+
+    def cargar_miniatura(self, ruta_imagen, tamano):
+        """
+        Retorna la miniatura como PIL.Image (ya decodificada) o None si no hay imagen válida.
+        La primera vez decodifica el original y guarda el resultado en disco.
+        """
+        if not ruta_imagen:
+            return None
+        clave = self.clave(ruta_imagen, tamano)
+        if clave is None:
+            return None
+
+        from PIL import Image, ImageOps  # Diferido: se importa en el hilo de fondo, no al arrancar
+
+        destino = os.path.join(self.cache_dir(), f"{clave}.png")
+        try:
+            if os.path.exists(destino):
+                img = Image.open(destino)
+                img.load()
+                return img
+
+            img = Image.open(ServicioImagenes.resolver_ruta(ruta_imagen))
+            # JPEG: decodifica directamente a una escala reducida (mucho más rápido que full-size)
+            img.draft("RGB", tamano)
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail(tamano)
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA")
+
+            os.makedirs(self.cache_dir(), exist_ok=True)
+            temporal = f"{destino}.{os.getpid()}.tmp"
+            img.save(temporal, format="PNG")
+            os.replace(temporal, destino)
+            return img
+        except Exception as e:
+            logger.warning(f"No se pudo generar miniatura de {ruta_imagen}: {e}")
+            return None
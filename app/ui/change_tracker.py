@@ -0,0 +1,52 @@
+"""
+Marcas de "vista desactualizada" alimentadas por BusCambios.
+
+Cada vista se registra con las tablas que muestra. Los cambios publicados se
+acumulan por vista como {tabla: ids} hasta que la ventana los consume con
+`take()` al mostrar la pestaña, así una pestaña solo se recarga si sus datos
+cambiaron desde la última vez que se vio.
+"""
+
+import threading
+from app.services.event_bus import BusCambios
+
+
+class ChangeTracker:
+    def __init__(self, bus=None):
+        self._lock = threading.Lock()
+        self._tablas = {}  # vista -> tablas que muestra
+        self._pendientes = {}  # vista -> {tabla: set(ids) | None}
+        self.bus = bus or BusCambios()
+        self.bus.suscribir(self._on_cambio)
+
+    def register(self, view_name, tables):
+        with self._lock:
+            self._tablas[view_name] = frozenset(tables)
+            self._pendientes.setdefault(view_name, {})
+
+    def close(self):
+        self.bus.desuscribir(self._on_cambio)
+
+    def _on_cambio(self, tabla, ids):
+        # Puede llegar desde un hilo de trabajo: solo se anota
+        with self._lock:
+            for vista, tablas in self._tablas.items():
+                if tabla not in tablas:
+                    continue
+                pendientes = self._pendientes[vista]
+                if ids is None or (tabla in pendientes and pendientes[tabla] is None):
+                    pendientes[tabla] = None  # Sin detalle: toda la tabla
+                else:
+                    pendientes.setdefault(tabla, set()).update(ids)
+
+    def is_dirty(self, view_name):
+        with self._lock:
+            return bool(self._pendientes.get(view_name))
+
+    def take(self, view_name):
+        """Retorna y limpia los cambios pendientes de la vista: {tabla: set(ids) | None} (vacío = al día)."""
+        with self._lock:
+            pendientes = self._pendientes.get(view_name) or {}
+            if pendientes:
+                self._pendientes[view_name] = {}
+            return pendientes
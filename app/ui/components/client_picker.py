@@ -0,0 +1,134 @@
+import customtkinter as ctk
+from app.ui.styles import AppColors
+from app.utils.prefix_index import PrefixIndex
+
+
+class ClientPicker(ctk.CTkFrame):
+    """
+    Selector de cliente con autocompletado.
+
+    Mientras se escribe muestra los primeros `max_results` clientes cuyo nombre o cédula
+    empieza por lo escrito (PrefixIndex en memoria, sin consultar la BD por tecla).
+    La selección es por id: `on_select(cliente_id)`, o None cuando se borra.
+    Flechas arriba/abajo recorren las sugerencias, Enter elige y Escape las cierra.
+    """
+
+    def __init__(self, master, on_select, max_results=8, placeholder_text="Buscar cliente o cédula...", **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.on_select = on_select
+        self.max_results = max_results
+        self.index = PrefixIndex()
+        self.clients = {}  # id -> Cliente
+        self.selected_id = None
+        self._matches = []
+        self._highlight = 0
+        self._source = None
+
+        self.entry = ctk.CTkEntry(self, placeholder_text=placeholder_text)
+        self.entry.pack(fill="x")
+        self.entry.bind("<KeyRelease>", self._on_key)
+        self.entry.bind("<Down>", lambda event: self._move(1))
+        self.entry.bind("<Up>", lambda event: self._move(-1))
+        self.entry.bind("<Return>", lambda event: self._choose(self._highlight))
+        self.entry.bind("<Escape>", lambda event: self._hide_suggestions())
+
+        # Fixed pool of suggestion rows, shown/hidden and relabelled (never recreated per keystroke)
+        self.suggestions = ctk.CTkFrame(self, fg_color=AppColors.BG_CARD)
+        self.rows = []
+        for i in range(max_results):
+            row = ctk.CTkButton(
+                self.suggestions,
+                text="",
+                anchor="w",
+                height=26,
+                fg_color="transparent",
+                text_color=AppColors.TEXT_PRIMARY,
+                command=lambda i=i: self._choose(i),
+            )
+            self.rows.append(row)
+
+    # --- Data ---
+
+    @staticmethod
+    def label(client):
+        return f"{client.nombre} — {client.cedula}"
+
+    def set_clients(self, clients):
+        """Carga completa. Pasar otra vez la misma lista (mismo objeto) no hace nada."""
+        if clients is self._source:
+            return
+        self._source = clients
+        self.clients = {c.id: c for c in clients}
+        self.index.reconstruir((c.id, c.nombre, c.cedula) for c in clients)
+        if self.selected_id is not None and self.selected_id not in self.clients:
+            self.clear()
+
+    def upsert_clients(self, clients):
+        """Altas/modificaciones incrementales (p. ej. un cliente recién registrado)."""
+        for client in clients:
+            if client is None:
+                continue
+            self.clients[client.id] = client
+            self.index.agregar(client.id, client.nombre, client.cedula)
+            if client.id == self.selected_id:
+                self._set_entry(self.label(client))
+
+    # --- Selection ---
+
+    def select(self, client_id):
+        client = self.clients.get(client_id)
+        self.selected_id = client.id if client else None
+        self._set_entry(self.label(client) if client else "")
+        self._hide_suggestions()
+        self.on_select(self.selected_id)
+
+    def clear(self):
+        self.select(None)
+
+    def _set_entry(self, text):
+        self.entry.delete(0, "end")
+        if text:
+            self.entry.insert(0, text)
+
+    # --- Suggestions ---
+
+    def _on_key(self, event):
+        if event.keysym in ("Up", "Down", "Return", "Escape"):
+            return
+        text = self.entry.get().strip()
+        if self.selected_id is not None:
+            # Editing the text drops the previous choice
+            self.selected_id = None
+            self.on_select(None)
+        self._matches = self.index.buscar(text, self.max_results)
+        self._highlight = 0
+        self._render_suggestions()
+
+    def _render_suggestions(self):
+        if not self._matches:
+            self._hide_suggestions()
+            return
+        for i, row in enumerate(self.rows):
+            if i < len(self._matches):
+                row.configure(
+                    text=self.label(self.clients[self._matches[i]]),
+                    fg_color=AppColors.PRIMARY if i == self._highlight else "transparent",
+                )
+                row.pack(fill="x", padx=2, pady=1)
+            else:
+                row.pack_forget()
+        if not self.suggestions.winfo_ismapped():
+            self.suggestions.pack(fill="x", pady=(2, 0))
+
+    def _hide_suggestions(self):
+        self._matches = []
+        self.suggestions.pack_forget()
+
+    def _move(self, step):
+        if self._matches:
+            self._highlight = (self._highlight + step) % len(self._matches)
+            self._render_suggestions()
+
+    def _choose(self, i):
+        if 0 <= i < len(self._matches):
+            self.select(self._matches[i])
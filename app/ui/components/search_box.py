@@ -0,0 +1,40 @@
+import customtkinter as ctk
+
+
+class SearchBox(ctk.CTkEntry):
+    """
+    Campo de búsqueda con rebote: llama `on_search(texto)` cuando el usuario deja de
+    escribir `delay_ms` milisegundos (una consulta por pausa, no una por tecla).
+    Escape limpia el campo.
+    """
+
+    def __init__(self, master, on_search, placeholder_text="Buscar...", delay_ms=150, **kwargs):
+        # No textvariable: CTkEntry only shows the placeholder without one
+        super().__init__(master, placeholder_text=placeholder_text, **kwargs)
+        self.on_search = on_search
+        self.delay_ms = delay_ms
+        self._after_id = None
+        self._last_text = ""
+        self.bind("<KeyRelease>", self._on_key)
+        self.bind("<Escape>", lambda event: self.clear())
+
+    @property
+    def text(self):
+        return self.get().strip()
+
+    def clear(self):
+        self.delete(0, "end")
+        self._on_key()
+
+    def _on_key(self, event=None):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        self._after_id = self.after(self.delay_ms, self._fire)
+
+    def _fire(self):
+        self._after_id = None
+        text = self.text
+        if text == self._last_text:
+            return
+        self._last_text = text
+        self.on_search(text)
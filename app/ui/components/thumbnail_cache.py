@@ -0,0 +1,78 @@
+from collections import OrderedDict
+import customtkinter as ctk
+from app.services.thumbnail_service import ServicioMiniaturas
+from app.ui.task_runner import TaskRunner
+
+
+class ThumbnailCache:
+    """
+    LRU en memoria de CTkImage con presupuesto en bytes.
+
+    Las miniaturas que no están en memoria se decodifican en un hilo de fondo propio
+    (pool "imagenes" de TaskRunner; ServicioMiniaturas, con caché en disco) y se
+    entregan por callback en el hilo de Tk. Mientras tanto la vista muestra su placeholder.
+    """
+
+    _instance = None
+    MAX_BYTES = 32 * 1024 * 1024
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ThumbnailCache, cls).__new__(cls)
+            cls._instance._images = OrderedDict()  # clave -> (CTkImage, bytes)
+            cls._instance._bytes = 0
+            cls._instance._waiting = {}  # clave -> [callbacks]
+            cls._instance._runner = None
+            cls._instance._service = ServicioMiniaturas()
+        return cls._instance
+
+    def load(self, widget, ruta_imagen, thumb_size, display_size, callback):
+        """
+        Llama `callback(ctk_image | None)` en el hilo de Tk.
+        Si la imagen ya está en memoria, el callback se ejecuta de inmediato.
+        """
+        clave = self._service.clave(ruta_imagen, thumb_size) if ruta_imagen else None
+        if clave is None:
+            callback(None)
+            return
+
+        key = (clave, display_size)
+        if key in self._images:
+            self._images.move_to_end(key)
+            callback(self._images[key][0])
+            return
+
+        if key in self._waiting:
+            self._waiting[key].append(callback)
+            return
+        self._waiting[key] = [callback]
+
+        if self._runner is None:
+            # Ligado a la raíz: sobrevive a vistas y Toplevels que se destruyen.
+            # Pool propio: las decodificaciones no retrasan las cargas de datos de las vistas
+            self._runner = TaskRunner(widget._root(), pool="imagenes")
+        self._runner.submit(
+            key,
+            lambda: self._service.cargar_miniatura(ruta_imagen, thumb_size),
+            lambda pil_img: self._on_decoded(key, pil_img, display_size),
+            on_error=lambda e: self._on_decoded(key, None, display_size),
+        )
+
+    def _on_decoded(self, key, pil_img, display_size):
+        ctk_img = None
+        if pil_img is not None:
+            ctk_img = ctk.CTkImage(light_image=pil_img, size=display_size)
+            self._store(key, ctk_img, pil_img.width * pil_img.height * len(pil_img.getbands()))
+
+        for callback in self._waiting.pop(key, []):
+            try:
+                callback(ctk_img)
+            except Exception:
+                pass  # El widget destino ya no existe
+
+    def _store(self, key, ctk_img, size_bytes):
+        self._images[key] = (ctk_img, size_bytes)
+        self._bytes += size_bytes
+        while self._bytes > self.MAX_BYTES and len(self._images) > 1:
+            _, (_, evicted) = self._images.popitem(last=False)
+            self._bytes -= evicted
@@ -1,7 +1,7 @@
 import customtkinter as ctk
 from app.ui.styles import AppColors
-from app.services.notification_service import NotificationService
-from app.ui.views.notifications_view import NotificationsView
+from app.services.badge_service import ServicioBadge
+from app.services.config_service import ConfigService
 
 
 class TopBar(ctk.CTkFrame):
@@ -9,10 +9,14 @@ class TopBar(ctk.CTkFrame):
         super().__init__(master, height=60, corner_radius=0, **kwargs)
         self.tasa_var = tasa_var
         self.margen_var = margen_var
-        self.notification_service = NotificationService()
+        # Count is computed on a background thread; the UI only reads the cached value
+        self.badge = ServicioBadge()
+        self._badge_version = None
+        # First count query starts once the window is on screen
+        self.after_idle(lambda: self.badge.iniciar(ConfigService().get_intervalo_badge()))
 
         self._init_ui()
-        self.check_notifications()  # Check on init
+        self.check_notifications()  # Start polling the cache
 
     def _init_ui(self):
         # Logo / Title Area
@@ -49,11 +53,14 @@ class TopBar(ctk.CTkFrame):
         )
         self.lbl_status.pack(side="left", padx=(10, 0))
 
+    BADGE_POLL_MS = 1000
+
     def check_notifications(self):
-        # Quick check to update icon color & badge
+        # Cheap in-memory check: repaint only when the service produced a new count
         # Rule: Only count urgent items (Today + Tomorrow)
-        try:
-            count = self.notification_service.get_urgent_badge_count()
+        if self.badge.version != self._badge_version:
+            self._badge_version = self.badge.version
+            count = self.badge.obtener() or 0
 
             if count > 0:
                 self.btn_notif.configure(fg_color=AppColors.DANGER, text=f"🔔 {count}", text_color="white", width=60)
@@ -61,13 +68,12 @@ class TopBar(ctk.CTkFrame):
                 self.btn_notif.configure(
                     fg_color=AppColors.BG_CARD, text="🔔", text_color=AppColors.TEXT_PRIMARY, width=40
                 )
-        except Exception as e:
-            print(f"Error checking notifications: {e}")
+        self.after(self.BADGE_POLL_MS, self.check_notifications)
 
     def show_notifications(self):
+        from app.ui.views.notifications_view import NotificationsView  # Loaded on first use
+
         NotificationsView(self)
-        # Refresh badge after closing? Idealmente sí, pero por ahora en init/timer
-        # self.check_notifications()
 
     def _create_setting(self, parent, label, variable, rx):
         container = ctk.CTkFrame(parent, fg_color=AppColors.BG_CARD, corner_radius=6)
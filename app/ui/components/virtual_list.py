@@ -0,0 +1,261 @@
+import tkinter
+from bisect import bisect_right
+import customtkinter as ctk
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Lista con scroll que solo materializa las filas visibles en el viewport.
+
+    Las filas se crean con `create_row(parent)` y se rellenan con `bind_row(row, item)`.
+    Al hacer scroll, las filas que salen de la vista se reciclan para los ítems que
+    entran, así el número de widgets depende del alto de la ventana y no del total
+    de registros. `row_height` puede ser un entero o una función `item -> alto`
+    para filas de alto variable.
+
+    Con `key` y `signature`, `set_items` reconcilia por clave: las filas visibles
+    cuya entidad no cambió solo se reubican, sin volver a llamar `bind_row`.
+
+    Para listas paginadas, `on_end_reached()` se llama cuando el viewport llega a
+    las últimas `overscan` filas; la vista agrega la página siguiente con `append_items`.
+
+    La rueda del mouse se escucha con `bind_all`; `destroy()` quita esos handlers, así
+    crear y destruir listas (p. ej. cada ventana de notificaciones) no los acumula.
+    """
+
+    WHEEL_EVENTS = ("<MouseWheel>", "<Button-4>", "<Button-5>")
+
+    def __init__(
+        self,
+        master,
+        create_row,
+        bind_row,
+        row_height=40,
+        row_spacing=4,
+        label_text=None,
+        empty_text="Sin registros.",
+        overscan=3,
+        key=None,
+        signature=None,
+        on_end_reached=None,
+        **kwargs,
+    ):
+        super().__init__(master, **kwargs)
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.row_height = row_height
+        self.row_spacing = row_spacing
+        self.empty_text = empty_text
+        self.overscan = overscan
+        self.key = key
+        self.signature = signature or (lambda item: item)
+        self.on_end_reached = on_end_reached
+
+        self.items = []
+        self._source = None
+        self._offsets = [0]  # _offsets[i] = y de la fila i; el último es el alto total
+        self._active = {}  # índice -> (row, window_id)
+        self._free = []  # (row, window_id) ocultas, listas para reutilizar
+        self._render_pending = False
+        self._width = 1
+
+        if label_text:
+            ctk.CTkLabel(self, text=label_text, font=("Arial", 13, "bold")).pack(fill="x", padx=5, pady=(5, 0))
+
+        body = ctk.CTkFrame(self, fg_color="transparent")
+        body.pack(fill="both", expand=True, padx=5, pady=5)
+
+        self._canvas = tkinter.Canvas(body, highlightthickness=0, bd=0, yscrollincrement=20)
+        self._canvas.configure(bg=self._apply_appearance_mode(self._fg_color))
+        self._scrollbar = ctk.CTkScrollbar(body, command=self._canvas.yview)
+        self._canvas.configure(yscrollcommand=self._on_scroll)
+
+        self._scrollbar.pack(side="right", fill="y")
+        self._canvas.pack(side="left", fill="both", expand=True)
+
+        self._empty_label = ctk.CTkLabel(self._canvas, text=empty_text, text_color="gray")
+        self._empty_window = self._canvas.create_window(0, 20, window=self._empty_label, anchor="n", state="hidden")
+
+        self._canvas.bind("<Configure>", self._on_configure)
+        # Global handlers (the wheel event goes to the widget under the pointer, usually a row);
+        # destroy() removes exactly these so a closed list leaves nothing behind in "all"
+        self._wheel_bindings = [
+            (sequence, self.bind_all(sequence, self._on_mousewheel, add="+")) for sequence in self.WHEEL_EVENTS
+        ]
+
+    # --- API ---
+
+    def set_items(self, items):
+        """
+        Reemplaza los ítems y re-dibuja solo las filas visibles.
+        Pasar otra vez la misma lista (mismo objeto) no hace nada: no mutarla in situ.
+        """
+        if items is self._source and self.items:
+            return  # Misma lista (p. ej. devuelta por la caché de lecturas): nada cambió
+        self._source = items
+        self.items = list(items)
+        self._recompute_offsets()
+
+        previous, self._active = self._active, {}
+        if self.key is None:
+            # Sin clave no sabemos qué fila muestra qué: todas vuelven al pool y se re-enlazan
+            for row, window_id in previous.values():
+                self._hide(row, window_id)
+        else:
+            new_index = {self.key(item): i for i, item in enumerate(self.items)}
+            for row, window_id in previous.values():
+                index = new_index.get(row.vl_key)
+                if index is None or self.signature(self.items[index]) != row.vl_signature:
+                    self._hide(row, window_id)
+                else:
+                    # Misma entidad sin cambios: solo se mueve a su nueva posición
+                    self._active[index] = (row, window_id)
+                    self._position(index, window_id)
+
+        if self.items:
+            self._canvas.itemconfigure(self._empty_window, state="hidden")
+        else:
+            self._empty_label.configure(text=self.empty_text)
+            self._canvas.itemconfigure(self._empty_window, state="normal")
+
+        self._canvas.configure(scrollregion=(0, 0, self._width, self._offsets[-1]))
+        self._render_visible()
+
+    def append_items(self, items):
+        """Agrega ítems al final (página siguiente) sin tocar las filas ya visibles."""
+        if not items:
+            return
+        self.items.extend(items)
+        self._source = None
+        y = self._offsets[-1]
+        for item in items:
+            y += self._height_of(item) + self.row_spacing
+            self._offsets.append(y)
+        self._canvas.itemconfigure(self._empty_window, state="hidden")
+        self._canvas.configure(scrollregion=(0, 0, self._width, self._offsets[-1]))
+        self._render_visible()
+
+    def show_message(self, text):
+        """Vacía la lista y muestra un texto (p. ej. 'Cargando...')."""
+        self.set_items([])
+        self._empty_label.configure(text=text)
+
+    def scroll_to_top(self):
+        self._canvas.yview_moveto(0)
+
+    # --- Internos ---
+
+    def _height_of(self, item):
+        if callable(self.row_height):
+            return self.row_height(item)
+        return self.row_height
+
+    def _recompute_offsets(self):
+        offsets = [0]
+        y = 0
+        for item in self.items:
+            y += self._height_of(item) + self.row_spacing
+            offsets.append(y)
+        self._offsets = offsets
+
+    def _visible_range(self):
+        top = self._canvas.canvasy(0)
+        bottom = top + self._canvas.winfo_height()
+        first = max(bisect_right(self._offsets, top) - 1 - self.overscan, 0)
+        last = min(bisect_right(self._offsets, bottom) + self.overscan, len(self.items))
+        return first, last
+
+    def _acquire(self):
+        if self._free:
+            row, window_id = self._free.pop()
+            self._canvas.itemconfigure(window_id, state="normal")
+            return row, window_id
+        row = self.create_row(self._canvas)
+        window_id = self._canvas.create_window(0, 0, window=row, anchor="nw", width=self._width)
+        return row, window_id
+
+    def _release(self, index):
+        row, window_id = self._active.pop(index)
+        self._hide(row, window_id)
+
+    def _hide(self, row, window_id):
+        self._canvas.itemconfigure(window_id, state="hidden")
+        self._free.append((row, window_id))
+
+    def _position(self, index, window_id):
+        height = self._offsets[index + 1] - self._offsets[index] - self.row_spacing
+        self._canvas.coords(window_id, 0, self._offsets[index])
+        self._canvas.itemconfigure(window_id, width=self._width, height=height)
+
+    def _render_visible(self):
+        self._render_pending = False
+        first, last = self._visible_range()
+
+        for index in [i for i in self._active if i < first or i >= last]:
+            self._release(index)
+
+        for index in range(first, last):
+            if index in self._active:
+                continue
+            item = self.items[index]
+            row, window_id = self._acquire()
+            self.bind_row(row, item)
+            if self.key is not None:
+                row.vl_key = self.key(item)
+                row.vl_signature = self.signature(item)
+            self._position(index, window_id)
+            self._active[index] = (row, window_id)
+
+        if self.on_end_reached is not None and self.items and last >= len(self.items) - self.overscan:
+            self.on_end_reached()
+
+    def _schedule_render(self):
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render_visible)
+
+    def _on_scroll(self, first, last):
+        self._scrollbar.set(first, last)
+        self._schedule_render()
+
+    def _on_configure(self, event):
+        self._width = event.width
+        for _, window_id in list(self._active.values()) + self._free:
+            self._canvas.itemconfigure(window_id, width=event.width)
+        self._canvas.coords(self._empty_window, event.width / 2, 20)
+        self._canvas.configure(scrollregion=(0, 0, event.width, self._offsets[-1]))
+        self._schedule_render()
+
+    def _is_inside(self, widget):
+        while widget is not None:
+            if widget is self:
+                return True
+            widget = getattr(widget, "master", None)
+        return False
+
+    def _on_mousewheel(self, event):
+        if not self.winfo_exists() or not self._is_inside(event.widget):
+            return
+        if self._offsets[-1] <= self._canvas.winfo_height():
+            return
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        else:
+            steps = -int(event.delta / 120) or (-1 if event.delta > 0 else 1)
+        self._canvas.yview_scroll(steps, "units")
+
+    def destroy(self):
+        # unbind_all() would drop every handler of the sequence: remove only our script lines
+        for sequence, funcid in self._wheel_bindings:
+            script = self.tk.call("bind", "all", sequence)
+            kept = [line for line in script.split("\n") if funcid not in line]
+            self.tk.call("bind", "all", sequence, "\n".join(kept))
+        self._wheel_bindings = []
+        super().destroy()  # Also deletes the Tcl commands behind the funcids
+
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        if hasattr(self, "_canvas"):
+            self._canvas.configure(bg=self._apply_appearance_mode(self._fg_color))
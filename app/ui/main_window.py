@@ -1,10 +1,14 @@
+import importlib
+import logging
+import time
 import customtkinter as ctk
-from app.ui.views.inventory_view import InventoryView
-from app.ui.views.customer_view import CustomerView
-from app.ui.views.sales_view import SalesView
-from app.ui.views.pos_view import POSView  # New POS View
 from app.ui.components.top_bar import TopBar  # New TopBar
+from app.ui.change_tracker import ChangeTracker
 from app.services.config_service import ConfigService
+from app.services.exchange_rate_service import ServicioTasas
+from app.utils import startup
+
+logger = logging.getLogger("SmartCredit")
 
 
 class MainWindow(ctk.CTk):
@@ -28,76 +32,141 @@ class MainWindow(ctk.CTk):
 
         # Config Service
         self.config_service = ConfigService()
+        self.rate_service = ServicioTasas()
+        self._rate_after_id = None
 
-        # Global Variables (Observables) - Initialized from Config
-        self.tasa_cambio = ctk.StringVar(value=self.config_service.get_tasa())
+        # Global Variables (Observables) - Rate from the history cache, margin from Config
+        self.tasa_cambio = ctk.StringVar(value=repr(self.rate_service.tasa_actual()))
         self.margen_ganancia = ctk.StringVar(value=self.config_service.get_margen())
 
-        # Bind changes to save config
-        self.tasa_cambio.trace_add("write", self._on_config_change)
-        self.margen_ganancia.trace_add("write", self._on_config_change)
+        # Bind changes to save config (the service validates and debounces the writes)
+        self.tasa_cambio.trace_add("write", self._on_tasa_change)
+        self.margen_ganancia.trace_add("write", self._on_margen_change)
 
         self.views = {}
+        self._interrupted = set()  # Tabs whose loads were cancelled when the user left them
+        # Data each tab shows; a tab reloads only when one of these tables changed
+        self.tracker = ChangeTracker()
 
         self._init_ui()
-
-    def _on_config_change(self, *args):
-        # Update config service when UI variables change
-        self.config_service.set_tasa(self.tasa_cambio.get())
+        self.after(self.CHANGE_POLL_MS, self._poll_changes)
+        # Hidden diagnostics panel (Ctrl+Shift+D): top SQL statements and startup timeline
+        self.bind("<Control-D>", self.open_diagnostics)
+
+    RATE_RECORD_DELAY_MS = 1500
+    CHANGE_POLL_MS = 500
+    # Tab label -> (module, class). Views (and their services) are imported on first visit
+    VIEW_CLASSES = {
+        "Venta": ("app.ui.views.pos_view", "POSView"),
+        "Inventario": ("app.ui.views.inventory_view", "InventoryView"),
+        "Clientes": ("app.ui.views.customer_view", "CustomerView"),
+        "Historial Ventas": ("app.ui.views.sales_view", "SalesView"),
+    }
+    VIEW_TABLES = {
+        "Venta": ("inventario", "clientes"),
+        "Inventario": ("inventario",),
+        "Clientes": ("clientes",),
+        "Historial Ventas": ("ventas", "clientes", "inventario"),
+    }
+
+    def _on_tasa_change(self, *args):
+        if not self.config_service.set_tasa(self.tasa_cambio.get()):
+            return
+        # Record in the rate history once the user stops typing ("36.75" -> one entry, not five)
+        if self._rate_after_id is not None:
+            self.after_cancel(self._rate_after_id)
+        self._rate_after_id = self.after(self.RATE_RECORD_DELAY_MS, self._record_rate)
+
+    def _record_rate(self):
+        self._rate_after_id = None
+        try:
+            self.rate_service.registrar_tasa(float(self.tasa_cambio.get()))
+        except ValueError:
+            pass
+
+    def _on_margen_change(self, *args):
         self.config_service.set_margen(self.margen_ganancia.get())
 
     def _init_ui(self):
         # 1. Top Bar (Global State)
         self.top_bar = TopBar(self, self.tasa_cambio, self.margen_ganancia)
         self.top_bar.pack(side="top", fill="x", padx=0, pady=0)
+        startup.marcar("barra superior")
 
         # 2. Main Tab View (Navigation)
         self.tab_view = ctk.CTkTabview(self, command=self.on_tab_change)
         self.tab_view.pack(side="top", fill="both", expand=True, padx=20, pady=(10, 20))
 
-        # Define Tabs
-        # "Punto de Venta" replaces "Financiamiento" as the main operational screen
-        self.tab_pos = self.tab_view.add("Venta")
-        self.tab_inventory = self.tab_view.add("Inventario")
-        self.tab_customers = self.tab_view.add("Clientes")
-        self.tab_sales = self.tab_view.add("Historial Ventas")
-
-        # 3. Initialize Views
-        # POS (Main)
-        self.pos_view = POSView(self.tab_pos, self.tasa_cambio, self.margen_ganancia)
-        self.pos_view.pack(fill="both", expand=True)
-        self.views["Punto de Venta"] = self.pos_view
-
-        # Inventario
-        # Pasamos callback para que InventoryView notifique cambios a POSView
-        self.inventory_view = InventoryView(self.tab_inventory, on_change=self.pos_view.refresh_products)
-        self.inventory_view.pack(fill="both", expand=True)
-        self.views["Inventario"] = self.inventory_view
-
-        # Clientes
-        # Pasamos callback para que CustomerView notifique cambios a POSView
-        self.customer_view = CustomerView(self.tab_customers, on_change=self.pos_view.load_data)
-        self.customer_view.pack(fill="both", expand=True)
-        self.views["Clientes"] = self.customer_view
-
-        # Historial Ventas
-        self.sales_view = SalesView(self.tab_sales)
-        self.sales_view.pack(fill="both", expand=True)
-        self.views["Historial Ventas"] = self.sales_view
-
-        # Set Default Tab
+        # Define Tabs (empty frames; each view is built the first time its tab is shown)
+        # "Venta" (POS) replaces "Financiamiento" as the main operational screen
+        self.tabs = {name: self.tab_view.add(name) for name in self.VIEW_CLASSES}
+
+        # Set Default Tab: only the POS is built at startup
         self.tab_view.set("Venta")
+        self._ensure_view("Venta")
+        startup.marcar("vista Venta")
+
+    def _ensure_view(self, name):
+        """Imports and builds the view for tab `name` on first use. Returns it (None for unknown tabs)."""
+        view = self.views.get(name)
+        if view is not None or name not in self.VIEW_CLASSES:
+            return view
+
+        started = time.perf_counter()
+        module_name, class_name = self.VIEW_CLASSES[name]
+        view_class = getattr(importlib.import_module(module_name), class_name)
+        args = (self.tasa_cambio, self.margen_ganancia) if name == "Venta" else ()
+        view = view_class(self.tabs[name], *args)
+        view.pack(fill="both", expand=True)
+        self.views[name] = view
+
+        # The view just loaded its data: changes count from here on
+        self.tracker.register(name, self.VIEW_TABLES[name])
+        logger.info(f"Vista '{name}' creada en {(time.perf_counter() - started) * 1000:.0f} ms")
+        return view
 
     def on_tab_change(self):
-        # Smart refresh logic
+        # Smart refresh logic: build on first visit, then reload only if the tab's data changed while hidden
         current_tab = self.tab_view.get()
-        if current_tab in self.views:
-            view = self.views[current_tab]
-            # Duck typing check: if view has 'refresh_list' or 'load_data', call it
-            if hasattr(view, "refresh_list"):
-                view.refresh_list()
-            elif hasattr(view, "load_data"):
-                view.load_data()
+
+        # Drop stale background loads from tabs the user already left
+        for name, view in self.views.items():
+            if name != current_tab and hasattr(view, "runner") and view.runner.has_pending():
+                view.runner.cancel_all()
+                self._interrupted.add(name)
+
+        if current_tab not in self.views:
+            self._ensure_view(current_tab)
+        else:
+            self._refresh_if_dirty(current_tab)
+
+    def _refresh_if_dirty(self, name):
+        view = self.views.get(name)
+        if view is None:
+            return
+        changes = self.tracker.take(name)
+        # A load cancelled on tab switch never arrived: reload everything
+        full_reload = name in self._interrupted
+        self._interrupted.discard(name)
+        if not changes and not full_reload:
+            return
+        # Duck typing: views that can narrow the reload get the changed tables/ids
+        if hasattr(view, "refresh_changes") and not full_reload:
+            view.refresh_changes(changes)
+        elif hasattr(view, "refresh_list"):
+            view.refresh_list()
+        elif hasattr(view, "load_data"):
+            view.load_data()
+
+    def open_diagnostics(self, event=None):
+        from app.ui.views.diagnostics_view import DiagnosticsView  # Loaded on first use
+
+        DiagnosticsView(self)
+
+    def _poll_changes(self):
+        # Writes made while a tab is visible (its own forms, background jobs) show up without switching tabs
+        self._refresh_if_dirty(self.tab_view.get())
+        self.after(self.CHANGE_POLL_MS, self._poll_changes)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+"""
+Ejecución de llamadas a servicios fuera del hilo de Tk.
+
+Los servicios corren en un pool de hilos compartido (cada hilo usa su propia
+conexión del pool de `Database`). Los resultados vuelven por una cola que la UI
+drena con `after()`, así los callbacks siempre se ejecutan en el hilo de Tk.
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("SmartCredit")
+
+# Pools separados: la decodificación de miniaturas (cientos en un inventario grande)
+# no debe hacer esperar a las consultas de las vistas
+POOLS = {"db": (2, "SmartCreditDB"), "imagenes": (1, "SmartCreditImagenes")}  # nombre -> (hilos, prefijo)
+
+_executors = {}
+_executor_lock = threading.Lock()
+
+
+def _get_executor(pool="db"):
+    with _executor_lock:
+        executor = _executors.get(pool)
+        if executor is None:
+            hilos, prefijo = POOLS[pool]
+            executor = _executors[pool] = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix=prefijo)
+        return executor
+
+
+def shutdown():
+    """Detiene los pools descartando lo que no empezó (al cerrar la app)."""
+    with _executor_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class TaskRunner:
+    """
+    Cola de tareas en segundo plano ligada a un widget.
+
+    Cada tarea tiene una clave: enviar otra con la misma clave cancela la anterior
+    y, si ya estaba corriendo, su resultado se descarta (petición obsoleta).
+    """
+
+    POLL_MS = 30
+
+    def __init__(self, widget, pool="db"):
+        self.widget = widget
+        self.pool = pool
+        self._resultados = queue.Queue()
+        self._tokens = {}  # clave -> token de la petición vigente
+        self._futuros = {}  # clave -> Future
+        self._after_id = None
+
+    def submit(self, key, funcion, on_success, on_error=None):
+        """
+        Ejecuta `funcion()` en el pool y llama `on_success(resultado)` en el hilo de Tk.
+        Si la función lanza, se llama `on_error(excepcion)` (o se registra en el log).
+        """
+        self.cancel(key)
+
+        token = object()
+        self._tokens[key] = token
+
+        def tarea():
+            try:
+                resultado = funcion()
+            except Exception as e:
+                self._resultados.put((key, token, None, e, on_success, on_error))
+            else:
+                self._resultados.put((key, token, resultado, None, on_success, on_error))
+
+        self._futuros[key] = _get_executor(self.pool).submit(tarea)
+        self._schedule_poll()
+
+    def cancel(self, key):
+        """Cancela la petición con esa clave; si ya corre, su resultado se ignorará."""
+        futuro = self._futuros.pop(key, None)
+        if futuro is not None:
+            futuro.cancel()
+        self._tokens.pop(key, None)
+
+    def cancel_all(self):
+        for key in list(self._futuros):
+            self.cancel(key)
+
+    def is_pending(self, key):
+        return key in self._tokens
+
+    def has_pending(self):
+        return bool(self._tokens)
+
+    def _schedule_poll(self):
+        if self._after_id is None:
+            try:
+                self._after_id = self.widget.after(self.POLL_MS, self._poll)
+            except Exception:
+                # El widget ya fue destruido
+                self._after_id = None
+
+    def _poll(self):
+        self._after_id = None
+        while True:
+            try:
+                key, token, resultado, error, on_success, on_error = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+
+            if self._tokens.get(key) is not token:
+                continue  # Obsoleta o cancelada
+            del self._tokens[key]
+            self._futuros.pop(key, None)
+
+            try:
+                if error is None:
+                    on_success(resultado)
+                elif on_error is not None:
+                    on_error(error)
+                else:
+                    logger.error(f"Error en tarea de fondo '{key}': {error}")
+            except Exception as e:
+                logger.exception(f"Error al aplicar resultado de '{key}': {e}")
+
+        if self._tokens:
+            self._schedule_poll()
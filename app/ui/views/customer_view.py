@@ -1,21 +1,27 @@
 import customtkinter as ctk
 from tkinter import messagebox
 from app.services.customer_service import ServicioClientes
+from app.services.exchange_rate_service import ServicioTasas
 from app.services.payment_service import PaymentService
+from app.services.search_service import ServicioBusqueda
 from app.services.sales_service import ServiceVentas  # Para historial detallado
 from app.ui.styles import AppColors, AppFonts
+from app.ui.components.search_box import SearchBox
+from app.ui.components.virtual_list import VirtualList
+from app.ui.task_runner import TaskRunner
+from app.utils.enums import EstadoCuota
 from app.utils.exceptions import BusinessRuleError
 
 
 class CustomerView(ctk.CTkFrame):
-    def __init__(self, master, on_change=None, **kwargs):
+    def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         self.service = ServicioClientes()
-        # Optional callback to notify other views about customer changes
-        self.on_change = on_change
         self.payment_service = PaymentService()
+        self.rate_service = ServicioTasas()
         self.sales_service = ServiceVentas()
-        self.abonos_visible = {}  # Store visibility state for abonos details
+        self.search_service = ServicioBusqueda()
+        self.runner = TaskRunner(self)
 
         self._init_ui()
         self.refresh_list()
@@ -26,9 +32,26 @@ class CustomerView(ctk.CTkFrame):
         self.columnconfigure(1, weight=1)
         self.rowconfigure(0, weight=1)
 
-        # --- Left Side: Customer List ---
-        self.list_frame = ctk.CTkScrollableFrame(self, label_text="Lista de Clientes")
-        self.list_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+        # --- Left Side: Search + Customer List ---
+        left_frame = ctk.CTkFrame(self, fg_color="transparent")
+        left_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+
+        self.search = SearchBox(
+            left_frame, on_search=lambda text: self.refresh_list(), placeholder_text="Buscar nombre, cédula o teléfono..."
+        )
+        self.search.pack(fill="x", pady=(0, 5))
+
+        self.list_frame = VirtualList(
+            left_frame,
+            create_row=self._create_customer_card,
+            bind_row=self._bind_customer_card,
+            row_height=56,
+            label_text="Lista de Clientes",
+            empty_text="No hay clientes registrados.",
+            key=lambda c: c.id,
+            signature=lambda c: (c.nombre, c.cedula, c.telefono),
+        )
+        self.list_frame.pack(fill="both", expand=True)
 
         # --- Right Side: Form ---
         self.form_frame = ctk.CTkFrame(self)
@@ -68,12 +91,6 @@ class CustomerView(ctk.CTkFrame):
         try:
             self.service.registrar_cliente(nombre, cedula, telefono)
             self.refresh_list()
-            # Notify other views (e.g., POS) that clients changed
-            try:
-                if callable(self.on_change):
-                    self.on_change()
-            except Exception:
-                pass
             self.clear_form()
             messagebox.showinfo("Éxito", "Cliente registrado correctamente")
         except ValueError as e:
@@ -84,25 +101,27 @@ class CustomerView(ctk.CTkFrame):
         self.entry_cedula.delete(0, "end")
         self.entry_telefono.delete(0, "end")
 
-    def refresh_list(self):
-        # Clear existing items
-        for widget in self.list_frame.winfo_children():
-            widget.destroy()
-
-        customers = self.service.obtener_todos_clientes()
+    SEARCH_LIMIT = 200
 
-        for c in customers:
-            self._create_customer_card(c)
-
-        # Force UI update
-        self.list_frame.update_idletasks()
+    def refresh_list(self):
+        # Query off the Tk thread; visible rows are rebound when the result arrives
+        if not self.list_frame.items:
+            self.list_frame.show_message("Cargando clientes...")
+        text = self.search.text
+        if text:
+            # Ranked prefix search (FTS) instead of the full list
+            self.runner.submit(
+                "clientes", lambda: self.search_service.buscar_clientes(text, self.SEARCH_LIMIT), self.list_frame.set_items
+            )
+        else:
+            self.runner.submit("clientes", self.service.obtener_todos_clientes, self.list_frame.set_items)
 
-    def _create_customer_card(self, customer):
-        card = ctk.CTkFrame(self.list_frame, fg_color=("gray85", "gray25"))
-        card.pack(fill="x", pady=5, padx=5)
+    def _create_customer_card(self, parent):
+        card = ctk.CTkFrame(parent, fg_color=("gray85", "gray25"))
+        card.customer = None
 
-        info_text = f"{customer.nombre}\nCedula: {customer.cedula} | Tlf: {customer.telefono}"
-        ctk.CTkLabel(card, text=info_text, anchor="w").pack(side="left", padx=10, fill="x", expand=True)
+        card.lbl_info = ctk.CTkLabel(card, text="", anchor="w")
+        card.lbl_info.pack(side="left", padx=10, fill="x", expand=True)
 
         ctk.CTkButton(
             card,
@@ -110,110 +129,151 @@ class CustomerView(ctk.CTkFrame):
             width=120,
             font=("Arial", 11, "bold"),
             fg_color=AppColors.INFO,
-            command=lambda c_id=customer.id, c_name=customer.nombre: self.show_account_status(c_id, c_name),
+            command=lambda c=card: self.show_account_status(c.customer.id, c.customer.nombre),
         ).pack(side="right", padx=10)
+        return card
 
-    def show_account_status(self, customer_id, customer_name):
-        history = self.sales_service.obtener_historial_ventas(customer_id)
+    def _bind_customer_card(self, card, customer):
+        card.customer = customer
+        card.lbl_info.configure(text=f"{customer.nombre}\nCedula: {customer.cedula} | Tlf: {customer.telefono}")
 
+    ACCOUNT_BATCH = 15  # Sale cards built per idle tick in the statement window
+
+    def show_account_status(self, customer_id, customer_name):
         top = ctk.CTkToplevel(self)
         top.title(f"Estado de Cuenta: {customer_name}")
         top.geometry("700x500")
         top.attributes("-topmost", True)  # Improvement: Keep window on top for focus
 
+        lbl_summary = ctk.CTkLabel(top, text="", font=("Arial", 12, "bold"))
+        lbl_summary.pack(anchor="w", padx=15, pady=(10, 0))
+
         # Container
         scroll = ctk.CTkScrollableFrame(top, label_text="Ventas y Créditos Activos")
         scroll.pack(fill="both", expand=True, padx=10, pady=10)
-
-        if not history:
+        loading = ctk.CTkLabel(scroll, text="Cargando estado de cuenta...")
+        loading.pack(pady=20)
+
+        # Sales, cuotas and abonos in one background call; the window's own runner keeps
+        # tab switches in the main window from cancelling it
+        top.runner = TaskRunner(top)
+        top.runner.submit(
+            "estado_cuenta",
+            lambda: self.sales_service.obtener_estado_cuenta(customer_id),
+            lambda estado: self._render_account(top, scroll, loading, lbl_summary, estado),
+            lambda error: loading.configure(text=f"Error al cargar: {error}"),
+        )
+
+    def _render_account(self, top, scroll, loading, lbl_summary, estado):
+        loading.destroy()
+        if not estado.ventas:
             ctk.CTkLabel(scroll, text="No hay movimientos registrados.").pack(pady=20)
             return
+        lbl_summary.configure(
+            text=f"{len(estado.ventas)} ventas | Total: ${estado.total_usd:.2f} | Deuda: ${estado.saldo_usd:.2f}",
+            text_color=AppColors.DANGER if estado.saldo_usd > 0 else AppColors.PRIMARY,
+        )
+        # First batch now, the rest in idle ticks so the window paints without waiting for every card
+        self._render_account_batch(top, scroll, estado.ventas, 0)
+
+    def _render_account_batch(self, top, scroll, ventas, start):
+        if not top.winfo_exists():
+            return
+        end = min(start + self.ACCOUNT_BATCH, len(ventas))
+        for cuenta in ventas[start:end]:
+            self._create_sale_card(top, scroll, cuenta)
+        if end < len(ventas):
+            top.after(1, lambda: self._render_account_batch(top, scroll, ventas, end))
+
+    def _create_sale_card(self, top, scroll, cuenta):
+        venta = cuenta.venta
+        saldo = venta.saldo_usd
 
-        for row in history:
-            # Row structure from query: id, fecha, c.nombre, t.nombre, tipo, precio, saldo
-            v_id, fecha, _, prod_name, tipo, precio, saldo = row
+        card = ctk.CTkFrame(scroll, fg_color=AppColors.BG_CARD)
+        card.pack(fill="x", pady=5, padx=5)
+        card.cuenta = cuenta
+        card.details = None  # Built on first "Ver Pagos" click
 
-            card = ctk.CTkFrame(scroll, fg_color=AppColors.BG_CARD)
-            card.pack(fill="x", pady=5, padx=5)
+        # Info Column
+        info_frame = ctk.CTkFrame(card, fg_color="transparent")
+        info_frame.pack(side="left", padx=10, pady=10)
 
-            # Info Column
-            info_frame = ctk.CTkFrame(card, fg_color="transparent")
-            info_frame.pack(side="left", padx=10, pady=10)
+        ctk.CTkLabel(info_frame, text=f"{venta.producto} ({venta.tipo})", font=AppFonts.BODY).pack(anchor="w")
+        ctk.CTkLabel(info_frame, text=f"Fecha: {venta.fecha}", font=("Arial", 10), text_color="gray").pack(anchor="w")
 
-            ctk.CTkLabel(info_frame, text=f"{prod_name} ({tipo})", font=AppFonts.BODY).pack(anchor="w")
-            ctk.CTkLabel(info_frame, text=f"Fecha: {fecha}", font=("Arial", 10), text_color="gray").pack(anchor="w")
+        # Financial Column
+        fin_frame = ctk.CTkFrame(card, fg_color="transparent")
+        fin_frame.pack(side="right", padx=10, pady=10)
 
-            # Financial Column
-            fin_frame = ctk.CTkFrame(card, fg_color="transparent")
-            fin_frame.pack(side="right", padx=10, pady=10)
+        ctk.CTkLabel(fin_frame, text=f"Total: ${venta.total_usd:.2f}", font=("Arial", 11)).pack(anchor="e")
 
-            ctk.CTkLabel(fin_frame, text=f"Total: ${precio:.2f}", font=("Arial", 11)).pack(anchor="e")
+        lbl_saldo = ctk.CTkLabel(
+            fin_frame,
+            text=f"Deuda: ${saldo:.2f}",
+            font=("Arial", 12, "bold"),
+            text_color=AppColors.DANGER if saldo > 0 else AppColors.PRIMARY,
+        )
+        lbl_saldo.pack(anchor="e")
 
-            lbl_saldo = ctk.CTkLabel(
-                fin_frame,
-                text=f"Deuda: ${saldo:.2f}",
-                font=("Arial", 12, "bold"),
-                text_color=AppColors.DANGER if saldo > 0 else AppColors.PRIMARY,
-            )
-            lbl_saldo.pack(anchor="e")
-
-            # Actions
-            # Actions and Details
-            action_frame = ctk.CTkFrame(card, fg_color="transparent")
-            action_frame.pack(fill="x", padx=10, pady=(0, 10))
-
-            if saldo > 0:
-                ctk.CTkButton(
-                    action_frame,
-                    text="💰 ABONAR",
-                    height=24,
-                    width=80,
-                    fg_color="#2a9d8f",
-                    command=lambda vid=v_id, sal=saldo: self.open_payment_dialog(vid, sal, top),
-                ).pack(side="right", padx=5)
-
-            # Toggle Abonos Button
+        # Actions and Details
+        action_frame = ctk.CTkFrame(card, fg_color="transparent")
+        action_frame.pack(fill="x", padx=10, pady=(0, 10))
+
+        if saldo > 0:
             ctk.CTkButton(
                 action_frame,
-                text="Ver Pagos",
+                text="💰 ABONAR",
                 height=24,
                 width=80,
-                fg_color="gray",
-                command=lambda vid=v_id, c=card: self.toggle_abonos(vid, c),
+                fg_color="#2a9d8f",
+                command=lambda vid=venta.id, sal=saldo: self.open_payment_dialog(vid, sal, top),
             ).pack(side="right", padx=5)
 
-    def toggle_abonos(self, venta_id, parent_card):
-        # Check if already open (simple naive check via checking children or explicit tracking)
-        # Better: use a frame container inside parent_card dedicated for details
-
-        # Check if details frame already exists
-        details_frame_name = f"details_{venta_id}"
-
-        # Look for existing frame
-        existing = None
-        for child in parent_card.winfo_children():
-            if getattr(child, "name_id", "") == details_frame_name:
-                existing = child
-                break
-
-        if existing:
-            existing.destroy()
+        # Toggle Abonos Button
+        ctk.CTkButton(
+            action_frame,
+            text="Ver Pagos",
+            height=24,
+            width=80,
+            fg_color="gray",
+            command=lambda c=card: self.toggle_abonos(c),
+        ).pack(side="right", padx=5)
+
+    def toggle_abonos(self, parent_card):
+        # Details come from the preloaded statement: no query per click
+        details = parent_card.details
+        if details is not None:
+            if details.winfo_ismapped():
+                details.pack_forget()
+            else:
+                details.pack(fill="x", padx=10, pady=5)
             return
 
-        # Create Details Frame
         details = ctk.CTkFrame(parent_card, fg_color=("gray90", "gray20"))
-        details.name_id = details_frame_name
         details.pack(fill="x", padx=10, pady=5)
+        parent_card.details = details
+        cuenta = parent_card.cuenta
 
-        abonos = self.payment_service.obtener_abonos_por_venta(venta_id)
-
-        if not abonos:
+        if cuenta.cuotas:
+            ctk.CTkLabel(details, text="Plan de Cuotas:", font=("Arial", 10, "bold")).pack(anchor="w", padx=5, pady=2)
+            for cuota in cuenta.cuotas:
+                ctk.CTkLabel(
+                    details,
+                    text=(
+                        f"#{cuota.numero}  {cuota.fecha_vencimiento}  ${cuota.monto_usd:.2f}"
+                        f"  (pagado ${cuota.monto_pagado_usd:.2f}, {cuota.estado})"
+                    ),
+                    font=("Arial", 10),
+                    text_color=AppColors.PRIMARY if cuota.estado == EstadoCuota.PAGADA else "gray",
+                ).pack(anchor="w", padx=10)
+
+        if not cuenta.abonos:
             ctk.CTkLabel(details, text="No hay abonos registrados.", font=("Arial", 10, "italic")).pack(pady=5)
         else:
             ctk.CTkLabel(details, text="Historial de Pagos:", font=("Arial", 10, "bold")).pack(
                 anchor="w", padx=5, pady=2
             )
-            for abono in abonos:
+            for abono in cuenta.abonos:
                 row = ctk.CTkFrame(details, fg_color="transparent")
                 row.pack(fill="x", padx=5, pady=2)
                 ctk.CTkLabel(row, text=f"{abono.fecha}", width=120, anchor="w", font=("Arial", 10)).pack(side="left")
@@ -238,8 +298,8 @@ class CustomerView(ctk.CTkFrame):
         entry_rate = ctk.CTkEntry(dialog)
         entry_rate.pack(pady=5)
 
-        # Default Rate (Could be fetched from global state if passed, simplest is manual or standard)
-        entry_rate.insert(0, "40.0")
+        # Default Rate: current rate from the history cache (no DB hit)
+        entry_rate.insert(0, repr(self.rate_service.tasa_actual()))
 
         ctk.CTkLabel(dialog, text=f"Saldo Pendiente: ${saldo_actual:.2f}", text_color=AppColors.DANGER).pack(pady=10)
 
@@ -0,0 +1,101 @@
+import customtkinter as ctk
+from app.db.database import Database
+from app.db.query_stats import CUBOS_MS, EstadisticasConsultas
+from app.ui.styles import AppColors
+from app.utils import startup
+
+
+class DiagnosticsView(ctk.CTkToplevel):
+    """
+    Panel de diagnóstico (oculto, Ctrl+Shift+D en la ventana principal).
+
+    Muestra las sentencias SQL más costosas registradas por EstadisticasConsultas
+    (si la medición está activada en la configuración),
+    con su histograma de latencias y el método que las ejecuta, y la línea de tiempo
+    del arranque. Solo lee memoria: abrirlo no consulta la BD.
+    """
+
+    TOP_N = 25
+    ORDER_LABELS = {
+        "Tiempo total": "total",
+        "Promedio": "promedio",
+        "Máximo": "maximo",
+        "Llamadas": "llamadas",
+        "Filas": "filas",
+    }
+    REFRESH_MS = 2000
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.title("Diagnóstico de Consultas")
+        self.geometry("1000x600")
+        self.attributes("-topmost", True)
+
+        self.stats = EstadisticasConsultas()
+        self._init_ui()
+        self.render()
+
+    def _init_ui(self):
+        header = ctk.CTkFrame(self, fg_color=AppColors.BG_CARD)
+        header.pack(fill="x", padx=10, pady=10)
+
+        ctk.CTkLabel(header, text="Ordenar por:", font=("Arial", 12, "bold")).pack(side="left", padx=10, pady=10)
+        self.order_var = ctk.StringVar(value="Tiempo total")
+        ctk.CTkOptionMenu(
+            header, variable=self.order_var, values=list(self.ORDER_LABELS), command=lambda _: self.render()
+        ).pack(side="left", padx=5)
+
+        self.auto_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(header, text="Auto", variable=self.auto_var, command=self._auto_refresh).pack(
+            side="left", padx=10
+        )
+
+        ctk.CTkButton(header, text="Cerrar", width=80, fg_color="gray", command=self.destroy).pack(side="right", padx=5)
+        ctk.CTkButton(header, text="Reiniciar", width=80, fg_color=AppColors.DANGER, command=self.reset).pack(
+            side="right", padx=5
+        )
+        ctk.CTkButton(header, text="🔄 Actualizar", width=100, command=self.render).pack(side="right", padx=5)
+
+        self.lbl_totals = ctk.CTkLabel(self, text="", anchor="w", font=("Arial", 12))
+        self.lbl_totals.pack(fill="x", padx=15)
+
+        self.text = ctk.CTkTextbox(self, font=("Courier New", 11), wrap="none")
+        self.text.pack(fill="both", expand=True, padx=10, pady=10)
+
+    def render(self):
+        calls, total_ms, seconds = self.stats.totales()
+        text = (
+            f"{calls} sentencias en {seconds:.0f} s | {total_ms:.0f} ms en SQLite | "
+            f"umbral de consulta lenta: {self.stats.umbral_lenta_ms:g} ms"
+        )
+        if not Database.INSTRUMENTAR:
+            text = "Medición desactivada: \"instrumentar_consultas\": \"1\" en config.json y reiniciar. " + text
+        self.lbl_totals.configure(text=text)
+
+        buckets = " ".join(f"≤{b}" for b in CUBOS_MS) + f" >{CUBOS_MS[-1]} (ms)"
+        lines = [self.stats.resumen(self.TOP_N, self.ORDER_LABELS[self.order_var.get()]), "", f"Histogramas: {buckets}"]
+        for entry in self.stats.top(self.TOP_N, self.ORDER_LABELS[self.order_var.get()]):
+            origins = ", ".join(f"{origin} x{n}" for origin, n in sorted(entry.origenes.items(), key=lambda o: -o[1]))
+            lines.append(
+                f"{entry.sql[:80]:<80}  p50≤{entry.percentil_ms(50):g} p95≤{entry.percentil_ms(95):g}  "
+                f"{entry.histograma}  sqlite={entry.sentencias}  <- {origins}"
+            )
+        lines += ["", "Arranque:", startup.resumen()]
+
+        # Keep the scroll position across refreshes
+        top = self.text.yview()[0]
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(lines))
+        self.text.configure(state="disabled")
+        self.text.yview_moveto(top)
+
+    def reset(self):
+        self.stats.reiniciar()
+        self.render()
+
+    def _auto_refresh(self):
+        if not self.auto_var.get() or not self.winfo_exists():
+            return
+        self.render()
+        self.after(self.REFRESH_MS, self._auto_refresh)
@@ -1,32 +1,65 @@
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-from PIL import Image
 from app.services.inventory_service import ServiceInventario
+from app.services.asset_service import ServicioImagenes
+from app.services.search_service import ServicioBusqueda
 from app.ui.styles import AppColors
+from app.ui.components.search_box import SearchBox
 from app.ui.components.toast import ToastNotification
-import os
+from app.ui.components.thumbnail_cache import ThumbnailCache
+from app.ui.task_runner import TaskRunner
+from app.utils.reconcile import KeyedReconciler
 
 
 class InventoryView(ctk.CTkFrame):
-    def __init__(self, master, on_change=None, **kwargs):
+    def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         self.service = ServiceInventario()
+        self.thumbnails = ThumbnailCache()
+        self.image_service = ServicioImagenes()
+        self.search_service = ServicioBusqueda()
+        self.runner = TaskRunner(self)
+        self.save_runner = TaskRunner(self)
         self.image_path_var = ctk.StringVar()
-        # Optional callback to notify other views about inventory changes
-        self.on_change = on_change
+        self._last_phones = None
 
         self._init_ui()
         self.refresh_list()
 
+        # Copy legacy external image paths into the managed asset store (background, once)
+        self.runner.submit("migrar_imagenes", self.image_service.migrar_imagenes_existentes, self._on_images_migrated)
+
+    def _on_images_migrated(self, result):
+        migradas, _ = result
+        if migradas:
+            self.refresh_list()
+
     def _init_ui(self):
         # Layout: Left side (List), Right side (Form)
         self.columnconfigure(0, weight=2)
         self.columnconfigure(1, weight=1)
         self.rowconfigure(0, weight=1)
 
-        # --- Left Side: Inventory List ---
-        self.list_frame = ctk.CTkScrollableFrame(self, label_text="Lista de Teléfonos")
-        self.list_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+        # --- Left Side: Search + Inventory List ---
+        left_frame = ctk.CTkFrame(self, fg_color="transparent")
+        left_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+
+        self.search = SearchBox(left_frame, on_search=lambda text: self.refresh_list(), placeholder_text="Buscar modelo...")
+        self.search.pack(fill="x", pady=(0, 5))
+
+        self.list_frame = ctk.CTkScrollableFrame(left_frame, label_text="Lista de Teléfonos")
+        self.list_frame.pack(fill="both", expand=True)
+        self.list_frame.columnconfigure(0, weight=1)
+
+        # One card per phone id; refreshes only touch cards whose data changed
+        self.cards = KeyedReconciler(
+            create=self._create_phone_card,
+            update=self._update_phone_card,
+            remove=lambda card: card.destroy(),
+            place=lambda card, index: card.grid(row=index, column=0, sticky="ew", pady=5, padx=5),
+            key=lambda phone: phone.id,
+            signature=lambda phone: (phone.nombre, phone.costo_original_usd, phone.stock, phone.ruta_imagen),
+        )
 
         # --- Right Side: Form ---
         self.form_frame = ctk.CTkFrame(self)
@@ -52,9 +85,10 @@ class InventoryView(ctk.CTkFrame):
         button_container = ctk.CTkFrame(self.form_frame, fg_color="transparent")
         button_container.pack(pady=20, fill="x")
 
-        ctk.CTkButton(button_container, text="Guardar", command=self.save_phone, fg_color=AppColors.PRIMARY).pack(
-            fill="x", pady=5
+        self.btn_save = ctk.CTkButton(
+            button_container, text="Guardar", command=self.save_phone, fg_color=AppColors.PRIMARY
         )
+        self.btn_save.pack(fill="x", pady=5)
         ctk.CTkButton(button_container, text="Limpiar", command=self.clear_form, fg_color="gray").pack(fill="x", pady=5)
 
     def _create_input(self, label):
@@ -81,18 +115,32 @@ class InventoryView(ctk.CTkFrame):
         try:
             costo_val = float(costo)
             stock_val = int(stock)
-            self.service.agregar_telefono(nombre, costo_val, stock_val, rut_img)
-            self.refresh_list()
-            # Notify other views (e.g., POS) that inventory changed
-            try:
-                if callable(self.on_change):
-                    self.on_change()
-            except Exception:
-                pass
-            self.clear_form()
-            messagebox.showinfo("Éxito", "Teléfono registrado correctamente")
         except ValueError as e:
             messagebox.showerror("Error", str(e))
+            return
+
+        def save():
+            # Hashing/decoding/re-encoding a large photo takes a while: off the Tk thread.
+            # Stores a deduplicated, normalized copy instead of the user's original file
+            ruta = self.image_service.importar_imagen(rut_img)
+            self.service.agregar_telefono(nombre, costo_val, stock_val, ruta)
+
+        self.btn_save.configure(state="disabled", text="Guardando...")
+        # Own runner: tab switches cancel self.runner, and a save must never be dropped
+        self.save_runner.submit("guardar", save, self._on_phone_saved, self._on_save_error)
+
+    def _on_phone_saved(self, _):
+        self.btn_save.configure(state="normal", text="Guardar")
+        self.refresh_list()
+        self.clear_form()
+        messagebox.showinfo("Éxito", "Teléfono registrado correctamente")
+
+    def _on_save_error(self, error):
+        self.btn_save.configure(state="normal", text="Guardar")
+        if isinstance(error, OSError):
+            messagebox.showerror("Error", f"No se pudo importar la imagen: {error}")
+        else:
+            messagebox.showerror("Error", str(error))
 
     def clear_form(self):
         self.entry_nombre.delete(0, "end")
@@ -100,20 +148,60 @@ class InventoryView(ctk.CTkFrame):
         self.entry_stock.delete(0, "end")
         self.image_path_var.set("")
 
+    SEARCH_LIMIT = 200
+
     def refresh_list(self):
-        # Clear existing items
-        for widget in self.list_frame.winfo_children():
-            widget.destroy()
+        text = self.search.text
+        if text:
+            # Ranked prefix search (FTS) off the Tk thread
+            self.runner.submit(
+                "catalogo", lambda: self.search_service.buscar_telefonos(text, self.SEARCH_LIMIT), self._show_phones
+            )
+            return
+        self.runner.cancel("catalogo")
+        # Served from the read cache unless inventario changed; same list -> nothing to do
+        self._show_phones(self.service.obtener_todos_telefonos())
 
-        phones = self.service.obtener_todos_telefonos()
+    def _show_phones(self, phones):
+        if phones is self._last_phones:
+            return
+        self._last_phones = phones
+        self.cards.reconcile(phones)
 
-        for p in phones:
-            self._create_phone_card(p)
+    def _create_phone_card(self, phone):
+        card = ctk.CTkFrame(self.list_frame)
+        card.phone = phone
+        card.ruta_imagen = None
 
-        # Force UI update
-        self.list_frame.update_idletasks()
+        # Image Thumbnail (packed only when the phone has a readable image)
+        card.lbl_img = ctk.CTkLabel(card, text="")
+
+        # Info
+        card.lbl_info = ctk.CTkLabel(card, text="", anchor="w")
+        card.lbl_info.pack(side="left", padx=10, fill="x", expand=True)
+
+        # Delete Button
+        card.btn_delete = ctk.CTkButton(
+            card, text="X", width=30, fg_color=AppColors.DANGER, command=lambda c=card: self.delete_phone(c.phone.id)
+        )
+        card.btn_delete.pack(side="right", padx=5)
+
+        # Quick Update Button (shown only while stock is low, see _update_phone_card)
+        card.btn_add = ctk.CTkButton(
+            card,
+            text="+",
+            width=30,
+            height=24,
+            fg_color=AppColors.SUCCESS,
+            command=lambda c=card: self.prompt_quick_update(c.phone.id, c.phone.nombre),
+        )
+
+        self._update_phone_card(card, phone)
+        return card
+
+    def _update_phone_card(self, card, phone):
+        card.phone = phone
 
-    def _create_phone_card(self, phone):
         # Determine Color based on Stock
         if phone.stock == 0:
             bg_color = (AppColors.DANGER, "#990000")  # Rojo fuerte
@@ -124,50 +212,43 @@ class InventoryView(ctk.CTkFrame):
         else:
             bg_color = ("gray85", "gray25")
             status_text = ""
+        card.configure(fg_color=bg_color)
 
-        card = ctk.CTkFrame(self.list_frame, fg_color=bg_color)
-        card.pack(fill="x", pady=5, padx=5)
-
-        # Image Thumbnail
-        if phone.ruta_imagen and os.path.exists(phone.ruta_imagen):
-            try:
-                pil_img = Image.open(phone.ruta_imagen)
-                pil_img.thumbnail((50, 50))
-                img = ctk.CTkImage(light_image=pil_img, size=(50, 50))
-                lbl_img = ctk.CTkLabel(card, text="", image=img)
-                lbl_img.pack(side="left", padx=5)
-            except Exception:
-                pass
+        # Only request the image again if the path changed (decoded off-thread, cached)
+        if phone.ruta_imagen != card.ruta_imagen:
+            card.ruta_imagen = phone.ruta_imagen
+            card.lbl_img.pack_forget()
+            self.thumbnails.load(
+                card,
+                phone.ruta_imagen,
+                (50, 50),
+                (50, 50),
+                lambda img, c=card, ruta=phone.ruta_imagen: self._apply_phone_image(c, ruta, img),
+            )
 
-        # Info
         info_text = f"{phone.nombre}\nStock: {phone.stock} {status_text} | Costo: ${phone.costo_original_usd}"
-        ctk.CTkLabel(card, text=info_text, anchor="w").pack(side="left", padx=10, fill="x", expand=True)
+        card.lbl_info.configure(text=info_text)
 
         # Quick Update Button (visible if stock < 5 or convenient always? Proposal implies contextual)
         if phone.stock < 10:  # Umbral generoso para falicitar gestión
-            ctk.CTkButton(
-                card,
-                text="+",
-                width=30,
-                height=24,
-                fg_color=AppColors.SUCCESS,
-                command=lambda p_id=phone.id, p_name=phone.nombre: self.prompt_quick_update(p_id, p_name),
-            ).pack(side="right", padx=2)
+            card.btn_add.pack(side="right", padx=2, before=card.btn_delete)
+        else:
+            card.btn_add.pack_forget()
 
-        # Delete Button
-        ctk.CTkButton(
-            card, text="X", width=30, fg_color=AppColors.DANGER, command=lambda p_id=phone.id: self.delete_phone(p_id)
-        ).pack(side="right", padx=5)
+    def _apply_phone_image(self, card, ruta_imagen, img):
+        # The card may have changed image (or been deleted) while decoding
+        if not card.winfo_exists() or card.ruta_imagen != ruta_imagen:
+            return
+        if img:
+            card.lbl_img.configure(image=img)
+            card.lbl_img.pack(side="left", padx=5, before=card.lbl_info)
+        else:
+            card.lbl_img.pack_forget()
 
     def delete_phone(self, phone_id):
         if messagebox.askyesno("Confirmar", "¿Eliminar este teléfono?"):
             self.service.eliminar_telefono(phone_id)
             self.refresh_list()
-            try:
-                if callable(self.on_change):
-                    self.on_change()
-            except Exception:
-                pass
 
     def prompt_quick_update(self, phone_id, phone_name):
         dialog = ctk.CTkInputDialog(text=f"Agregar Stock para {phone_name}:", title="Actualización Rápida")
@@ -183,13 +264,6 @@ class InventoryView(ctk.CTkFrame):
                 self.service.actualizar_stock_rapido(phone_id, val)
                 self.refresh_list()
 
-                # Notify other views
-                try:
-                    if callable(self.on_change):
-                        self.on_change()
-                except Exception:
-                    pass
-
                 # Toast Notification (Professional UX)
                 ToastNotification(self, "Actualizado", f"Se agregaron {val} unidades.", color="green")
 
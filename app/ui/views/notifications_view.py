@@ -1,6 +1,8 @@
 import customtkinter as ctk
 from app.services.notification_service import NotificationService
 from app.ui.styles import AppColors
+from app.ui.components.virtual_list import VirtualList
+from app.ui.task_runner import TaskRunner
 
 
 class NotificationsView(ctk.CTkToplevel):
@@ -11,6 +13,7 @@ class NotificationsView(ctk.CTkToplevel):
         self.attributes("-topmost", True)
 
         self.service = NotificationService()
+        self.runner = TaskRunner(self)
         self.all_data = []  # Cache for client-side filtering
         self.filtered_data = []
 
@@ -50,14 +53,30 @@ class NotificationsView(ctk.CTkToplevel):
 
         # Refresh
         ctk.CTkButton(filter_frame, text="🔄 Actualizar", width=80, command=self.load_data).pack(side="right", padx=10)
+        ctk.CTkButton(
+            filter_frame, text="📋 Copiar Filtrados", width=120, fg_color=AppColors.INFO, command=self.copy_filtered
+        ).pack(side="right", padx=(10, 0))
 
         # --- Content Area ---
-        self.scroll = ctk.CTkScrollableFrame(self, label_text="Listado de Créditos")
+        self.scroll = VirtualList(
+            self,
+            create_row=self._create_card,
+            bind_row=self._bind_card,
+            row_height=self._card_height,
+            row_spacing=10,
+            label_text="Listado de Créditos",
+            empty_text="No se encontraron créditos con estos filtros.",
+            key=lambda item: item.venta_id,
+        )
         self.scroll.pack(fill="both", expand=True, padx=20, pady=10)
 
     def load_data(self):
-        # Fetch from service
-        self.all_data = self.service.get_all_credits_status()
+        # Fetch from service off the Tk thread
+        self.scroll.show_message("Cargando créditos...")
+        self.runner.submit("creditos", self.service.get_all_credits_status, self._on_data_loaded)
+
+    def _on_data_loaded(self, data):
+        self.all_data = data
         self.apply_filters()
 
     def _on_filter_change(self, *args):
@@ -82,16 +101,6 @@ class NotificationsView(ctk.CTkToplevel):
         self.render_list()
 
     def render_list(self):
-        # Clear current
-        for widget in self.scroll.winfo_children():
-            widget.destroy()
-
-        if not self.filtered_data:
-            ctk.CTkLabel(self.scroll, text="No se encontraron créditos con estos filtros.", text_color="gray").pack(
-                pady=40
-            )
-            return
-
         # Sort: Vencidos first, then Proximos, then Al dia
         # Simple custom sort key: Vencido=0, Proximo=1, Al dia=2
         def sort_key(item):
@@ -102,56 +111,41 @@ class NotificationsView(ctk.CTkToplevel):
             return 2
 
         self.filtered_data.sort(key=sort_key)
+        self.scroll.set_items(self.filtered_data)
 
-        for item in self.filtered_data:
-            self._create_card(item)
+    def _card_height(self, item):
+        # Overdue cards carry an extra mora line in the detail text and wrap taller
+        return 84 if item.dias_mora > 0 else 72
 
-    def _create_card(self, item):
-        # Determine Color based on status
-        border_color = AppColors.BG_CARD
-        if "Vencido" in item.estado_etiqueta:
-            border_color = AppColors.DANGER
-        elif "Próximo" in item.estado_etiqueta:
-            border_color = AppColors.WARNING
-
-        card = ctk.CTkFrame(self.scroll, fg_color=AppColors.BG_CARD, border_width=1, border_color=border_color)
-        card.pack(fill="x", pady=5, padx=5)
+    def _create_card(self, parent):
+        card = ctk.CTkFrame(parent, fg_color=AppColors.BG_CARD, border_width=1)
+        card.item = None
 
         # Column 1: Client & Product
         col1 = ctk.CTkFrame(card, fg_color="transparent")
         col1.pack(side="left", padx=10, pady=10, fill="y")
 
-        ctk.CTkLabel(col1, text=item.cliente_nombre, font=("Arial", 14, "bold")).pack(anchor="w")
-        ctk.CTkLabel(col1, text=item.producto_nombre, font=("Arial", 12), text_color="gray").pack(anchor="w")
+        card.lbl_cliente = ctk.CTkLabel(col1, text="", font=("Arial", 14, "bold"))
+        card.lbl_cliente.pack(anchor="w")
+        card.lbl_producto = ctk.CTkLabel(col1, text="", font=("Arial", 12), text_color="gray")
+        card.lbl_producto.pack(anchor="w")
 
         # Column 2: Status & Debt Info
         col2 = ctk.CTkFrame(card, fg_color="transparent")
         col2.pack(side="left", padx=20, pady=10, fill="y")
 
-        status_color = AppColors.TEXT_PRIMARY
-        if "Vencido" in item.estado_etiqueta:
-            status_color = AppColors.DANGER
-        elif "Próximo" in item.estado_etiqueta:
-            status_color = AppColors.WARNING
-        elif "Al día" in item.estado_etiqueta:
-            status_color = AppColors.SUCCESS
-
-        ctk.CTkLabel(col2, text=item.estado_etiqueta, font=("Arial", 12, "bold"), text_color=status_color).pack(
-            anchor="w"
-        )
-
-        detail_text = f"Prox. Cuota: {item.proxima_cuota_fecha} (${item.proxima_cuota_monto:.2f})"
-        if item.dias_mora > 0:
-            detail_text += f" | {item.dias_mora} días mora"
-
-        ctk.CTkLabel(col2, text=detail_text, font=("Arial", 11)).pack(anchor="w")
+        card.lbl_estado = ctk.CTkLabel(col2, text="", font=("Arial", 12, "bold"))
+        card.lbl_estado.pack(anchor="w")
+        card.lbl_detalle = ctk.CTkLabel(col2, text="", font=("Arial", 11), wraplength=260, justify="left")
+        card.lbl_detalle.pack(anchor="w")
 
         # Column 3: Total Balance
         col3 = ctk.CTkFrame(card, fg_color="transparent")
         col3.pack(side="left", padx=20, pady=10, fill="y")
 
         ctk.CTkLabel(col3, text="Saldo Total", font=("Arial", 10), text_color="gray").pack(anchor="w")
-        ctk.CTkLabel(col3, text=f"${item.saldo_pendiente_usd:.2f}", font=("Arial", 14, "bold")).pack(anchor="w")
+        card.lbl_saldo = ctk.CTkLabel(col3, text="", font=("Arial", 14, "bold"))
+        card.lbl_saldo.pack(anchor="w")
 
         # Column 4: Actions
         col4 = ctk.CTkFrame(card, fg_color="transparent")
@@ -163,8 +157,42 @@ class NotificationsView(ctk.CTkToplevel):
             width=100,
             height=30,
             fg_color=AppColors.INFO,
-            command=lambda m=item.mensaje_sugerido: self.copy_to_clipboard(m),
+            command=lambda c=card: self.copy_to_clipboard(c.item.mensaje_sugerido),
         ).pack(side="right")
+        return card
+
+    def _bind_card(self, card, item):
+        card.item = item
+
+        # Determine Color based on status
+        border_color = AppColors.BG_CARD
+        status_color = AppColors.TEXT_PRIMARY
+        if "Vencido" in item.estado_etiqueta:
+            border_color = AppColors.DANGER
+            status_color = AppColors.DANGER
+        elif "Próximo" in item.estado_etiqueta:
+            border_color = AppColors.WARNING
+            status_color = AppColors.WARNING
+        elif "Al día" in item.estado_etiqueta:
+            status_color = AppColors.SUCCESS
+
+        card.configure(border_color=border_color)
+        card.lbl_cliente.configure(text=item.cliente_nombre)
+        card.lbl_producto.configure(text=item.producto_nombre)
+        card.lbl_estado.configure(text=item.estado_etiqueta, text_color=status_color)
+
+        detail_text = f"Prox. Cuota: {item.proxima_cuota_fecha} (${item.proxima_cuota_monto:.2f})"
+        if item.dias_mora > 0:
+            detail_text += f" | {item.dias_mora} días mora"
+        card.lbl_detalle.configure(text=detail_text)
+        card.lbl_saldo.configure(text=f"${item.saldo_pendiente_usd:.2f}")
+
+    def copy_filtered(self):
+        # Bulk render only the credits currently on screen (overdue ones get the collection template)
+        if not self.filtered_data:
+            return
+        mensajes = self.service.generar_mensajes(self.filtered_data)
+        self.copy_to_clipboard("\n\n---\n\n".join(mensajes.values()))
 
     def copy_to_clipboard(self, message):
         self.clipboard_clear()
@@ -1,15 +1,24 @@
+from functools import lru_cache
 import customtkinter as ctk
-from PIL import Image
 from app.services.inventory_service import ServiceInventario
 from app.services.sales_service import ServiceVentas
 from app.services.customer_service import ServicioClientes
+from app.services.search_service import ServicioBusqueda
 from tkinter import messagebox
-import os
+from app.models.dtos import ItemCarritoDTO
 from app.utils.exceptions import BusinessRuleError, InventoryError, SmartCreditError
 from app.ui.styles import AppColors
+from app.ui.components.client_picker import ClientPicker
+from app.ui.components.search_box import SearchBox
+from app.ui.components.thumbnail_cache import ThumbnailCache
+from app.ui.task_runner import TaskRunner
+from app.utils.reconcile import KeyedReconciler
 
 
 class POSView(ctk.CTkFrame):
+    # Installment options offered at the counter (0 = Contado)
+    CUOTAS_OPCIONES = (0, 3, 4, 5, 6)
+
     def __init__(self, master, tasa_var, margen_var, **kwargs):
         super().__init__(master, **kwargs)
 
@@ -20,11 +29,19 @@ class POSView(ctk.CTkFrame):
         self.s_inv = ServiceInventario()
         self.s_ventas = ServiceVentas()
         self.s_clientes = ServicioClientes()
+        self.s_busqueda = ServicioBusqueda()
+        self.runner = TaskRunner(self)
+        self.thumbnails = ThumbnailCache()
 
         # Selection State
-        self.selected_phone = None
+        self.cart = {}  # phone_id -> [Telefono, cantidad] (insertion order = display order)
         self.selected_client_id = None
-        self.customers_map = {}
+
+        # Price recalculation: coalesced per frame, memoized per input tuple, labels diffed
+        self._recalc_after_id = None
+        self._quote_texts = lru_cache(maxsize=256)(self._compute_quote_texts)
+        self._label_state = {}  # label -> options last applied
+        self._last_phones = None
 
         # UI Listeners
         self.tasa_var.trace_add("write", self.update_calculations)
@@ -46,17 +63,29 @@ class POSView(ctk.CTkFrame):
         ctk.CTkLabel(self.left_panel, text="CLIENTE", font=("Arial", 12, "bold"), text_color="gray").pack(
             pady=(10, 0), padx=10, anchor="w"
         )
-        self.combo_client = ctk.CTkComboBox(self.left_panel, command=self.on_client_select)
-        self.combo_client.pack(fill="x", padx=10, pady=5)
+        # Autocomplete by name or cédula; resolves to a client id
+        self.client_picker = ClientPicker(self.left_panel, on_select=self.on_client_select)
+        self.client_picker.pack(fill="x", padx=10, pady=5)
 
-        ctk.CTkLabel(self.left_panel, text="DETALLE PRODUCTO", font=("Arial", 12, "bold"), text_color="gray").pack(
+        ctk.CTkLabel(self.left_panel, text="CARRITO", font=("Arial", 12, "bold"), text_color="gray").pack(
             pady=(20, 0), padx=10, anchor="w"
         )
-        self.lbl_prod_name = ctk.CTkLabel(self.left_panel, text="Ninguno", font=("Arial", 16))
-        self.lbl_prod_name.pack(padx=10, anchor="w")
-
-        self.lbl_stock_status = ctk.CTkLabel(self.left_panel, text="--", font=("Arial", 10))
-        self.lbl_stock_status.pack(padx=10, anchor="w")
+        self.cart_frame = ctk.CTkScrollableFrame(self.left_panel, height=160, fg_color="transparent")
+        self.cart_frame.pack(fill="x", padx=5, pady=2)
+        self.cart_frame.columnconfigure(0, weight=1)
+
+        self.lbl_cart_summary = ctk.CTkLabel(self.left_panel, text="Carrito vacío", font=("Arial", 10))
+        self.lbl_cart_summary.pack(padx=10, anchor="w")
+
+        # One row per product in the cart, updated in place when quantities change
+        self.cart_rows = KeyedReconciler(
+            create=self._create_cart_row,
+            update=self._update_cart_row,
+            remove=lambda row: row.destroy(),
+            place=lambda row, index: row.grid(row=index, column=0, sticky="ew", pady=2),
+            key=lambda line: line[0].id,
+            signature=lambda line: (line[0].nombre, line[1]),
+        )
 
         # Payment Inputs
         ctk.CTkLabel(self.left_panel, text="CONDICIONES PAGO", font=("Arial", 12, "bold"), text_color="gray").pack(
@@ -74,7 +103,9 @@ class POSView(ctk.CTkFrame):
 
         ctk.CTkLabel(self.left_panel, text="Cuotas:").pack(padx=10, anchor="w", pady=(5, 0))
         self.combo_installments = ctk.CTkComboBox(
-            self.left_panel, values=["0 (Contado)", "3", "4", "5", "6"], command=self.update_calculations
+            self.left_panel,
+            values=[self._cuotas_label(c) for c in self.CUOTAS_OPCIONES],
+            command=self.update_calculations,
         )
         self.combo_installments.set("3")
         self.combo_installments.pack(fill="x", padx=10, pady=2)
@@ -83,8 +114,24 @@ class POSView(ctk.CTkFrame):
         self.center_panel = ctk.CTkFrame(self, fg_color="transparent")
         self.center_panel.grid(row=0, column=1, sticky="nsew", padx=5, pady=5)
 
+        self.catalog_search = SearchBox(
+            self.center_panel, on_search=lambda text: self._apply_catalog_filter(), placeholder_text="Buscar producto..."
+        )
+        self.catalog_search.pack(fill="x", pady=(0, 5))
+
         self.catalog_scroll = ctk.CTkScrollableFrame(self.center_panel, label_text="Catálogo de Productos")
         self.catalog_scroll.pack(fill="both", expand=True)
+        self.catalog_placeholder = None
+
+        # One card per product id; a refresh only touches cards whose data changed
+        self.catalog_cards = KeyedReconciler(
+            create=self._create_product_card,
+            update=self._update_product_card,
+            remove=lambda card: card.destroy(),
+            place=self._place_product_card,
+            key=lambda phone: phone.id,
+            signature=lambda phone: (phone.nombre, phone.costo_original_usd, phone.stock, phone.ruta_imagen),
+        )
 
         # === 3. RIGHT: TOTALS ===
         self.right_panel = ctk.CTkFrame(self, fg_color=AppColors.BG_PANEL)
@@ -114,6 +161,28 @@ class POSView(ctk.CTkFrame):
         self.lbl_balance_val = ctk.CTkLabel(self.info_installments_frame, text="Saldo: $0.00", font=("Arial", 12))
         self.lbl_balance_val.pack()
 
+        # Comparison of every installment option (one batch calculation per update)
+        ctk.CTkLabel(self.right_panel, text="COMPARAR OPCIONES", font=("Arial", 12, "bold"), text_color="gray").pack(
+            pady=(15, 0), padx=10, anchor="w"
+        )
+        self.quote_table = ctk.CTkFrame(self.right_panel, fg_color="transparent")
+        self.quote_table.pack(fill="x", padx=10)
+        self.quote_table.columnconfigure((0, 1, 2), weight=1)
+        for col, title in enumerate(("Plan", "Cuota", "Financia")):
+            ctk.CTkLabel(self.quote_table, text=title, font=("Arial", 10, "bold"), text_color="gray").grid(
+                row=0, column=col, sticky="ew"
+            )
+        self.quote_rows = {}
+        for row, cuotas in enumerate(self.CUOTAS_OPCIONES, start=1):
+            labels = [
+                ctk.CTkLabel(self.quote_table, text="--", font=("Arial", 11), cursor="hand2") for _ in range(3)
+            ]
+            labels[0].configure(text=self._cuotas_label(cuotas))
+            for col, lbl in enumerate(labels):
+                lbl.grid(row=row, column=col, sticky="ew")
+                lbl.bind("<Button-1>", lambda e, c=cuotas: self.select_installments(c))
+            self.quote_rows[cuotas] = labels
+
         # Action Buttons
         self.spacer = ctk.CTkLabel(self.right_panel, text="")
         self.spacer.pack(expand=True)
@@ -149,16 +218,28 @@ class POSView(ctk.CTkFrame):
             return False
 
     def load_data(self):
-        # Refresh Clients
-        clients = self.s_clientes.obtener_todos_clientes()
-        self.customers_map = {c.nombre: c.id for c in clients}
-        self.combo_client.configure(values=list(self.customers_map.keys()))
-        if self.customers_map and not self.selected_client_id:
-            self.combo_client.set(list(self.customers_map.keys())[0])
-            self.on_client_select(list(self.customers_map.keys())[0])
-
-        # Refresh Catalog
-        self._populate_catalog()
+        # Consultas en segundo plano; la UI se actualiza cuando llegan los resultados
+        if not self.catalog_cards.nodes:
+            self._show_catalog_placeholder("Cargando catálogo...")
+        # The picker ignores the same cached list object, so reloads are cheap
+        self.runner.submit("clientes", self.s_clientes.obtener_todos_clientes, self.client_picker.set_clients)
+        self.runner.submit("catalogo", self.s_inv.obtener_todos_telefonos, self._on_products_loaded)
+
+    def refresh_changes(self, changes):
+        """Recarga solo lo que cambió mientras la pestaña estaba oculta ({tabla: ids})."""
+        if "clientes" in changes:
+            ids = changes["clientes"]
+            if ids is None or not self.client_picker.clients:
+                self.runner.submit("clientes", self.s_clientes.obtener_todos_clientes, self.client_picker.set_clients)
+            else:
+                # New/edited clients only: fetched by id and inserted into the prefix index
+                self.runner.submit(
+                    "clientes",
+                    lambda: [self.s_clientes.obtener_cliente_por_id(i) for i in ids],
+                    self.client_picker.upsert_clients,
+                )
+        if "inventario" in changes:
+            self.refresh_products()
 
     def refresh_products(self):
         """
@@ -169,155 +250,326 @@ class POSView(ctk.CTkFrame):
         - Si el producto actualmente seleccionado cambió (p. ej. update/delete),
           actualiza la selección o la limpia.
         """
-        # Re-populate catalog (this will query the DB again)
-        self._populate_catalog()
+        self.runner.submit("catalogo", self.s_inv.obtener_todos_telefonos, self._on_products_loaded)
 
-        # If we had a selected product, refresh its data from DB
-        if self.selected_phone:
-            try:
-                fresh = self.s_inv.obtener_telefono_por_id(self.selected_phone.id)
-                if fresh:
-                    self.selected_phone = fresh
-                    self.lbl_prod_name.configure(text=fresh.nombre)
-                    self.lbl_stock_status.configure(text=f"Disponible: {fresh.stock}")
+    def _on_products_loaded(self, phones):
+        # Same cached list as last time: nothing changed
+        if phones is self._last_phones:
+            return
+        self._last_phones = phones
+
+        self._apply_catalog_filter()
+
+        # Refresh cart lines from the fresh list: drop removed products, clamp to stock
+        if self.cart:
+            fresh = {p.id: p for p in phones}
+            for phone_id, line in list(self.cart.items()):
+                phone = fresh.get(phone_id)
+                if phone is None or phone.stock <= 0:
+                    del self.cart[phone_id]
                 else:
-                    # The product was removed; reset selection
-                    self.reset_selection()
-            except Exception:
-                # On any error, ensure UI consistency but don't crash
-                self.reset_selection()
+                    line[0] = phone
+                    line[1] = min(line[1], phone.stock)
+            self._render_cart()
+
+    def _show_catalog_placeholder(self, text):
+        if self.catalog_placeholder is None:
+            self.catalog_placeholder = ctk.CTkLabel(self.catalog_scroll, text=text, text_color="gray")
+            self.catalog_placeholder.grid(row=0, column=0, padx=20, pady=40)
+        else:
+            self.catalog_placeholder.configure(text=text)
 
-        # Ensure UI updates are processed
-        try:
-            self.catalog_scroll.update_idletasks()
-        except Exception:
-            pass
+    SEARCH_LIMIT = 60
+
+    def _apply_catalog_filter(self):
+        # The cart always works on the full list; the search only narrows what the catalog shows
+        text = self.catalog_search.text
+        if not text:
+            self.runner.cancel("busqueda")
+            if self._last_phones is not None:
+                self._populate_catalog(self._last_phones)
+            return
+        self.runner.submit(
+            "busqueda", lambda: self.s_busqueda.buscar_telefonos(text, self.SEARCH_LIMIT), self._populate_catalog
+        )
 
-    def _populate_catalog(self):
-        # Clear
-        for w in self.catalog_scroll.winfo_children():
-            w.destroy()
+    def _populate_catalog(self, phones):
+        if self.catalog_placeholder is not None:
+            self.catalog_placeholder.destroy()
+            self.catalog_placeholder = None
 
-        phones = self.s_inv.obtener_todos_telefonos()
+        # Keyed reconciliation: only new/changed/removed products touch widgets
+        available = [p for p in phones if p.stock > 0]
+        self.catalog_cards.reconcile(available)
+        if not available and self.catalog_search.text:
+            self._show_catalog_placeholder("Sin resultados.")
 
+    def _place_product_card(self, frame, index):
         # Grid layout for cards (e.g. 3 columns)
         cols = 3
-        for i, phone in enumerate(phones):
-            if phone.stock <= 0:
-                continue
-
-            row = i // cols
-            col = i % cols
-
-            self._create_product_card(phone, row, col)
+        frame.grid(row=index // cols, column=index % cols, padx=10, pady=10)
 
-    def _create_product_card(self, phone, r, c):
+    def _create_product_card(self, phone):
         frame = ctk.CTkFrame(self.catalog_scroll, width=180, height=220, fg_color=("white", "#444444"))
-        frame.grid(row=r, column=c, padx=10, pady=10)
-
-        # Make whole frame clickable
-        frame.bind("<Button-1>", lambda e, p=phone: self.select_product(p))
+        frame.phone = phone
+        frame.ruta_imagen = None
 
         # Image
-        if phone.ruta_imagen and os.path.exists(phone.ruta_imagen):
-            try:
-                pil_img = Image.open(phone.ruta_imagen)
-                pil_img.thumbnail((120, 120))
-                img = ctk.CTkImage(pil_img, size=(100, 100))
-                lbl_img = ctk.CTkLabel(frame, text="", image=img)
-                lbl_img.pack(pady=10)
-                lbl_img.bind("<Button-1>", lambda e, p=phone: self.select_product(p))
-            except Exception:
-                ctk.CTkLabel(frame, text="[No IMG]").pack(pady=40)
-        else:
-            ctk.CTkLabel(frame, text="[No IMG]").pack(pady=40)
+        frame.lbl_img = ctk.CTkLabel(frame, text="[No IMG]")
+        frame.lbl_img.pack(pady=40)
 
         # Labels
-        lbl_name = ctk.CTkLabel(frame, text=phone.nombre, font=("Arial", 12, "bold"), wraplength=160)
-        lbl_name.pack()
-        lbl_name.bind("<Button-1>", lambda e, p=phone: self.select_product(p))
+        frame.lbl_name = ctk.CTkLabel(frame, text="", font=("Arial", 12, "bold"), wraplength=160)
+        frame.lbl_name.pack()
+
+        frame.lbl_price = ctk.CTkLabel(frame, text="", text_color="gray")
+        frame.lbl_price.pack()
+
+        frame.lbl_stock = ctk.CTkLabel(frame, text="", font=("Arial", 11, "bold"))
+        frame.lbl_stock.pack(side="bottom", pady=5)
+
+        # Make whole frame clickable (reads the card's current phone, which updates in place)
+        for widget in (frame, frame.lbl_img, frame.lbl_name, frame.lbl_price, frame.lbl_stock):
+            widget.bind("<Button-1>", lambda e, f=frame: self.select_product(f.phone))
+
+        self._update_product_card(frame, phone)
+        return frame
+
+    def _update_product_card(self, frame, phone):
+        frame.phone = phone
+
+        # Only request the image again if the path changed (decoded off-thread, cached)
+        if phone.ruta_imagen != frame.ruta_imagen:
+            frame.ruta_imagen = phone.ruta_imagen
+            frame.lbl_img.configure(text="⏳", image=None)
+            frame.lbl_img.pack_configure(pady=40)
+            self.thumbnails.load(
+                frame,
+                phone.ruta_imagen,
+                (120, 120),
+                (100, 100),
+                lambda img, f=frame, ruta=phone.ruta_imagen: self._apply_product_image(f, ruta, img),
+            )
 
-        lbl_price = ctk.CTkLabel(frame, text=f"Base: ${phone.costo_original_usd}", text_color="gray")
-        lbl_price.pack()
-        lbl_price.bind("<Button-1>", lambda e, p=phone: self.select_product(p))
+        frame.lbl_name.configure(text=phone.nombre)
+        frame.lbl_price.configure(text=f"Base: ${phone.costo_original_usd}")
 
         stk_color = "#2ec4b6" if phone.stock > 5 else ("#ff9f1c" if phone.stock > 2 else "#e63946")
-        lbl_stock = ctk.CTkLabel(frame, text=f"Stock: {phone.stock}", text_color=stk_color, font=("Arial", 11, "bold"))
-        lbl_stock.pack(side="bottom", pady=5)
-        lbl_stock.bind("<Button-1>", lambda e, p=phone: self.select_product(p))
+        frame.lbl_stock.configure(text=f"Stock: {phone.stock}", text_color=stk_color)
+
+    def _apply_product_image(self, frame, ruta_imagen, img):
+        # The card may have been reused for another image while decoding
+        if not frame.winfo_exists() or frame.ruta_imagen != ruta_imagen:
+            return
+        if img:
+            frame.lbl_img.configure(text="", image=img)
+            frame.lbl_img.pack_configure(pady=10)
+        else:
+            frame.lbl_img.configure(text="[No IMG]", image=None)
+            frame.lbl_img.pack_configure(pady=40)
 
     def select_product(self, phone):
-        self.selected_phone = phone
-        self.lbl_prod_name.configure(text=phone.nombre)
-        self.lbl_stock_status.configure(text=f"Disponible: {phone.stock}")
+        # Catalog click: add one unit to the cart
+        self.change_quantity(phone.id, 1, phone)
+
+    def change_quantity(self, phone_id, delta, phone=None):
+        line = self.cart.get(phone_id)
+        if line is None:
+            if phone is None or delta <= 0:
+                return
+            line = self.cart[phone_id] = [phone, 0]
+
+        nueva = line[1] + delta
+        if nueva > line[0].stock:
+            messagebox.showwarning("Stock", f"Solo hay {line[0].stock} unidades de {line[0].nombre}.")
+            return
+        if nueva <= 0:
+            del self.cart[phone_id]
+        else:
+            line[1] = nueva
+        self._render_cart()
+
+    def remove_from_cart(self, phone_id):
+        self.cart.pop(phone_id, None)
+        self._render_cart()
+
+    def _render_cart(self):
+        self.cart_rows.reconcile([tuple(line) for line in self.cart.values()])
+        unidades = sum(line[1] for line in self.cart.values())
+        self.lbl_cart_summary.configure(
+            text=f"{unidades} artículo(s) en {len(self.cart)} producto(s)" if self.cart else "Carrito vacío"
+        )
         self.check_ready()
         self.update_calculations()
 
-    def on_client_select(self, name):
-        if name in self.customers_map:
-            self.selected_client_id = self.customers_map[name]
-            self.check_ready()
+    def _create_cart_row(self, line):
+        row = ctk.CTkFrame(self.cart_frame, fg_color=AppColors.BG_CARD)
+        row.phone_id = line[0].id
+
+        row.lbl_name = ctk.CTkLabel(row, text="", anchor="w", font=("Arial", 11), wraplength=120)
+        row.lbl_name.pack(side="left", padx=5, fill="x", expand=True)
+
+        ctk.CTkButton(
+            row,
+            text="✕",
+            width=24,
+            height=24,
+            fg_color=AppColors.DANGER,
+            command=lambda r=row: self.remove_from_cart(r.phone_id),
+        ).pack(side="right", padx=(2, 5))
+        ctk.CTkButton(
+            row, text="+", width=24, height=24, command=lambda r=row: self.change_quantity(r.phone_id, 1)
+        ).pack(side="right", padx=2)
+        row.lbl_qty = ctk.CTkLabel(row, text="", width=24, font=("Arial", 11, "bold"))
+        row.lbl_qty.pack(side="right")
+        ctk.CTkButton(
+            row, text="-", width=24, height=24, command=lambda r=row: self.change_quantity(r.phone_id, -1)
+        ).pack(side="right", padx=2)
+
+        self._update_cart_row(row, line)
+        return row
+
+    def _update_cart_row(self, row, line):
+        phone, cantidad = line
+        row.lbl_name.configure(text=phone.nombre)
+        row.lbl_qty.configure(text=str(cantidad))
+
+    def _cart_cost_usd(self):
+        return sum(phone.costo_original_usd * cantidad for phone, cantidad in self.cart.values())
+
+    @staticmethod
+    def _cuotas_label(cuotas):
+        return "0 (Contado)" if cuotas == 0 else str(cuotas)
+
+    def _selected_installments(self):
+        cuotas_str = self.combo_installments.get()
+        return 0 if "Contado" in cuotas_str else int(cuotas_str)
+
+    def select_installments(self, cuotas):
+        self.combo_installments.set(self._cuotas_label(cuotas))
+        self.update_calculations()
+
+    def on_client_select(self, client_id):
+        self.selected_client_id = client_id
+        self.check_ready()
 
     def check_ready(self):
-        if self.selected_phone and self.selected_client_id:
+        if self.cart and self.selected_client_id:
             self.btn_process.configure(state="normal", fg_color=AppColors.PRIMARY)
         else:
             self.btn_process.configure(state="disabled", fg_color="gray")
 
     def reset_selection(self):
-        self.selected_phone = None
-        self.lbl_prod_name.configure(text="Ninguno")
-        self.lbl_stock_status.configure(text="--")
+        self.cart.clear()
+        self.cart_rows.reconcile([])
+        self.lbl_cart_summary.configure(text="Carrito vacío")
         self.entry_initial.delete(0, "end")
-        self.lbl_total_usd.configure(text="$0.00")
-        self.lbl_total_bs.configure(text="Bs 0.00")
-        self.lbl_installment_val.configure(text="Cuota: $0.00")
-        self.lbl_balance_val.configure(text="Saldo: $0.00")
+        self._clear_totals()
         self.check_ready()
 
+    def _clear_totals(self):
+        self._set_label(self.lbl_total_usd, text="$0.00")
+        self._set_label(self.lbl_total_bs, text="Bs 0.00")
+        self._set_label(self.lbl_installment_val, text="Cuota: $0.00")
+        self._set_label(self.lbl_balance_val, text="Saldo: $0.00")
+        self._clear_quote_table()
+
+    def _clear_quote_table(self):
+        for labels in self.quote_rows.values():
+            self._set_label(labels[1], text="--")
+            self._set_label(labels[2], text="--")
+
+    RECALC_MS = 16  # One recalculation per frame, whatever the burst of input events
+
     def update_calculations(self, *args):
-        if not self.selected_phone:
-            return
+        # Keystrokes and tasa/margen writes only schedule; the burst is coalesced into one pass
+        if self._recalc_after_id is None:
+            self._recalc_after_id = self.after(self.RECALC_MS, self._recalculate)
 
+    def _read_inputs(self):
+        """(costo, margen, inicial, cuotas, tasa) or None while an input is not a number."""
         try:
             margen = float(self.margen_var.get())
             tasa = float(self.tasa_var.get())
+            cuotas = self._selected_installments()
+        except ValueError:
+            return None
+        try:
+            initial_val = self.entry_initial.get()
+            initial = float(initial_val) if initial_val else 0.0
+        except ValueError:
+            initial = 0.0
+        # Rounded so the same cart in another order hits the same memo entry
+        return (round(self._cart_cost_usd(), 6), margen, initial, cuotas, tasa)
 
-            # Use centralized logic from Service!
-            final_usd = self.s_ventas.calcular_precio_con_margen(self.selected_phone.costo_original_usd, margen)
-
-            # Initial Pay
-            try:
-                initial_val = self.entry_initial.get()
-                initial = float(initial_val) if initial_val else 0.0
-            except Exception:
-                initial = 0.0
-
-            # Installments
-            cuotas_str = self.combo_installments.get()
-            cuotas = 0 if "Contado" in cuotas_str else int(cuotas_str)
-
-            # Centralized Calculation (Using existing Service logic)
-            res = self.s_ventas.calcular_totales_venta(final_usd, initial, cuotas, tasa)
-
-            # UI Update
-            self.lbl_total_usd.configure(text=f"${res.precio_final_usd:.2f}")
-            self.lbl_total_bs.configure(text=f"Bs {res.precio_final_bs:.2f}")
-
-            if res.es_contado:
-                self.lbl_installment_val.configure(text="CONTADO")
-                self.lbl_balance_val.configure(text="Sin Deuda")
+    def _compute_quote_texts(self, costo, margen, initial, cuotas, tasa):
+        """
+        Texts for the comparison table and totals. Memoized per input tuple (see __init__):
+        toggling back to a previous value or retyping the same number costs nothing.
+        Returns (quote_rows, totals); totals is None when the sale is invalid (initial > price).
+        """
+        opciones = self.CUOTAS_OPCIONES if cuotas in self.CUOTAS_OPCIONES else (*self.CUOTAS_OPCIONES, cuotas)
+        # Centralized Calculation: every option in one batch
+        grilla = self.s_ventas.calcular_grilla_cotizaciones(costo, (margen,), (initial,), opciones, tasa)
+
+        quote_rows = []
+        for opcion in self.CUOTAS_OPCIONES:
+            cell = grilla[(margen, initial, opcion)]
+            if cell is None:
+                quote_rows.append((opcion, "--", "--"))
+            elif cell.es_contado:
+                quote_rows.append((opcion, f"${cell.precio_final_usd:.2f}", "$0.00"))
             else:
-                self.lbl_installment_val.configure(text=f"Cuota ({cuotas}): ${res.monto_cuota_usd:.2f}")
-                self.lbl_balance_val.configure(text=f"A Financiar: ${res.saldo_pendiente_usd:.2f}")
+                quote_rows.append((opcion, f"${cell.monto_cuota_usd:.2f}", f"${cell.saldo_pendiente_usd:.2f}"))
 
-        except (ValueError, BusinessRuleError):
-            # Si hay error en cálculo (input invalido o regla negocio), no actualizamos o limpiamos
-            pass
+        res = grilla[(margen, initial, cuotas)]
+        if res is None:
+            return tuple(quote_rows), None
+        if res.es_contado:
+            plan = ("CONTADO", "Sin Deuda")
+        else:
+            plan = (f"Cuota ({cuotas}): ${res.monto_cuota_usd:.2f}", f"A Financiar: ${res.saldo_pendiente_usd:.2f}")
+        return tuple(quote_rows), (f"${res.precio_final_usd:.2f}", f"Bs {res.precio_final_bs:.2f}", *plan)
+
+    def _set_label(self, label, **options):
+        # Only reconfigure what differs from what the label already shows
+        state = self._label_state.setdefault(label, {})
+        changed = {k: v for k, v in options.items() if state.get(k) != v}
+        if changed:
+            label.configure(**changed)
+            state.update(changed)
+
+    def _recalculate(self):
+        self._recalc_after_id = None
+        if not self.cart:
+            # Last line removed: nothing to quote
+            self._clear_totals()
+            return
+        inputs = self._read_inputs()
+        if inputs is None:
+            # Input invalido: no actualizamos
+            return
+        quote_rows, totals = self._quote_texts(*inputs)
+
+        cuotas = inputs[3]
+        for opcion, cuota_text, financia_text in quote_rows:
+            labels = self.quote_rows[opcion]
+            font = ("Arial", 11, "bold") if opcion == cuotas else ("Arial", 11)
+            self._set_label(labels[0], font=font)
+            self._set_label(labels[1], text=cuota_text, font=font)
+            self._set_label(labels[2], text=financia_text, font=font)
+
+        if totals is None:
+            # Regla de negocio (inicial > precio): no actualizamos los totales
+            return
+        for label, text in zip(
+            (self.lbl_total_usd, self.lbl_total_bs, self.lbl_installment_val, self.lbl_balance_val), totals
+        ):
+            self._set_label(label, text=text)
 
     def process_sale(self):
-        if not self.selected_phone or not self.selected_client_id:
-            messagebox.showwarning("Faltan Datos", "Seleccione Cliente y Producto")
+        if not self.cart or not self.selected_client_id:
+            messagebox.showwarning("Faltan Datos", "Seleccione Cliente y agregue productos al carrito")
             return
 
         # Get final values for execution
@@ -325,21 +577,25 @@ class POSView(ctk.CTkFrame):
             margen = float(self.margen_var.get())
             tasa = float(self.tasa_var.get())
 
-            # Use Service!
-            final_usd = self.s_ventas.calcular_precio_con_margen(self.selected_phone.costo_original_usd, margen)
+            # Use Service! One line per product with its final unit price
+            items = [
+                ItemCarritoDTO(
+                    id_telefono=phone.id,
+                    cantidad=cantidad,
+                    precio_unitario_usd=self.s_ventas.calcular_precio_con_margen(phone.costo_original_usd, margen),
+                )
+                for phone, cantidad in self.cart.values()
+            ]
 
             try:
                 initial = float(self.entry_initial.get())
             except Exception:
                 initial = 0.0
 
-            cuotas_str = self.combo_installments.get()
-            cuotas = 0 if "Contado" in cuotas_str else int(cuotas_str)
+            cuotas = self._selected_installments()
 
-            # Execution
-            self.s_ventas.procesar_venta(
-                self.selected_client_id, self.selected_phone.id, final_usd, initial, cuotas, tasa
-            )
+            # Execution (single transaction for the whole cart)
+            self.s_ventas.procesar_venta_carrito(self.selected_client_id, items, initial, cuotas, tasa)
 
             messagebox.showinfo("Éxito", "Venta Registrada Correctamente")
             self.reset_selection()
@@ -1,12 +1,26 @@
 import customtkinter as ctk
+from app.models.dtos import FiltroVentasDTO
+from app.services.customer_service import ServicioClientes
 from app.services.sales_service import ServiceVentas
 from app.ui.styles import AppColors
+from app.ui.components.client_picker import ClientPicker
+from app.ui.components.virtual_list import VirtualList
+from app.ui.task_runner import TaskRunner
+from app.utils.enums import EstadoVenta, TipoVenta
 
 
 class SalesView(ctk.CTkFrame):
+    COLUMN_WIDTHS = [150, 150, 150, 100, 100, 100]
+
+    ALL = "Todos"
+
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         self.service = ServiceVentas()
+        self.customer_service = ServicioClientes()
+        self.runner = TaskRunner(self)
+        self.filtro = FiltroVentasDTO()
+        self._next_cursor = None  # (fecha, id) of the next page; None = no more pages
 
         self._init_ui()
         self.refresh_list()
@@ -20,38 +34,125 @@ class SalesView(ctk.CTkFrame):
         ctk.CTkButton(
             header_frame, text="Actualizar", command=self.refresh_list, width=100, fg_color=AppColors.ACCENT
         ).pack(side="right", padx=10)
+        # Aggregates come from one SQL query, independent of how many pages are loaded
+        self.lbl_totals = ctk.CTkLabel(header_frame, text="", text_color="gray")
+        self.lbl_totals.pack(side="right", padx=10)
+
+        # Filters
+        filter_frame = ctk.CTkFrame(self, fg_color="transparent")
+        filter_frame.pack(fill="x", padx=10, pady=(0, 10))
+
+        self.entry_desde = ctk.CTkEntry(filter_frame, placeholder_text="Desde (AAAA-MM-DD)", width=140)
+        self.entry_desde.pack(side="left", padx=(0, 5))
+        self.entry_hasta = ctk.CTkEntry(filter_frame, placeholder_text="Hasta (AAAA-MM-DD)", width=140)
+        self.entry_hasta.pack(side="left", padx=5)
+        # Filter by client id (autocomplete; names can repeat)
+        self.client_picker = ClientPicker(filter_frame, on_select=lambda client_id: None, max_results=6, width=220)
+        self.client_picker.pack(side="left", padx=5, anchor="n")
+        self.combo_tipo = ctk.CTkComboBox(filter_frame, values=[self.ALL] + [t.value for t in TipoVenta], width=120)
+        self.combo_tipo.set(self.ALL)
+        self.combo_tipo.pack(side="left", padx=5)
+        self.combo_estado = ctk.CTkComboBox(
+            filter_frame, values=[self.ALL] + [e.value for e in EstadoVenta], width=120
+        )
+        self.combo_estado.set(self.ALL)
+        self.combo_estado.pack(side="left", padx=5)
+        ctk.CTkButton(filter_frame, text="Filtrar", command=self.apply_filters, width=80).pack(side="left", padx=5)
+        ctk.CTkButton(filter_frame, text="Limpiar", command=self.clear_filters, width=80, fg_color="gray").pack(
+            side="left", padx=5
+        )
 
         # Table Header
         self.table_header = ctk.CTkFrame(self, fg_color="gray30", height=40)
         self.table_header.pack(fill="x", padx=10)
 
         cols = ["Fecha", "Cliente", "Equipo", "Tipo", "Precio Final", "Deuda Pendiente"]
-        widths = [150, 150, 150, 100, 100, 100]
 
-        for col, w in zip(cols, widths):
+        for col, w in zip(cols, self.COLUMN_WIDTHS):
             ctk.CTkLabel(self.table_header, text=col, width=w, font=("Arial", 12, "bold")).pack(side="left", padx=5)
 
-        # Scrollable List
-        self.list_frame = ctk.CTkScrollableFrame(self)
+        # Virtualized List (only visible rows exist as widgets); next page loads near the end
+        self.list_frame = VirtualList(
+            self,
+            create_row=self._create_row,
+            bind_row=self._bind_row,
+            row_height=32,
+            row_spacing=2,
+            empty_text="No hay ventas registradas.",
+            key=lambda s: s.id,
+            on_end_reached=self.load_next_page,
+        )
         self.list_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
-    def refresh_list(self):
-        # Clear existing
-        for widget in self.list_frame.winfo_children():
-            widget.destroy()
+    # --- Filters ---
 
-        sales = self.service.obtener_historial_ventas()
+    def _read_filters(self):
+        def value(widget):
+            text = widget.get().strip()
+            return None if not text or text == self.ALL else text
 
-        # sales row: id, fecha, nom_cliente, nom_telf, tipo, precio, saldo
+        return FiltroVentasDTO(
+            desde=value(self.entry_desde),
+            hasta=value(self.entry_hasta),
+            id_cliente=self.client_picker.selected_id,
+            tipo_venta=value(self.combo_tipo),
+            estado=value(self.combo_estado),
+        )
 
-        widths = [150, 150, 150, 100, 100, 100]
+    def apply_filters(self):
+        self.filtro = self._read_filters()
+        self.refresh_list()
 
-        for s in sales:
-            row_frame = ctk.CTkFrame(self.list_frame, fg_color=("gray85", "gray25"))
-            row_frame.pack(fill="x", pady=2)
+    def clear_filters(self):
+        self.entry_desde.delete(0, "end")
+        self.entry_hasta.delete(0, "end")
+        self.client_picker.clear()
+        for combo in (self.combo_tipo, self.combo_estado):
+            combo.set(self.ALL)
+        self.apply_filters()
 
-            # Data from s[1] onwards (skip id for display)
-            data_points = [s[1], s[2], s[3], s[4], f"${s[5]:.2f}", f"${s[6]:.2f}"]
+    # --- Loading ---
 
-            for data, w in zip(data_points, widths):
-                ctk.CTkLabel(row_frame, text=data, width=w, anchor="center").pack(side="left", padx=5)
+    def refresh_list(self):
+        # First page + totals off the Tk thread; later pages load as the user scrolls
+        if not self.list_frame.items:
+            self.list_frame.show_message("Cargando ventas...")
+        filtro = self.filtro
+        self.runner.submit("clientes", self.customer_service.obtener_todos_clientes, self.client_picker.set_clients)
+        self.runner.submit("pagina", lambda: self.service.obtener_pagina_historial(filtro), self._on_first_page)
+        self.runner.submit("totales", lambda: self.service.obtener_totales_historial(filtro), self._apply_totals)
+
+    def _on_first_page(self, page):
+        self._next_cursor = page.siguiente
+        self.list_frame.set_items(page.ventas)
+        self.list_frame.scroll_to_top()
+
+    def load_next_page(self):
+        # One page request at a time (a cancelled one, e.g. on tab switch, is simply retried)
+        if self._next_cursor is None or self.runner.is_pending("pagina"):
+            return
+        filtro, cursor = self.filtro, self._next_cursor
+        self.runner.submit("pagina", lambda: self.service.obtener_pagina_historial(filtro, cursor), self._on_next_page)
+
+    def _on_next_page(self, page):
+        self._next_cursor = page.siguiente
+        self.list_frame.append_items(page.ventas)
+
+    def _apply_totals(self, totals):
+        self.lbl_totals.configure(
+            text=f"{totals.cantidad} ventas  ·  Total ${totals.total_usd:,.2f}  ·  Pendiente ${totals.saldo_usd:,.2f}"
+        )
+
+    def _create_row(self, parent):
+        row_frame = ctk.CTkFrame(parent, fg_color=("gray85", "gray25"))
+        row_frame.cells = []
+        for w in self.COLUMN_WIDTHS:
+            lbl = ctk.CTkLabel(row_frame, text="", width=w, anchor="center")
+            lbl.pack(side="left", padx=5)
+            row_frame.cells.append(lbl)
+        return row_frame
+
+    def _bind_row(self, row_frame, s):
+        data_points = [s.fecha, s.cliente, s.producto, s.tipo, f"${s.total_usd:.2f}", f"${s.saldo_usd:.2f}"]
+        for lbl, data in zip(row_frame.cells, data_points):
+            lbl.configure(text=data)
@@ -10,3 +10,16 @@ class EstadoVenta(str, Enum):
 class TipoVenta(str, Enum):
     CONTADO = "Contado"
     FINANCIADO = "Financiado"
+
+
+class FrecuenciaCuotas(str, Enum):
+    SEMANAL = "Semanal"
+    QUINCENAL = "Quincenal"
+    MENSUAL = "Mensual"
+    DIA_DEL_MES = "Dia del mes"
+
+
+class EstadoCuota(str, Enum):
+    PENDIENTE = "Pendiente"
+    PARCIAL = "Parcial"
+    PAGADA = "Pagada"
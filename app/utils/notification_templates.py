@@ -0,0 +1,79 @@
+from functools import lru_cache
+from string import Formatter
+
+
+def _compilar(plantilla):
+    """Separa la plantilla una sola vez en [(texto literal, campo | None)]."""
+    return tuple((literal, campo) for literal, campo, _, _ in Formatter().parse(plantilla))
+
+
+class NotificationTemplates:
+    """
+    Gestor centralizado de plantillas de mensajes.
+    Garantiza que toda comunicación sea humana, consistente y profesional.
+    """
+
+    # Plantillas Base
+    CUOTA_RECORDATORIO = """Hola {cliente} 👋
+
+Te recordamos que mañana {fecha_vencimiento} corresponde el pago de tu cuota #{num_cuota} ({producto}) por un monto de ${monto_usd} USD.
+
+Evita recargos realizando tu pago a tiempo.
+Cualquier duda, estamos a la orden.
+Gracias por tu confianza 🙌"""
+
+    CUOTA_VENCIDA = """Hola {cliente} ⚠️
+
+Notamos que tu cuota #{num_cuota} ({producto}) venció el {fecha_vencimiento}.
+Saldo pendiente: ${monto_usd} USD.
+
+Por favor reporta tu pago lo antes posible para mantener tu crédito activo.
+Saludos."""
+
+    @staticmethod
+    def _aplicar(partes, valores):
+        return "".join(literal + (valores[campo] if campo is not None else "") for literal, campo in partes)
+
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def render_mensaje(vencida, cliente_nombre, producto_nombre, num_cuota, monto_usd, fecha_vence):
+        """
+        Mensaje para una cuota: cobro si está vencida, recordatorio si no.
+        Memoizado por sus entradas (el monto se formatea a 2 decimales, igual que en el texto).
+        """
+        partes = _PARTES_VENCIDA if vencida else _PARTES_RECORDATORIO
+        valores = {
+            "cliente": cliente_nombre,
+            "producto": producto_nombre,
+            "num_cuota": str(num_cuota),
+            "monto_usd": f"{monto_usd:.2f}",
+            "fecha_vencimiento": fecha_vence,
+        }
+        return NotificationTemplates._aplicar(partes, valores)
+
+    @staticmethod
+    def render_lote(entradas):
+        """
+        Renderiza varios mensajes de una vez.
+        `entradas`: iterable de (vencida, cliente, producto, num_cuota, monto_usd, fecha_vence).
+        """
+        render = NotificationTemplates.render_mensaje
+        return [render(*entrada) for entrada in entradas]
+
+    @staticmethod
+    def render_recordatorio(cliente_nombre, producto_nombre, num_cuota, monto_usd, fecha_vence):
+        """Genera el mensaje de recordatorio estándar."""
+        return NotificationTemplates.render_mensaje(
+            False, cliente_nombre, producto_nombre, num_cuota, monto_usd, fecha_vence
+        )
+
+    @staticmethod
+    def render_vencimiento(cliente_nombre, producto_nombre, num_cuota, monto_usd, fecha_vence):
+        """Genera el mensaje de cobro para cuotas vencidas."""
+        return NotificationTemplates.render_mensaje(
+            True, cliente_nombre, producto_nombre, num_cuota, monto_usd, fecha_vence
+        )
+
+
+_PARTES_RECORDATORIO = _compilar(NotificationTemplates.CUOTA_RECORDATORIO)
+_PARTES_VENCIDA = _compilar(NotificationTemplates.CUOTA_VENCIDA)
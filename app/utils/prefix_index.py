@@ -0,0 +1,111 @@
+"""
+Índice de prefijos en memoria para autocompletar (clientes por nombre y cédula).
+
+Las claves normalizadas (minúsculas, sin acentos) se guardan en una lista ordenada:
+una búsqueda es un `bisect` al inicio del rango del prefijo más un recorrido corto,
+sin mirar el resto de los registros.
+"""
+
+import unicodedata
+from bisect import bisect_left, insort
+
+
+def normalizar(texto):
+    """'José  Pérez' -> 'jose  perez' (minúsculas, sin diacríticos)."""
+    descompuesto = unicodedata.normalize("NFKD", texto or "")
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+
+
+def _normalizar_documento(texto):
+    # 'V-12.345.678' -> 'v12345678': se busca igual con o sin separadores
+    return "".join(c for c in normalizar(texto) if c.isalnum())
+
+
+class PrefixIndex:
+    """
+    Índice ordenado `(clave, id)` con una entrada por palabra del nombre y una por documento.
+
+    "per" encuentra a "José Pérez" (por su segunda palabra) y "v123" a la cédula
+    "V-123.456". Con varias palabras, la primera se resuelve con el índice y las demás
+    deben ser prefijo de alguna palabra del nombre o del documento. Los resultados son ids
+    (dos clientes con el mismo nombre nunca se confunden), en orden de la palabra que coincidió.
+    """
+
+    def __init__(self):
+        self._claves = []  # [(clave, id)] ordenada
+        self._registros = {}  # id -> (palabras del nombre, documento), ya normalizados
+
+    def __len__(self):
+        return len(self._registros)
+
+    def __contains__(self, item_id):
+        return item_id in self._registros
+
+    @staticmethod
+    def _entradas(nombre, documento):
+        palabras = tuple(normalizar(nombre).split())
+        return palabras, _normalizar_documento(documento)
+
+    def reconstruir(self, registros):
+        """Reemplaza el contenido con `registros` [(id, nombre, documento)] en una sola ordenación."""
+        self._registros = {}
+        claves = []
+        for item_id, nombre, documento in registros:
+            palabras, doc = self._entradas(nombre, documento)
+            self._registros[item_id] = (palabras, doc)
+            claves.extend((palabra, item_id) for palabra in set(palabras))
+            if doc:
+                claves.append((doc, item_id))
+        claves.sort()
+        self._claves = claves
+
+    def agregar(self, item_id, nombre, documento):
+        """Alta o modificación incremental (O(log n) búsqueda + inserción en la lista)."""
+        if item_id in self._registros:
+            self.eliminar(item_id)
+        palabras, doc = self._entradas(nombre, documento)
+        self._registros[item_id] = (palabras, doc)
+        for clave in set(palabras) | ({doc} if doc else set()):
+            insort(self._claves, (clave, item_id))
+
+    def eliminar(self, item_id):
+        registro = self._registros.pop(item_id, None)
+        if registro is None:
+            return
+        palabras, doc = registro
+        for clave in set(palabras) | ({doc} if doc else set()):
+            i = bisect_left(self._claves, (clave, item_id))
+            if i < len(self._claves) and self._claves[i] == (clave, item_id):
+                del self._claves[i]
+
+    def buscar(self, texto, limite=10):
+        """Ids cuyo nombre/documento coincide con las palabras de `texto`, hasta `limite`."""
+        terminos = normalizar(texto).split()
+        if not terminos:
+            return []
+        primero, resto = terminos[0], terminos[1:]
+
+        # Recorre el rango del prefijo en orden de clave y corta al juntar `limite` ids:
+        # "a" con 50k clientes no revisa las miles de coincidencias que no se mostrarán
+        resultado, vistos = [], set()
+        for prefijo in dict.fromkeys(p for p in (primero, _normalizar_documento(primero)) if p):
+            i = bisect_left(self._claves, (prefijo,))
+            while i < len(self._claves) and self._claves[i][0].startswith(prefijo):
+                item_id = self._claves[i][1]
+                i += 1
+                if item_id in vistos:
+                    continue
+                vistos.add(item_id)
+                if resto and not self._coincide(item_id, resto):
+                    continue
+                resultado.append(item_id)
+                if len(resultado) >= limite:
+                    return resultado
+        return resultado
+
+    def _coincide(self, item_id, terminos):
+        palabras, doc = self._registros[item_id]
+        return all(
+            any(p.startswith(t) for p in palabras) or (doc and doc.startswith(_normalizar_documento(t)))
+            for t in terminos
+        )
@@ -0,0 +1,84 @@
+"""
+Reconciliación por clave entre una lista de entidades y sus widgets.
+En vez de destruir y reconstruir todo, solo se crean, actualizan, eliminan o
+reubican los nodos cuyas entidades cambiaron.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ReconcileStats:
+    """Operaciones realizadas en una reconciliación (para métricas y pruebas)."""
+
+    inserted: int = 0
+    updated: int = 0
+    removed: int = 0
+    moved: int = 0
+
+    @property
+    def total(self):
+        return self.inserted + self.updated + self.removed + self.moved
+
+
+class KeyedReconciler:
+    """
+    Mantiene un nodo (normalmente un widget) por entidad, identificado por `key(item)`.
+
+    - `create(item) -> nodo`: se llama solo para claves nuevas.
+    - `update(nodo, item)`: solo si `signature(item)` cambió desde la última vez.
+    - `remove(nodo)`: para claves que ya no están.
+    - `place(nodo, index)`: solo cuando la posición del nodo cambió.
+    """
+
+    def __init__(self, create, update, remove, place, key, signature):
+        self.create = create
+        self.update = update
+        self.remove = remove
+        self.place = place
+        self.key = key
+        self.signature = signature
+
+        self.nodes = {}
+        self._signatures = {}
+        self._positions = {}
+
+    def reconcile(self, items):
+        inserted = updated = moved = 0
+        seen = set()
+
+        for index, item in enumerate(items):
+            k = self.key(item)
+            sig = self.signature(item)
+            seen.add(k)
+
+            node = self.nodes.get(k)
+            if node is None:
+                node = self.create(item)
+                self.nodes[k] = node
+                inserted += 1
+            elif self._signatures[k] != sig:
+                self.update(node, item)
+                updated += 1
+            self._signatures[k] = sig
+
+            if self._positions.get(k) != index:
+                if k in self._positions:
+                    moved += 1
+                self.place(node, index)
+                self._positions[k] = index
+
+        stale = [k for k in self.nodes if k not in seen]
+        for k in stale:
+            self.remove(self.nodes.pop(k))
+            del self._signatures[k]
+            del self._positions[k]
+
+        return ReconcileStats(inserted, updated, len(stale), moved)
+
+    def clear(self):
+        for node in self.nodes.values():
+            self.remove(node)
+        self.nodes.clear()
+        self._signatures.clear()
+        self._positions.clear()
@@ -0,0 +1,43 @@
+"""
+Línea de tiempo del arranque: desde que `main.py` importa este módulo hasta el
+primer pintado de la ventana.
+
+`marcar(etapa)` anota el tiempo transcurrido; `primer_pintado()` cierra la línea,
+la escribe en el log y avisa si se pasó de `OBJETIVO_SEG`.
+"""
+
+import logging
+import time
+
+logger = logging.getLogger("SmartCredit")
+
+OBJETIVO_SEG = 1.5  # Arranque en frío objetivo hasta el primer pintado
+
+_inicio = time.perf_counter()
+_etapas = []  # [(etapa, segundos desde el inicio)]
+
+
+def marcar(etapa):
+    _etapas.append((etapa, time.perf_counter() - _inicio))
+
+
+def etapas():
+    return list(_etapas)
+
+
+def resumen():
+    """Texto 'etapa +delta (acumulado)' por línea."""
+    lineas, previo = [], 0.0
+    for etapa, t in _etapas:
+        lineas.append(f"  {etapa:<28} +{(t - previo) * 1000:7.1f} ms  ({t * 1000:7.1f} ms)")
+        previo = t
+    return "\n".join(lineas)
+
+
+def primer_pintado():
+    marcar("primer pintado")
+    total = _etapas[-1][1]
+    logger.info(f"Arranque: {total * 1000:.0f} ms hasta el primer pintado\n{resumen()}")
+    if total > OBJETIVO_SEG:
+        logger.warning(f"Arranque más lento que el objetivo ({total:.2f} s > {OBJETIVO_SEG} s).")
+    return total
@@ -0,0 +1,73 @@
+"""
+Benchmark: búsqueda por prefijo en clientes (FTS5 vs. LIKE).
+
+Uso:
+    python -m benchmarks.bench_busqueda [n_clientes]
+
+Mide ServicioBusqueda.buscar_clientes con las consultas típicas de escribir un
+nombre o una cédula, con el índice FTS5 y con el respaldo LIKE, sobre una BD
+temporal (no toca la BD real en DB_DIR). Objetivo: < 20 ms por búsqueda.
+"""
+import random
+import sys
+import tempfile
+import time
+
+from app.db.database import Database
+from app.services.search_service import ServicioBusqueda
+
+NOMBRES = ["José", "María", "Luis", "Ana", "Carlos", "Josefina", "Pedro", "Lucía", "Andrés", "Carmen"]
+APELLIDOS = ["Pérez", "González", "Rodríguez", "Martínez", "Hernández", "López", "Díaz", "Rivas", "Suárez"]
+CONSULTAS = ["j", "jo", "jos", "jose p", "maria gonz", "V102", "V10456", "0414", "carm diaz", "zzz"]
+
+
+def _poblar(db, n_clientes):
+    rnd = random.Random(7)
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO clientes (nombre, cedula, telefono) VALUES (?, ?, ?)",
+            (
+                (
+                    f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}",
+                    f"V{1_000_000 + i}",
+                    f"04{rnd.randint(12, 26)}-{rnd.randint(1_000_000, 9_999_999)}",
+                )
+                for i in range(n_clientes)
+            ),
+        )
+
+
+def _medir(servicio, etiqueta):
+    peor = 0.0
+    for consulta in CONSULTAS:
+        inicio = time.perf_counter()
+        for _ in range(5):
+            servicio.buscar_clientes(consulta, limite=20)
+        ms = (time.perf_counter() - inicio) / 5 * 1000
+        peor = max(peor, ms)
+        print(f"  {etiqueta:<6} {consulta!r:<14} {ms:8.2f} ms")
+    return peor
+
+
+def main():
+    n_clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Database.reset(tmp)
+        db = Database()
+        _poblar(db, n_clientes)
+        servicio = ServicioBusqueda()
+        print(f"{n_clientes} clientes")
+
+        peor_fts = _medir(servicio, "FTS5")
+        with db.transaction() as conn:
+            conn.execute("DROP TABLE clientes_fts")
+        ServicioBusqueda._fts_disponible.clear()
+        peor_like = _medir(servicio, "LIKE")
+        print(f"Peor caso: FTS5 {peor_fts:.2f} ms, LIKE {peor_like:.2f} ms (objetivo < 20 ms)")
+
+        Database().close_all()
+
+
+if __name__ == "__main__":
+    main()
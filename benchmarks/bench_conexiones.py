@@ -0,0 +1,66 @@
+"""
+Benchmark: latencia por consulta con conexión nueva por llamada vs pool por hilo.
+
+Uso:
+    python -m benchmarks.bench_conexiones [n_clientes] [n_consultas]
+
+Crea una BD temporal (no toca la BD real en DB_DIR) con `n_clientes` clientes y
+ejecuta `n_consultas` búsquedas por id con ambos enfoques.
+"""
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from app.db.database import Database
+
+
+def _poblar(db, n_clientes):
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO clientes (nombre, cedula, telefono) VALUES (?, ?, ?)",
+            ((f"Cliente {i}", f"V{i:08d}", "0414-0000000") for i in range(n_clientes)),
+        )
+
+
+def _medir(nombre, funcion, ids):
+    inicio = time.perf_counter()
+    for customer_id in ids:
+        funcion(customer_id)
+    total = time.perf_counter() - inicio
+    print(f"{nombre:<28} {total * 1000:9.1f} ms total | {total / len(ids) * 1e6:8.1f} µs/consulta")
+    return total
+
+
+def main():
+    n_clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    n_consultas = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Database.reset(tmp)
+        db = Database()
+        _poblar(db, n_clientes)
+        ids = [random.randint(1, n_clientes) for _ in range(n_consultas)]
+
+        def conexion_por_llamada(customer_id):
+            # Patrón previo: sqlite3.connect + query + close en cada método de servicio
+            conn = sqlite3.connect(db.DB_NAME)
+            conn.execute("SELECT * FROM clientes WHERE id = ?", (customer_id,)).fetchone()
+            conn.close()
+
+        def conexion_pool(customer_id):
+            conn = db.get_connection()
+            conn.execute("SELECT * FROM clientes WHERE id = ?", (customer_id,)).fetchone()
+            conn.close()
+
+        print(f"{n_clientes} clientes, {n_consultas} consultas por id")
+        antes = _medir("connect() por llamada", conexion_por_llamada, ids)
+        despues = _medir("pool por hilo", conexion_pool, ids)
+        print(f"Mejora: x{antes / despues:.1f}")
+
+        Database.reset()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: generación de planes de cuotas para muchas ventas.
+
+Uso:
+    python -m benchmarks.bench_cronogramas [n_ventas] [cuotas_por_venta]
+
+Compara el patrón previo (un `cursor.execute` por cuota) con
+ServicioCronogramas.regenerar_planes (fechas en Python + un `executemany`),
+sobre una BD temporal (no toca la BD real en DB_DIR).
+"""
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app.db.database import Database
+from app.services.schedule_service import ServicioCronogramas
+
+
+def _poblar(db, n_ventas, cuotas):
+    fecha = datetime(2024, 1, 1)
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('Bench', 'V0', '')")
+        conn.execute("INSERT INTO inventario (nombre, costo_original_usd, stock) VALUES ('Bench', 100, 0)")
+        conn.executemany(
+            """
+            INSERT INTO ventas (id_cliente, id_telefono, fecha, tipo_venta, precio_final_usd, pago_inicial_usd,
+                                saldo_pendiente_usd, cuotas_totales, monto_cuota_usd, tasa_cambio_usada, estado)
+            VALUES (1, 1, ?, 'Financiado', 160, 40, 120, ?, ?, 40, 'Activa')
+        """,
+            (((fecha + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S"), cuotas, 120 / cuotas) for i in range(n_ventas)),
+        )
+
+
+def _ventas(db):
+    with db.connection() as conn:
+        return conn.execute("SELECT id, cuotas_totales, monto_cuota_usd, fecha FROM ventas").fetchall()
+
+
+def main():
+    n_ventas = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    cuotas = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Database.reset(tmp)
+        db = Database()
+        _poblar(db, n_ventas, cuotas)
+        ventas = _ventas(db)
+
+        # Patrón previo: un INSERT por cuota, paso fijo de 14 días
+        inicio = time.perf_counter()
+        with db.transaction() as conn:
+            cursor = conn.cursor()
+            for venta_id, n_cuotas, monto, fecha in ventas:
+                base = datetime.strptime(fecha, "%Y-%m-%d %H:%M:%S")
+                for i in range(1, n_cuotas + 1):
+                    cursor.execute(
+                        """
+                        INSERT INTO cuotas (venta_id, numero_cuota, fecha_vencimiento, monto_usd, estado)
+                        VALUES (?, ?, ?, ?, ?)
+                    """,
+                        (venta_id, i, (base + timedelta(days=i * 14)).strftime("%Y-%m-%d"), monto, "Pendiente"),
+                    )
+        antes = time.perf_counter() - inicio
+
+        with db.transaction() as conn:
+            conn.execute("DELETE FROM cuotas")
+
+        # Motor: fechas calculadas en Python, inserción con executemany
+        inicio = time.perf_counter()
+        with db.transaction() as conn:
+            insertadas = ServicioCronogramas().regenerar_planes(conn.cursor(), ventas)
+        despues = time.perf_counter() - inicio
+
+        print(f"{n_ventas} ventas x {cuotas} cuotas = {insertadas} filas")
+        print(f"{'execute() por cuota':<28} {antes * 1000:9.1f} ms")
+        print(f"{'regenerar_planes':<28} {despues * 1000:9.1f} ms")
+        print(f"Mejora: x{antes / despues:.1f}")
+
+        Database.reset()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: historial de ventas completo vs. paginado por cursor.
+
+Uso:
+    python -m benchmarks.bench_historial [n_ventas]
+
+Compara `obtener_historial_ventas` (todas las filas, orden por fecha) con la
+primera página, una página profunda y los totales de `obtener_pagina_historial` /
+`obtener_totales_historial`, sobre una BD temporal (no toca la BD real en DB_DIR).
+"""
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app.db.database import Database
+from app.models.dtos import FiltroVentasDTO
+from app.services.sales_service import ServiceVentas
+
+
+def _poblar(db, n_ventas):
+    fecha = datetime(2020, 1, 1)
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO clientes (nombre, cedula, telefono) VALUES (?, ?, '')",
+            ((f"Cliente {i}", f"V{i}") for i in range(500)),
+        )
+        conn.execute("INSERT INTO inventario (nombre, costo_original_usd, stock) VALUES ('Bench', 100, 0)")
+        conn.executemany(
+            """
+            INSERT INTO ventas (id_cliente, id_telefono, fecha, tipo_venta, precio_final_usd, pago_inicial_usd,
+                                saldo_pendiente_usd, cuotas_totales, monto_cuota_usd, tasa_cambio_usada, estado)
+            VALUES (?, 1, ?, 'Financiado', 160, 40, 120, 3, 40, 40, 'Activa')
+        """,
+            ((1 + i % 500, (fecha + timedelta(minutes=7 * i)).strftime("%Y-%m-%d %H:%M:%S")) for i in range(n_ventas)),
+        )
+
+
+def _medir(nombre, funcion, repeticiones=5):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        resultado = funcion()
+    ms = (time.perf_counter() - inicio) / repeticiones * 1000
+    print(f"{nombre:<34} {ms:9.2f} ms")
+    return resultado
+
+
+def main():
+    n_ventas = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Database.reset(tmp)
+        db = Database()
+        _poblar(db, n_ventas)
+        servicio = ServiceVentas()
+        print(f"{n_ventas} ventas")
+
+        _medir("Historial completo", servicio.obtener_historial_ventas)
+        pagina = _medir("Primera página (100)", servicio.obtener_pagina_historial)
+        for _ in range(50):
+            pagina = servicio.obtener_pagina_historial(despues_de=pagina.siguiente)
+        _medir("Página 52 (cursor)", lambda: servicio.obtener_pagina_historial(despues_de=pagina.siguiente))
+        filtro = FiltroVentasDTO(desde="2020-06-01", hasta="2020-06-30", id_cliente=7)
+        _medir("Primera página filtrada", lambda: servicio.obtener_pagina_historial(filtro))
+        _medir("Totales (sin filtro)", servicio.obtener_totales_historial)
+
+        Database().close_all()
+
+
+if __name__ == "__main__":
+    main()
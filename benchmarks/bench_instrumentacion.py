@@ -0,0 +1,64 @@
+"""
+Benchmark: costo de la instrumentación de consultas (Database.INSTRUMENTAR).
+
+Uso:
+    python -m benchmarks.bench_instrumentacion [n_clientes] [n_consultas]
+
+Crea una BD temporal (no toca la BD real en DB_DIR) y ejecuta `n_consultas`
+búsquedas por id con conexiones sin instrumentar e instrumentadas.
+"""
+import random
+import sys
+import tempfile
+import time
+
+from app.db.database import Database
+from app.db.query_stats import EstadisticasConsultas
+
+
+def _poblar(db, n_clientes):
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO clientes (nombre, cedula, telefono) VALUES (?, ?, ?)",
+            ((f"Cliente {i}", f"V{i:08d}", "0414-0000000") for i in range(n_clientes)),
+        )
+
+
+def _medir(nombre, tmp, ids):
+    Database.reset(tmp)  # Conexiones nuevas con el valor actual de INSTRUMENTAR
+    db = Database()
+
+    def buscar(customer_id):
+        with db.connection() as conn:
+            conn.execute("SELECT * FROM clientes WHERE id = ?", (customer_id,)).fetchone()
+
+    inicio = time.perf_counter()
+    for customer_id in ids:
+        buscar(customer_id)
+    total = time.perf_counter() - inicio
+    print(f"{nombre:<20} {total * 1000:9.1f} ms total | {total / len(ids) * 1e6:8.1f} µs/consulta")
+    return total
+
+
+def main():
+    n_clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    n_consultas = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Database.reset(tmp)
+        _poblar(Database(), n_clientes)
+        ids = [random.randint(1, n_clientes) for _ in range(n_consultas)]
+
+        print(f"{n_clientes} clientes, {n_consultas} consultas por id")
+        Database.INSTRUMENTAR = False
+        sin = _medir("sin instrumentar", tmp, ids)
+        Database.INSTRUMENTAR = True
+        con = _medir("instrumentado", tmp, ids)
+        print(f"Costo: +{(con - sin) / len(ids) * 1e6:.1f} µs/consulta (x{con / sin:.2f})")
+        print(EstadisticasConsultas().resumen(3))
+
+        Database.reset()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: costo de refrescar una lista con reconstrucción completa vs reconciliación por clave.
+
+Uso:
+    python -m benchmarks.bench_reconciliacion
+
+Los "widgets" son contadores: cada create/update/remove/place cuenta como una
+operación de UI. Con reconstrucción, un cambio de stock cuesta 2N operaciones;
+con reconciliación, el costo de UI depende solo del tamaño del cambio.
+"""
+import time
+
+from app.utils.reconcile import KeyedReconciler
+
+
+def _productos(n):
+    return [(i, f"Producto {i}", 10.0 + i, 5) for i in range(n)]
+
+
+def main():
+    print(f"{'filas':>7} | {'rebuild ops':>11} | {'keyed ops':>9} | {'keyed ms':>8}")
+    for n in (100, 1000, 10000, 50000):
+        items = _productos(n)
+        reconciler = KeyedReconciler(
+            create=lambda item: object(),
+            update=lambda node, item: None,
+            remove=lambda node: None,
+            place=lambda node, index: None,
+            key=lambda item: item[0],
+            signature=lambda item: item,
+        )
+        reconciler.reconcile(items)
+
+        # Un "+" de stock sobre un producto
+        cambiado = list(items)
+        pid, nombre, costo, stock = cambiado[n // 2]
+        cambiado[n // 2] = (pid, nombre, costo, stock + 1)
+
+        inicio = time.perf_counter()
+        stats = reconciler.reconcile(cambiado)
+        ms = (time.perf_counter() - inicio) * 1000
+
+        print(f"{n:>7} | {2 * n:>11} | {stats.total:>9} | {ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
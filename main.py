@@ -1,16 +1,37 @@
+from app.utils import startup  # First import: starts the startup timeline
 from app.ui.main_window import MainWindow
 from app.utils.logger import setup_logger
+from app.db.database import Database
+from app.db.query_stats import EstadisticasConsultas
+from app.services.badge_service import ServicioBadge
+from app.services.config_service import ConfigService
+from app.ui import task_runner
 import logging
 
 if __name__ == "__main__":
+    startup.marcar("imports")
     logger = setup_logger()
-    
+    # Antes de la primera conexión: solo las conexiones nuevas se instrumentan
+    Database.INSTRUMENTAR = ConfigService().get_instrumentar_consultas()
+    EstadisticasConsultas().umbral_lenta_ms = ConfigService().get_umbral_consulta_lenta()
+
     try:
         logger.info("Inicando SmartCredit App...")
         app = MainWindow()
+        startup.marcar("ventana construida")
+        # Runs once Tk has drawn the window and gone idle
+        app.after_idle(startup.primer_pintado)
         app.mainloop()
         logger.info("App closed normally.")
     except Exception as e:
         logger.exception(f"Critical Error: {e}")
         # Optionally show a native popup here if tkinter is still alive
         print(f"CRITICAL ERROR: {e}")
+    finally:
+        # Detiene las tareas de fondo y cierra las conexiones del pool (checkpoint del WAL)
+        task_runner.shutdown()
+        ServicioBadge().detener()
+        ConfigService().flush()
+        Database().close_all()
+        if Database.INSTRUMENTAR:
+            logger.info(f"Consultas más costosas de la sesión:\n{EstadisticasConsultas().resumen()}")
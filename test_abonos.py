@@ -0,0 +1,77 @@
+import sqlite3
+import unittest
+
+from app.db.migrations import MIGRACIONES, aplicar_migraciones
+from app.models.dtos import ItemCarritoDTO
+from app.services.payment_service import PaymentService
+from app.services.sales_service import ServiceVentas
+from tests_base import PruebaConBD
+
+
+class TestImputacionAbonos(PruebaConBD):
+    def setUp(self):
+        super().setUp()
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('Ana', 'V1', '')")
+            conn.execute("INSERT INTO inventario (nombre, costo_original_usd, stock) VALUES ('Phone', 100, 5)")
+        # Precio 150, inicial 30 -> 120 financiados en 3 cuotas de 40
+        item = ItemCarritoDTO(id_telefono=1, cantidad=1, precio_unitario_usd=150.0)
+        self.venta_id = ServiceVentas().procesar_venta_carrito(1, [item], 30.0, 3, 1.0)
+        self.pagos = PaymentService()
+
+    def _cuotas(self):
+        with self.db.connection() as conn:
+            return conn.execute(
+                "SELECT estado, monto_pagado_usd FROM cuotas WHERE venta_id = ? ORDER BY numero_cuota",
+                (self.venta_id,),
+            ).fetchall()
+
+    def test_abono_parcial_se_imputa_a_la_mas_antigua(self):
+        self.pagos.registrar_abono(self.venta_id, 50.0, 1.0)
+        self.assertEqual(self._cuotas(), [("Pagada", 40.0), ("Parcial", 10.0), ("Pendiente", 0.0)])
+
+        self.pagos.registrar_abono(self.venta_id, 30.0, 1.0)
+        self.assertEqual(self._cuotas(), [("Pagada", 40.0), ("Pagada", 40.0), ("Pendiente", 0.0)])
+
+    def test_saldo_cero_cierra_todas(self):
+        self.pagos.registrar_abono(self.venta_id, 120.0, 1.0)
+        self.assertEqual(self._cuotas(), [("Pagada", 40.0)] * 3)
+        with self.db.connection() as conn:
+            estado = conn.execute("SELECT estado FROM ventas WHERE id = ?", (self.venta_id,)).fetchone()[0]
+        self.assertEqual(estado, "Pagada")
+
+    def test_alertas_usan_el_pendiente_de_la_cuota(self):
+        from app.services.notification_service import NotificationService
+
+        self.pagos.registrar_abono(self.venta_id, 50.0, 1.0)
+        estado = NotificationService().get_all_credits_status()[0]
+        self.assertAlmostEqual(estado.proxima_cuota_monto, 30.0)
+
+
+class TestMigracionImputacion(unittest.TestCase):
+    def test_respalda_abonos_previos(self):
+        conn = sqlite3.connect(":memory:")
+        cursor = conn.cursor()
+        for numero, _, migracion in MIGRACIONES:
+            if numero <= 5:
+                migracion(cursor)
+        cursor.execute("PRAGMA user_version = 5")
+        cursor.execute(
+            "INSERT INTO ventas (id, id_cliente, id_telefono, fecha, tipo_venta, precio_final_usd, pago_inicial_usd, "
+            "saldo_pendiente_usd, cuotas_totales, monto_cuota_usd, tasa_cambio_usada, estado) "
+            "VALUES (1, 1, 1, '2024-01-01', 'Financiado', 150, 30, 55, 3, 40, 1, 'Activa')"
+        )
+        cursor.executemany(
+            "INSERT INTO cuotas (venta_id, numero_cuota, fecha_vencimiento, monto_usd) VALUES (1, ?, '2024-02-01', 40)",
+            [(1,), (2,), (3,)],
+        )
+        conn.commit()
+
+        aplicar_migraciones(conn)
+        rows = conn.execute("SELECT estado, monto_pagado_usd FROM cuotas ORDER BY numero_cuota").fetchall()
+        self.assertEqual(rows, [("Pagada", 40.0), ("Parcial", 25.0), ("Pendiente", 0.0)])
+        conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+import unittest
+
+from app.utils import startup
+
+
+class TestArranque(unittest.TestCase):
+    def setUp(self):
+        self.etapas = startup.etapas()
+
+    def tearDown(self):
+        startup._etapas[:] = self.etapas
+
+    def test_primer_pintado_cierra_la_linea_de_tiempo(self):
+        startup._etapas.clear()
+        startup.marcar("imports")
+        with self.assertLogs("SmartCredit", level="INFO") as logs:
+            total = startup.primer_pintado()
+        self.assertEqual([e for e, _ in startup.etapas()], ["imports", "primer pintado"])
+        self.assertGreaterEqual(total, startup.etapas()[0][1])
+        self.assertIn("primer pintado", logs.output[0])
+
+    def test_arranque_lento_se_avisa(self):
+        original = startup.OBJETIVO_SEG
+        startup.OBJETIVO_SEG = 0
+        try:
+            with self.assertLogs("SmartCredit", level="WARNING"):
+                startup.primer_pintado()
+        finally:
+            startup.OBJETIVO_SEG = original
+
+    def test_servicios_de_imagen_no_cargan_pil_al_importarse(self):
+        codigo = (
+            "import sys, app.services.asset_service, app.services.thumbnail_service; "
+            "print('PIL' in sys.modules)"
+        )
+        salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True)
+        self.assertEqual(salida.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
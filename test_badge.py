@@ -0,0 +1,76 @@
+import time
+import unittest
+from datetime import date, timedelta
+
+from app.models.dtos import ItemCarritoDTO
+from app.services.badge_service import ServicioBadge
+from app.services.event_bus import BusCambios
+from app.services.payment_service import PaymentService
+from app.services.sales_service import ServiceVentas
+from tests_base import PruebaConBD
+
+
+class TestServicioBadge(PruebaConBD):
+    def setUp(self):
+        super().setUp()
+        ServicioBadge.reset()
+        self.badge = ServicioBadge()
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('Ana', 'V1', '')")
+            conn.execute("INSERT INTO inventario (nombre, costo_original_usd, stock) VALUES ('Phone', 100, 5)")
+
+    def tearDown(self):
+        ServicioBadge.reset()
+        super().tearDown()
+
+    def _venta_con_cuota_hoy(self):
+        item = ItemCarritoDTO(id_telefono=1, cantidad=1, precio_unitario_usd=100.0)
+        venta_id = ServiceVentas().procesar_venta_carrito(1, [item], 0.0, 2, 1.0)
+        with self.db.transaction() as conn:
+            conn.execute(
+                "UPDATE cuotas SET fecha_vencimiento = ? WHERE venta_id = ? AND numero_cuota = 1",
+                (date.today().isoformat(), venta_id),
+            )
+        return venta_id
+
+    def _esperar_conteo(self, esperado, timeout=5):
+        # Un recálculo ya en curso puede publicar un valor previo; se espera al que corresponde
+        limite = time.monotonic() + timeout
+        while self.badge.obtener() != esperado and time.monotonic() < limite:
+            time.sleep(0.01)
+        self.assertEqual(self.badge.obtener(), esperado)
+
+    def test_cache_no_consulta_hasta_invalidar(self):
+        self.assertIsNone(self.badge.obtener())
+        self.assertEqual(self.badge.refrescar(), 0)
+        version = self.badge.version
+
+        # Sin invalidación ni intervalo vencido, el conteo cacheado no se recalcula
+        self.badge.iniciar(intervalo=3600)
+        time.sleep(0.1)
+        self.assertLessEqual(self.badge.version, version + 1)
+
+        venta_id = self._venta_con_cuota_hoy()
+        self.badge.invalidar()  # la fecha de la cuota se movió después de la venta
+        self._esperar_conteo(1)
+
+        PaymentService().registrar_abono(venta_id, 50.0, 1.0)  # paga la cuota de hoy e invalida
+        self._esperar_conteo(0)
+
+    def test_cambio_de_dia_requiere_refresco(self):
+        self.badge.refrescar()
+        self.assertFalse(self.badge._necesita_refresco())
+        self.badge._hoy = lambda: date.today() + timedelta(days=1)
+        self.assertTrue(self.badge._necesita_refresco())
+
+    def test_reset_suelta_la_suscripcion(self):
+        anterior = self.badge
+        ServicioBadge.reset()
+        self.badge = ServicioBadge()
+        suscriptores = BusCambios()._suscriptores
+        self.assertNotIn(anterior._on_cambio, suscriptores)
+        self.assertEqual(suscriptores.count(self.badge._on_cambio), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+from app.db.database import Database
+from app.services.customer_service import ServicioClientes
+from app.services.inventory_service import ServiceInventario
+from app.services.search_service import ServicioBusqueda
+from tests_base import PruebaConBD
+
+
+class TestBusqueda(PruebaConBD):
+    def setUp(self):
+        super().setUp()
+        self.clientes = ServicioClientes()
+        self.inv = ServiceInventario()
+        self.busqueda = ServicioBusqueda()
+        for nombre, cedula, telefono in [
+            ("José Pérez", "V12345", "0414-555"),
+            ("Josefina Rivas", "V98765", "0424-111"),
+            ("Ana Martínez", "V55512", "0412-987"),
+            ("Ana Josa", "E777", ""),
+        ]:
+            self.clientes.registrar_cliente(nombre, cedula, telefono)
+        self.inv.agregar_telefono("Samsung Galaxy A15", 100.0, 3, "")
+        self.inv.agregar_telefono("iPhone 13 Pro", 500.0, 1, "")
+
+    def _nombres(self, texto):
+        return [c.nombre for c in self.busqueda.buscar_clientes(texto)]
+
+    def test_prefijo_sin_acentos_y_varias_palabras(self):
+        self.assertEqual(set(self._nombres("jos")), {"Ana Josa", "José Pérez", "Josefina Rivas"})
+        self.assertEqual(self._nombres("jose pe"), ["José Pérez"])
+        self.assertEqual(self._nombres("V5551"), ["Ana Martínez"])
+        self.assertEqual(self._nombres(""), [])
+        self.assertEqual([t.nombre for t in self.busqueda.buscar_telefonos("gal")], ["Samsung Galaxy A15"])
+
+    def test_nombre_pesa_mas_que_la_cedula(self):
+        self.clientes.registrar_cliente("Pedro Gil", "ANA1", "")
+        self.assertEqual(self._nombres("ana")[-1], "Pedro Gil")
+
+    def test_texto_con_sintaxis_fts_no_falla(self):
+        for texto in ['"', "ana*", "ana AND", "NOT", "(jos", "v-123", "a:b"]:
+            self.busqueda.buscar_clientes(texto)
+
+    def test_triggers_mantienen_el_indice(self):
+        telefono = self.busqueda.buscar_telefonos("iphone")[0]
+        self.inv.actualizar_telefono(telefono.id, "Motorola G84", 200.0, 1, "")
+        self.assertEqual(self.busqueda.buscar_telefonos("iphone"), [])
+        self.assertEqual([t.id for t in self.busqueda.buscar_telefonos("moto")], [telefono.id])
+
+        self.inv.eliminar_telefono(telefono.id)
+        self.assertEqual(self.busqueda.buscar_telefonos("moto"), [])
+
+    def test_sin_fts_usa_like(self):
+        with Database().transaction() as conn:
+            conn.execute("DROP TABLE clientes_fts")
+        ServicioBusqueda._fts_disponible.clear()
+        with self.assertLogs("SmartCredit", level="WARNING"):
+            self.assertEqual(self._nombres("Ana Mar"), ["Ana Martínez"])
+        self.assertEqual(self._nombres("50%"), [])
+
+    def test_like_y_fts_devuelven_las_mismas_filas(self):
+        self.clientes.registrar_cliente("Mariana Díaz", "V81234", "0416-222")
+        textos = ["ana", "jos", "mar", "123", "v8", "0416", "ana mart", "rivas v9"]
+        con_fts = {t: set(self._nombres(t)) for t in textos}
+
+        with Database().transaction() as conn:
+            conn.execute("DROP TABLE clientes_fts")
+        ServicioBusqueda._fts_disponible.clear()
+        with self.assertLogs("SmartCredit", level="WARNING"):
+            self.busqueda.buscar_clientes("x")
+        self.assertEqual({t: set(self._nombres(t)) for t in textos}, con_fts)
+        self.assertNotIn("Mariana Díaz", con_fts["ana"])
+        self.assertEqual(con_fts["123"], set())
+
+
+if __name__ == "__main__":
+    unittest.main()
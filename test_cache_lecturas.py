@@ -0,0 +1,54 @@
+import sqlite3
+import unittest
+
+from app.db.database import Database
+from app.services.cache_service import CacheLecturas
+from app.services.customer_service import ServicioClientes
+from app.services.inventory_service import ServiceInventario
+from tests_base import PruebaConBD
+
+
+class TestCacheLecturas(PruebaConBD):
+    def setUp(self):
+        super().setUp()
+        self.inv = ServiceInventario()
+        self.clientes = ServicioClientes()
+        self.inv.agregar_telefono("A", 100.0, 5, "")
+
+    def tearDown(self):
+        CacheLecturas().limpiar()
+        super().tearDown()
+
+    def test_sin_cambios_no_reconsulta(self):
+        primera = self.inv.obtener_todos_telefonos()
+        self.assertIs(self.inv.obtener_todos_telefonos(), primera)
+
+    def test_escrituras_propias_invalidan_solo_su_tabla(self):
+        telefonos = self.inv.obtener_todos_telefonos()
+        clientes = self.clientes.obtener_todos_clientes()
+
+        self.inv.actualizar_stock(telefonos[0].id, 2)
+        nuevos = self.inv.obtener_todos_telefonos()
+        self.assertIsNot(nuevos, telefonos)
+        self.assertEqual(nuevos[0].stock, 7)
+        self.assertIs(self.clientes.obtener_todos_clientes(), clientes)
+
+        self.clientes.registrar_cliente("Ana", "V1", "")
+        self.assertEqual(len(self.clientes.obtener_todos_clientes()), 1)
+        self.assertIs(self.inv.obtener_todos_telefonos(), nuevos)
+
+    def test_cambio_de_otro_proceso_detectado_por_data_version(self):
+        telefonos = self.inv.obtener_todos_telefonos()
+        # Conexión independiente (como otra instancia de la app): no pasa por invalidar()
+        externa = sqlite3.connect(Database.DB_NAME)
+        externa.execute("INSERT INTO inventario (nombre, costo_original_usd, stock) VALUES ('B', 50, 1)")
+        externa.commit()
+        externa.close()
+
+        nuevos = self.inv.obtener_todos_telefonos()
+        self.assertIsNot(nuevos, telefonos)
+        self.assertEqual([p.nombre for p in nuevos], ["A", "B"])
+
+
+if __name__ == "__main__":
+    unittest.main()
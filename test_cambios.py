@@ -0,0 +1,99 @@
+import unittest
+
+from app.models.dtos import ItemCarritoDTO
+from app.services.cache_service import CacheLecturas
+from app.services.customer_service import ServicioClientes
+from app.services.event_bus import BusCambios
+from app.services.inventory_service import ServiceInventario
+from app.services.payment_service import PaymentService
+from app.services.sales_service import ServiceVentas
+from app.ui.change_tracker import ChangeTracker
+from tests_base import PruebaConBD
+
+
+class TestCambios(PruebaConBD):
+    def setUp(self):
+        super().setUp()
+        self.inv = ServiceInventario()
+        self.clientes = ServicioClientes()
+        self.tracker = ChangeTracker()
+        self.tracker.register("Inventario", ("inventario",))
+        self.tracker.register("Clientes", ("clientes",))
+        self.tracker.register("Historial Ventas", ("ventas", "clientes", "inventario"))
+
+    def tearDown(self):
+        self.tracker.close()
+        CacheLecturas().limpiar()
+        super().tearDown()
+
+    def test_solo_se_marcan_las_vistas_que_muestran_la_tabla(self):
+        self.clientes.registrar_cliente("Ana", "V1", "")
+
+        self.assertFalse(self.tracker.is_dirty("Inventario"))
+        cambios = self.tracker.take("Clientes")
+        self.assertEqual(list(cambios), ["clientes"])
+        self.assertEqual(len(cambios["clientes"]), 1)
+        # take() consume las marcas
+        self.assertEqual(self.tracker.take("Clientes"), {})
+        self.assertTrue(self.tracker.is_dirty("Historial Ventas"))
+
+    def test_ids_afectados_se_acumulan(self):
+        self.inv.agregar_telefono("A", 100.0, 5, "")
+        self.inv.agregar_telefono("B", 50.0, 1, "")
+        ids = {p.id for p in self.inv.obtener_todos_telefonos()}
+        self.tracker.take("Inventario")
+
+        for phone_id in ids:
+            self.inv.actualizar_stock(phone_id, 1)
+        self.assertEqual(self.tracker.take("Inventario"), {"inventario": ids})
+
+        # Un cambio sin detalle de filas cubre toda la tabla
+        BusCambios().publicar("inventario", [next(iter(ids))])
+        BusCambios().publicar("inventario")
+        self.assertEqual(self.tracker.take("Inventario"), {"inventario": None})
+
+    def test_venta_y_abono_publican_sus_tablas(self):
+        self.clientes.registrar_cliente("Ana", "V1", "")
+        self.inv.agregar_telefono("Phone", 100.0, 5, "")
+        catalogo = self.inv.obtener_todos_telefonos()
+        for vista in ("Inventario", "Clientes", "Historial Ventas"):
+            self.tracker.take(vista)
+
+        item = ItemCarritoDTO(id_telefono=catalogo[0].id, cantidad=1, precio_unitario_usd=150.0)
+        venta_id = ServiceVentas().procesar_venta_carrito(1, [item], 30.0, 3, 1.0)
+
+        self.assertEqual(self.tracker.take("Inventario"), {"inventario": {catalogo[0].id}})
+        self.assertEqual(
+            self.tracker.take("Historial Ventas"), {"ventas": {venta_id}, "inventario": {catalogo[0].id}}
+        )
+        # La caché de lecturas también se entera por el bus
+        self.assertEqual(self.inv.obtener_todos_telefonos()[0].stock, 4)
+
+        PaymentService().registrar_abono(venta_id, 40.0, 1.0)
+        self.assertEqual(self.tracker.take("Historial Ventas"), {"ventas": {venta_id}})
+        self.assertFalse(self.tracker.is_dirty("Clientes"))
+
+    def test_error_en_un_suscriptor_no_corta_a_los_demas(self):
+        recibidos = []
+
+        def roto(tabla, ids):
+            raise RuntimeError("falla")
+
+        def registrar(tabla, ids):
+            recibidos.append((tabla, ids))
+
+        bus = BusCambios()
+        bus.suscribir(roto)
+        bus.suscribir(registrar)
+        try:
+            with self.assertLogs("SmartCredit", level="ERROR"):
+                bus.publicar("clientes", [7])
+        finally:
+            bus.desuscribir(roto)
+            bus.desuscribir(registrar)
+        self.assertEqual(recibidos, [("clientes", frozenset({7}))])
+        self.assertEqual(self.tracker.take("Clientes"), {"clientes": {7}})
+
+
+if __name__ == "__main__":
+    unittest.main()
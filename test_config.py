@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+import time
+import unittest
+
+from app.services.config_service import ConfigService
+from tests_base import PruebaConBD
+
+
+class TestConfigService(PruebaConBD):
+    def setUp(self):
+        super().setUp()
+        self.original_cwd = os.getcwd()
+        # Sin config.json en el cwd (evita migrar el del repo)
+        os.chdir(self.tmp.name)
+        ConfigService._instance = None
+        self.service = ConfigService()
+        self.ruta = ConfigService.config_path()
+
+    def tearDown(self):
+        self.service.flush()
+        ConfigService._instance = None
+        os.chdir(self.original_cwd)
+        super().tearDown()
+
+    def _leer(self):
+        with open(self.ruta) as f:
+            return json.load(f)
+
+    def test_ruta_en_db_dir(self):
+        self.assertEqual(os.path.dirname(self.ruta), self.tmp.name)
+
+    def test_cambios_en_memoria_hasta_flush(self):
+        for parcial in ("3", "36", "36.", "36.7", "36.75"):
+            self.service.set_tasa(parcial)
+        self.assertFalse(os.path.exists(self.ruta))
+        self.assertEqual(self.service.get_tasa(), "36.75")
+
+        self.service.flush()
+        self.assertEqual(self._leer()["tasa_cambio"], "36.75")
+        self.assertEqual([f for f in os.listdir(self.tmp.name) if f.endswith(".tmp")], [])
+
+    def test_debounce_escribe_una_vez(self):
+        ConfigService.DEBOUNCE_SEG, original = 0.05, ConfigService.DEBOUNCE_SEG
+        try:
+            self.service.set_margen("70")
+            self.service.set_margen("75")
+            limite = time.monotonic() + 2
+            while not os.path.exists(self.ruta) and time.monotonic() < limite:
+                time.sleep(0.01)
+            self.assertEqual(self._leer()["margen_ganancia"], "75")
+        finally:
+            ConfigService.DEBOUNCE_SEG = original
+
+    def test_flush_concurrentes_no_se_pisan(self):
+        hilos = []
+        for i in range(8):
+            self.service.set_margen(str(60 + i))
+            hilo = threading.Thread(target=self.service.flush)
+            hilos.append(hilo)
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.service.flush()
+
+        self.assertEqual(self._leer()["margen_ganancia"], "67")
+        self.assertEqual([f for f in os.listdir(self.tmp.name) if f.endswith(".tmp")], [])
+
+    def test_valores_invalidos_se_ignoran(self):
+        self.assertFalse(self.service.set_tasa(""))
+        self.assertFalse(self.service.set_tasa("abc"))
+        self.assertFalse(self.service.set_tasa("0"))
+        self.assertFalse(self.service.set_margen("-5"))
+        self.assertEqual(self.service.get_tasa(), "40.0")
+        self.assertEqual(self.service.get_margen(), "65")
+
+    def test_migra_config_del_cwd(self):
+        with open(os.path.join(self.tmp.name, "legacy.json"), "w") as f:
+            json.dump({"tasa_cambio": "50.5"}, f)
+        sub = os.path.join(self.tmp.name, "cwd")
+        os.makedirs(sub)
+        os.replace(os.path.join(self.tmp.name, "legacy.json"), os.path.join(sub, "config.json"))
+        os.chdir(sub)
+
+        ConfigService._instance = None
+        service = ConfigService()
+        self.assertEqual(service.get_tasa(), "50.5")
+        service.flush()
+        self.assertEqual(self._leer()["tasa_cambio"], "50.5")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import itertools
+import unittest
+
+from app.services.sales_service import ServiceVentas
+from app.utils.exceptions import BusinessRuleError
+from tests_base import PruebaConBD
+
+
+class TestGrillaCotizaciones(PruebaConBD):
+    def setUp(self):
+        super().setUp()
+        self.service = ServiceVentas()
+
+    def test_grilla_coincide_con_calculo_individual(self):
+        costo = 180.0
+        margenes = (0, 20, 35.5)
+        iniciales = (-5.0, 0.0, 50.0, 400.0)
+        opciones = (0, 3, 4, 5, 6)
+        tasa = 36.5
+
+        grilla = self.service.calcular_grilla_cotizaciones(costo, margenes, iniciales, opciones, tasa)
+        self.assertEqual(len(grilla), len(margenes) * len(iniciales) * len(opciones))
+
+        for margen, inicial, cuotas in itertools.product(margenes, iniciales, opciones):
+            precio = self.service.calcular_precio_con_margen(costo, margen)
+            try:
+                esperado = self.service.calcular_totales_venta(precio, inicial, cuotas, tasa)
+            except BusinessRuleError:
+                esperado = None
+            self.assertEqual(grilla[(margen, inicial, cuotas)], esperado, (margen, inicial, cuotas))
+
+    def test_inicial_mayor_al_precio_es_invalido(self):
+        grilla = self.service.calcular_grilla_cotizaciones(100.0, (10,), (120.0,), (0, 3), 1.0)
+        self.assertIsNone(grilla[(10, 120.0, 0)])
+        self.assertIsNone(grilla[(10, 120.0, 3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+from datetime import date
+
+from app.models.dtos import ItemCarritoDTO
+from app.services.payment_service import PaymentService
+from app.services.sales_service import ServiceVentas
+from app.services.schedule_service import ServicioCronogramas
+from app.utils.enums import FrecuenciaCuotas
+from tests_base import PruebaConBD
+
+
+class TestCronogramas(PruebaConBD):
+    def setUp(self):
+        super().setUp()
+        self.motor = ServicioCronogramas()
+
+    def test_quincenal_y_semanal(self):
+        # Lunes 2024-01-01: +14 y +7 días siguen cayendo en lunes
+        self.assertEqual(
+            self.motor.calcular_fechas(date(2024, 1, 1), 2), ["2024-01-15", "2024-01-29"]
+        )
+        self.assertEqual(
+            self.motor.calcular_fechas(date(2024, 1, 1), 2, FrecuenciaCuotas.SEMANAL), ["2024-01-08", "2024-01-15"]
+        )
+
+    def test_mensual_acota_fin_de_mes(self):
+        motor = ServicioCronogramas(omitir_fines_de_semana=False)
+        fechas = motor.calcular_fechas(date(2024, 1, 31), 3, FrecuenciaCuotas.MENSUAL)
+        self.assertEqual(fechas, ["2024-02-29", "2024-03-31", "2024-04-30"])
+
+    def test_dia_del_mes(self):
+        motor = ServicioCronogramas(omitir_fines_de_semana=False)
+        # El día 15 ya pasó en enero -> primera cuota en febrero
+        self.assertEqual(
+            motor.calcular_fechas(date(2024, 1, 20), 2, FrecuenciaCuotas.DIA_DEL_MES, dia_mes=15),
+            ["2024-02-15", "2024-03-15"],
+        )
+        self.assertEqual(
+            motor.calcular_fechas(date(2024, 1, 10), 1, FrecuenciaCuotas.DIA_DEL_MES, dia_mes=15), ["2024-01-15"]
+        )
+        with self.assertRaises(ValueError):
+            motor.calcular_fechas(date(2024, 1, 10), 1, FrecuenciaCuotas.DIA_DEL_MES)
+
+    def test_fines_de_semana_y_feriados(self):
+        # 2024-01-06 es sábado -> lunes 08; si el 08 es feriado -> martes 09
+        self.assertEqual(self.motor.calcular_fechas(date(2023, 12, 30), 1, FrecuenciaCuotas.SEMANAL), ["2024-01-08"])
+        self.motor.agregar_feriados([("2024-01-08", "Feriado de prueba")])
+        with self.db.transaction() as conn:
+            feriados = self.motor.cargar_feriados(conn.cursor())
+        self.assertEqual(
+            self.motor.calcular_fechas(date(2023, 12, 30), 1, FrecuenciaCuotas.SEMANAL, feriados=feriados),
+            ["2024-01-09"],
+        )
+
+    def test_regenerar_planes_en_lote(self):
+        with self.db.transaction() as conn:
+            cursor = conn.cursor()
+            self.motor.generar_plan(cursor, 1, 3, 10.0, date(2024, 1, 1))
+            self.motor.generar_plan(cursor, 2, 2, 20.0, date(2024, 1, 1))
+            total = self.motor.regenerar_planes(
+                cursor, [(1, 2, 15.0, "2024-02-01 10:00:00"), (2, 0, 0.0, "2024-02-01 10:00:00")],
+                FrecuenciaCuotas.MENSUAL,
+            )
+        self.assertEqual(total, 2)
+        with self.db.connection() as conn:
+            rows = conn.execute(
+                "SELECT venta_id, numero_cuota, fecha_vencimiento, monto_usd FROM cuotas ORDER BY venta_id, numero_cuota"
+            ).fetchall()
+        # 2024-03-01 es viernes; 2024-04-01 es lunes
+        self.assertEqual(rows, [(1, 1, "2024-03-01", 15.0), (1, 2, "2024-04-01", 15.0)])
+
+
+    def test_regenerar_conserva_lo_abonado(self):
+        # 120 financiados en 3 cuotas de 40 con un abono de 50 -> saldo 70
+        item = ItemCarritoDTO(id_telefono=1, cantidad=1, precio_unitario_usd=150.0)
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('Ana', 'V1', '')")
+            conn.execute("INSERT INTO inventario (nombre, costo_original_usd, stock) VALUES ('Phone', 100, 5)")
+        venta_id = ServiceVentas().procesar_venta_carrito(1, [item], 30.0, 3, 1.0)
+        PaymentService().registrar_abono(venta_id, 50.0, 1.0)
+
+        # Nuevo plan: 4 cuotas de 30
+        with self.db.transaction() as conn:
+            self.motor.regenerar_planes(conn.cursor(), [(venta_id, 4, 30.0, "2024-02-01 10:00:00")])
+        with self.db.connection() as conn:
+            cuotas = conn.execute(
+                "SELECT estado, monto_pagado_usd FROM cuotas WHERE venta_id = ? ORDER BY numero_cuota", (venta_id,)
+            ).fetchall()
+            saldo_resumen = conn.execute(
+                "SELECT saldo_pendiente_usd FROM estado_creditos WHERE venta_id = ?", (venta_id,)
+            ).fetchone()[0]
+        self.assertEqual(cuotas, [("Pagada", 30.0), ("Parcial", 20.0), ("Pendiente", 0.0), ("Pendiente", 0.0)])
+        self.assertEqual(sum(30.0 - pagado for _, pagado in cuotas), 70.0)
+        self.assertEqual(saldo_resumen, 70.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import sqlite3
+import threading
+import unittest
+
+from app.db.database import Database
+from app.services.customer_service import ServicioClientes
+from app.services.inventory_service import ServiceInventario
+from tests_base import PruebaConBD
+
+
+class TestConnectionPool(PruebaConBD):
+    def test_reuses_connection_per_thread(self):
+        conn_a = self.db.get_connection()
+        conn_a.close()
+        conn_b = self.db.get_connection()
+        conn_b.close()
+        self.assertIs(conn_a, conn_b)
+
+        other = []
+        t = threading.Thread(target=lambda: other.append(self.db.get_connection()))
+        t.start()
+        t.join()
+        self.assertIsNot(other[0], conn_a)
+
+    def test_pragmas_applied(self):
+        with self.db.connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+        self.assertTrue(os.path.exists(Database.DB_NAME))
+
+    def test_transaction_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction() as conn:
+                conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('A', '1', '')")
+                raise RuntimeError("falla")
+
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('B', '2', '')")
+
+        with self.db.connection() as conn:
+            nombres = [r[0] for r in conn.execute("SELECT nombre FROM clientes")]
+        self.assertEqual(nombres, ["B"])
+
+    def _nombres(self):
+        with self.db.connection() as conn:
+            return [r[0] for r in conn.execute("SELECT nombre FROM clientes ORDER BY id")]
+
+    def test_nested_transaction_does_not_commit_outer_work(self):
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction() as conn:
+                conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('A', '1', '')")
+                with self.db.transaction() as inner:
+                    inner.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('B', '2', '')")
+                raise RuntimeError("falla")
+        self.assertEqual(self._nombres(), [])
+
+    def test_nested_error_only_undoes_inner_block(self):
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('A', '1', '')")
+            with self.assertRaises(RuntimeError):
+                with self.db.transaction() as inner:
+                    inner.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('B', '2', '')")
+                    raise RuntimeError("falla")
+            self.assertTrue(conn.in_transaction)
+            conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('C', '3', '')")
+        self.assertEqual(self._nombres(), ["A", "C"])
+
+    def test_service_writes_inside_a_transaction_follow_it(self):
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO inventario (nombre, costo_original_usd, stock) VALUES ('P', 10, 1)")
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                ServicioClientes().registrar_cliente("A", "1", "")
+                ServiceInventario().actualizar_stock(1, 5)
+                raise RuntimeError("falla")
+        self.assertEqual(self._nombres(), [])
+        self.assertEqual(ServiceInventario().obtener_telefono_por_id(1).stock, 1)
+
+    def test_commit_inside_a_transaction_is_refused(self):
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('A', '1', '')")
+            with self.assertRaises(sqlite3.ProgrammingError):
+                conn.commit()
+            with self.assertRaises(sqlite3.ProgrammingError):
+                conn.rollback()
+        self.assertEqual(self._nombres(), ["A"])
+
+    def test_close_discards_uncommitted_work(self):
+        conn = self.db.get_connection()
+        conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('C', '3', '')")
+        conn.close()
+        with self.db.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM clientes").fetchone()[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
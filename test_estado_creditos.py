@@ -0,0 +1,56 @@
+import unittest
+
+from app.models.dtos import ItemCarritoDTO
+from app.services.credit_status_service import ServicioEstadoCreditos
+from app.services.notification_service import NotificationService
+from app.services.payment_service import PaymentService
+from app.services.sales_service import ServiceVentas
+from tests_base import PruebaConBD
+
+
+class TestEstadoCreditos(PruebaConBD):
+    def setUp(self):
+        super().setUp()
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('Ana', 'V1', '')")
+            conn.execute("INSERT INTO inventario (nombre, costo_original_usd, stock) VALUES ('Phone', 100, 10)")
+        self.ventas = ServiceVentas()
+        self.pagos = PaymentService()
+        self.servicio = ServicioEstadoCreditos()
+
+    def _vender(self, cuotas):
+        item = ItemCarritoDTO(id_telefono=1, cantidad=1, precio_unitario_usd=130.0)
+        return self.ventas.procesar_venta_carrito(1, [item], 10.0, cuotas, 1.0)
+
+    def test_hooks_mantienen_la_tabla(self):
+        a = self._vender(3)
+        b = self._vender(2)
+        self._vender(0)  # Contado: no genera crédito
+
+        self.pagos.registrar_abono(a, 50.0, 1.0)
+        self.pagos.registrar_abono(b, 120.0, 1.0)  # Saldada
+
+        estados = NotificationService().get_all_credits_status()
+        self.assertEqual([e.venta_id for e in estados], [a])
+        self.assertAlmostEqual(estados[0].proxima_cuota_monto, 30.0)
+        self.assertAlmostEqual(estados[0].saldo_pendiente_usd, 70.0)
+        self.assertEqual(self.servicio.verificar(), [])
+
+    def test_reconstruir_corrige_diferencias(self):
+        a = self._vender(3)
+        with self.db.transaction() as conn:
+            conn.execute("UPDATE estado_creditos SET proxima_cuota_monto = 0 WHERE venta_id = ?", (a,))
+        self.assertEqual(self.servicio.verificar(), [a])
+        self.assertEqual(self.servicio.reconstruir(), 1)
+        self.assertEqual(self.servicio.verificar(), [])
+
+    def test_panel_lee_por_indice(self):
+        with self.db.connection() as conn:
+            plan = " | ".join(
+                r[3] for r in conn.execute("EXPLAIN QUERY PLAN SELECT * FROM estado_creditos ORDER BY proxima_cuota_fecha")
+            )
+        self.assertIn("idx_estado_creditos_fecha", plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from app.models.dtos import ItemCarritoDTO
+from app.services.payment_service import PaymentService
+from app.services.sales_service import ServiceVentas
+from tests_base import PruebaConBD
+
+
+class TestEstadoCuenta(PruebaConBD):
+    def setUp(self):
+        super().setUp()
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('Ana', 'V1', '')")
+            conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('Luis', 'V2', '')")
+            conn.execute("INSERT INTO inventario (nombre, costo_original_usd, stock) VALUES ('Phone', 100, 50)")
+        self.ventas = ServiceVentas()
+        self.pagos = PaymentService()
+        item = ItemCarritoDTO(id_telefono=1, cantidad=1, precio_unitario_usd=150.0)
+        # Ana: 5 ventas financiadas (120 en 3 cuotas de 40) con un abono cada una; Luis: una de contado
+        self.ids_ana = [self.ventas.procesar_venta_carrito(1, [item], 30.0, 3, 1.0) for _ in range(5)]
+        for venta_id in self.ids_ana:
+            self.pagos.registrar_abono(venta_id, 50.0, 1.0)
+        self.id_luis = self.ventas.procesar_venta_carrito(2, [item], 150.0, 0, 1.0)
+
+    def _contar_consultas(self, funcion):
+        conn = self.db.get_connection()
+        sentencias = []
+        conn.set_trace_callback(sentencias.append)
+        try:
+            resultado = funcion()
+        finally:
+            conn.set_trace_callback(None)
+            conn.close()
+        return resultado, [s for s in sentencias if s.lstrip().upper().startswith("SELECT")]
+
+    def test_agrupa_cuotas_y_abonos_por_venta(self):
+        estado = self.ventas.obtener_estado_cuenta(1)
+        self.assertEqual([c.venta.id for c in estado.ventas], sorted(self.ids_ana, reverse=True))
+        for cuenta in estado.ventas:
+            self.assertEqual([q.numero for q in cuenta.cuotas], [1, 2, 3])
+            self.assertEqual([q.estado for q in cuenta.cuotas], ["Pagada", "Parcial", "Pendiente"])
+            self.assertEqual([a.monto_usd for a in cuenta.abonos], [50.0])
+            self.assertTrue(all(a.venta_id == cuenta.venta.id for a in cuenta.abonos))
+        self.assertAlmostEqual(estado.saldo_usd, 5 * 70.0)
+        self.assertAlmostEqual(estado.total_usd, 5 * 150.0)
+
+    def test_consultas_fijas_sin_importar_las_ventas(self):
+        _, pocas = self._contar_consultas(lambda: self.ventas.obtener_estado_cuenta(2))
+        item = ItemCarritoDTO(id_telefono=1, cantidad=1, precio_unitario_usd=150.0)
+        for _ in range(10):
+            self.ventas.procesar_venta_carrito(1, [item], 30.0, 3, 1.0)
+        estado, muchas = self._contar_consultas(lambda: self.ventas.obtener_estado_cuenta(1))
+        self.assertEqual(len(estado.ventas), 15)
+        self.assertEqual(len(pocas), 3)
+        self.assertEqual(len(muchas), 3)
+
+    def test_cliente_sin_ventas(self):
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('Sin', 'V3', '')")
+        estado = self.ventas.obtener_estado_cuenta(3)
+        self.assertEqual(estado.ventas, ())
+        self.assertEqual(estado.saldo_usd, 0)
+
+    def test_contado_sin_cuotas_ni_abonos(self):
+        (cuenta,) = self.ventas.obtener_estado_cuenta(2).ventas
+        self.assertEqual(cuenta.venta.id, self.id_luis)
+        self.assertEqual((cuenta.cuotas, cuenta.abonos), ((), ()))
+
+
+if __name__ == "__main__":
+    unittest.main()
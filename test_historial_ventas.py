@@ -0,0 +1,85 @@
+import unittest
+
+from app.models.dtos import FiltroVentasDTO
+from app.services.sales_service import ServiceVentas
+from tests_base import PruebaConBD
+
+
+class TestHistorialPaginado(PruebaConBD):
+    def setUp(self):
+        super().setUp()
+        ventas = []
+        for i in range(1, 251):
+            # Varias ventas por fecha: el cursor debe desempatar por id
+            fecha = f"2024-01-{(i % 28) + 1:02d} 10:00:00"
+            tipo = "Contado" if i % 3 == 0 else "Financiado"
+            saldo = 0.0 if tipo == "Contado" else 10.0
+            estado = "Pagada" if saldo == 0 else "Activa"
+            ventas.append((1 + i % 2, 1, fecha, tipo, 100.0, saldo, estado))
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('Ana', 'V1', '')")
+            conn.execute("INSERT INTO clientes (nombre, cedula, telefono) VALUES ('Luis', 'V2', '')")
+            conn.execute("INSERT INTO inventario (nombre, costo_original_usd, stock) VALUES ('Phone', 80, 5)")
+            conn.executemany(
+                """
+                INSERT INTO ventas (id_cliente, id_telefono, fecha, tipo_venta, precio_final_usd,
+                                    saldo_pendiente_usd, tasa_cambio_usada, estado)
+                VALUES (?, ?, ?, ?, ?, ?, 1, ?)
+            """,
+                ventas,
+            )
+        self.ventas = ServiceVentas()
+
+    def _todas(self, filtro=FiltroVentasDTO(), limite=40):
+        filas, cursor, paginas = [], None, 0
+        while True:
+            pagina = self.ventas.obtener_pagina_historial(filtro, cursor, limite)
+            filas.extend(pagina.ventas)
+            paginas += 1
+            if pagina.siguiente is None:
+                return filas, paginas
+            cursor = pagina.siguiente
+
+    def test_paginas_recorren_todo_en_orden_sin_repetir(self):
+        filas, paginas = self._todas()
+        self.assertEqual(paginas, 7)
+        self.assertEqual(len({v.id for v in filas}), 250)
+        claves = [(v.fecha, v.id) for v in filas]
+        self.assertEqual(claves, sorted(claves, reverse=True))
+
+    def test_filtros_y_totales_coinciden(self):
+        filtro = FiltroVentasDTO(desde="2024-01-05", hasta="2024-01-10", id_cliente=1, tipo_venta="Financiado")
+        filas, _ = self._todas(filtro, limite=7)
+        self.assertTrue(filas)
+        for v in filas:
+            self.assertTrue("2024-01-05" <= v.fecha[:10] <= "2024-01-10")
+            self.assertEqual((v.cliente, v.tipo), ("Ana", "Financiado"))
+
+        totales = self.ventas.obtener_totales_historial(filtro)
+        self.assertEqual(totales.cantidad, len(filas))
+        self.assertAlmostEqual(totales.total_usd, sum(v.total_usd for v in filas))
+        self.assertAlmostEqual(totales.saldo_usd, sum(v.saldo_usd for v in filas))
+
+        pagadas = self.ventas.obtener_totales_historial(FiltroVentasDTO(estado="Pagada"))
+        self.assertEqual(pagadas.cantidad, 83)
+        self.assertEqual(pagadas.saldo_usd, 0)
+
+    def test_cursor_usa_el_indice_por_fecha(self):
+        with self.db.connection() as conn:
+            plan = " ".join(
+                row[-1]
+                for row in conn.execute(
+                    """
+                    EXPLAIN QUERY PLAN
+                    SELECT id FROM ventas v WHERE (v.fecha, v.id) < (?, ?)
+                    ORDER BY v.fecha DESC, v.id DESC LIMIT 100
+                """,
+                    ("2024-01-10 10:00:00", 50),
+                )
+            )
+        self.assertIn("idx_ventas_fecha_id", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
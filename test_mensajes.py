@@ -0,0 +1,51 @@
+import unittest
+
+from app.models.dtos import AlertaCuotaDTO, EstadoCreditoDTO
+from app.utils.notification_templates import NotificationTemplates
+
+
+def _credito(venta_id, dias_mora):
+    return EstadoCreditoDTO(
+        venta_id=venta_id,
+        cliente_nombre="Ana",
+        producto_nombre="Phone",
+        estado_etiqueta="🔴 Vencido" if dias_mora else "🟢 Al día",
+        saldo_pendiente_usd=100.0,
+        proxima_cuota_fecha="2024-01-15",
+        proxima_cuota_monto=33.333,
+        dias_mora=dias_mora,
+        proxima_cuota_numero=2,
+    )
+
+
+class TestMensajes(unittest.TestCase):
+    def test_plantillas_compiladas_equivalen_a_format(self):
+        esperado = NotificationTemplates.CUOTA_VENCIDA.format(
+            cliente="Ana", producto="Phone", num_cuota=2, monto_usd="33.33", fecha_vencimiento="2024-01-15"
+        )
+        self.assertEqual(NotificationTemplates.render_vencimiento("Ana", "Phone", 2, 33.333, "2024-01-15"), esperado)
+
+    def test_mensaje_perezoso_y_memoizado(self):
+        credito = _credito(1, 0)
+        self.assertNotIn("mensaje_sugerido", credito.__dict__)
+        mensaje = credito.mensaje_sugerido
+        self.assertIn("mañana 2024-01-15", mensaje)
+        self.assertIs(credito.mensaje_sugerido, mensaje)
+
+        antes = NotificationTemplates.render_mensaje.cache_info().hits
+        self.assertEqual(_credito(2, 0).mensaje_sugerido, mensaje)
+        self.assertEqual(NotificationTemplates.render_mensaje.cache_info().hits, antes + 1)
+
+    def test_lote_usa_plantilla_de_cobro_en_mora(self):
+        creditos = [_credito(1, 0), _credito(2, 5)]
+        recordatorio, cobro = NotificationTemplates.render_lote(c.entrada_mensaje for c in creditos)
+        self.assertIn("te recordamos", recordatorio.lower())
+        self.assertIn("venció el 2024-01-15", cobro)
+
+    def test_alerta_perezosa(self):
+        alerta = AlertaCuotaDTO("Ana", "Phone", 1, 10.0, "2024-01-15", 30.0)
+        self.assertIn("$10.00 USD", alerta.mensaje_cliente)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import sqlite3
+import unittest
+
+from app.db.migrations import VERSION_ACTUAL, aplicar_migraciones, obtener_version
+from tests_base import PruebaConBD
+
+
+class TestMigraciones(PruebaConBD):
+    def _plan(self, query, params=()):
+        with self.db.connection() as conn:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+        return " | ".join(r[3] for r in rows)
+
+    def test_version_actual_y_idempotente(self):
+        with self.db.connection() as conn:
+            self.assertEqual(obtener_version(conn), VERSION_ACTUAL)
+            # Segunda ejecución no hace nada
+            self.assertEqual(aplicar_migraciones(conn), VERSION_ACTUAL)
+            columns = [c[1] for c in conn.execute("PRAGMA table_info(abonos)")]
+        self.assertIn("metodo", columns)
+
+    def test_migra_bd_legacy_sin_version(self):
+        legacy = sqlite3.connect(":memory:")
+        legacy.execute(
+            "CREATE TABLE abonos (id INTEGER PRIMARY KEY AUTOINCREMENT, venta_id INTEGER NOT NULL, "
+            "fecha TEXT NOT NULL, monto_usd REAL NOT NULL, tasa_cambio REAL NOT NULL, "
+            "monto_bs REAL NOT NULL, notas TEXT)"
+        )
+        self.assertEqual(aplicar_migraciones(legacy), VERSION_ACTUAL)
+        columns = [c[1] for c in legacy.execute("PRAGMA table_info(abonos)")]
+        self.assertIn("metodo", columns)
+        legacy.close()
+
+    def test_plan_cuotas_pendientes_por_fecha(self):
+        plan = self._plan(
+            """
+            SELECT COUNT(*) FROM cuotas q JOIN ventas v ON q.venta_id = v.id
+            WHERE q.fecha_vencimiento IN (?, ?) AND q.estado <> 'Pagada' AND v.saldo_pendiente_usd > 0
+            """,
+            ("2026-01-01", "2026-01-02"),
+        )
+        self.assertIn("idx_cuotas_abiertas_fecha", plan)
+
+    def test_plan_ventas_por_cliente(self):
+        plan = self._plan("SELECT * FROM ventas WHERE id_cliente = ? ORDER BY fecha DESC", (1,))
+        self.assertIn("idx_ventas_cliente_fecha", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_plan_abonos_por_venta(self):
+        plan = self._plan("SELECT * FROM abonos WHERE venta_id = ? ORDER BY fecha DESC", (1,))
+        self.assertIn("idx_abonos_venta_fecha", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import random
+import time
+import unittest
+
+from app.utils.prefix_index import PrefixIndex, normalizar
+
+
+class TestPrefixIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.index.reconstruir(
+            [
+                (1, "José Pérez", "V-12.345.678"),
+                (2, "José Pérez", "V-9.876.543"),  # Homónimo: otro id
+                (3, "Ana Martínez", "V-5.551.234"),
+                (4, "Pedro Josa", "E-777"),
+            ]
+        )
+
+    def test_normaliza_acentos_y_mayusculas(self):
+        self.assertEqual(normalizar("JOSÉ Pérez"), "jose perez")
+        self.assertEqual(self.index.buscar("jose"), [1, 2])
+
+    def test_homonimos_resuelven_por_id(self):
+        self.assertEqual(self.index.buscar("jose perez"), [1, 2])
+        self.assertEqual(self.index.buscar("jose v98"), [2])
+
+    def test_cualquier_palabra_y_cedula_con_o_sin_separadores(self):
+        self.assertEqual(self.index.buscar("martinez"), [3])
+        self.assertEqual(self.index.buscar("v12345"), [1])
+        self.assertEqual(self.index.buscar("V-5.55"), [3])
+        self.assertEqual(self.index.buscar("jos"), [4, 1, 2])  # "josa" < "jose"
+        self.assertEqual(self.index.buscar(""), [])
+        self.assertEqual(self.index.buscar("zzz"), [])
+
+    def test_altas_y_modificaciones_incrementales(self):
+        self.index.agregar(5, "Josefina Rivas", "V-1")
+        self.assertEqual(self.index.buscar("josef"), [5])
+        self.index.agregar(5, "Carla Rivas", "V-1")
+        self.assertEqual(self.index.buscar("josef"), [])
+        self.assertEqual(self.index.buscar("carla"), [5])
+        self.index.eliminar(5)
+        self.assertEqual(self.index.buscar("rivas"), [])
+        self.assertEqual(len(self.index), 4)
+
+    def test_limite_y_tiempo_con_50k(self):
+        rnd = random.Random(3)
+        nombres = ["José", "María", "Luis", "Ana", "Carlos", "Josefina", "Pedro", "Lucía"]
+        apellidos = ["Pérez", "González", "Rodríguez", "Martínez", "López", "Díaz"]
+        grande = PrefixIndex()
+        grande.reconstruir(
+            (i, f"{rnd.choice(nombres)} {rnd.choice(apellidos)}", f"V{1_000_000 + i}") for i in range(50_000)
+        )
+        inicio = time.perf_counter()
+        for consulta in ["j", "jo", "jose p", "v100", "maria gonz", "a"]:
+            self.assertLessEqual(len(grande.buscar(consulta, 8)), 8)
+        # Seis búsquedas (una por tecla) muy por debajo de un frame
+        self.assertLess(time.perf_counter() - inicio, 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
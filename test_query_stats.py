@@ -0,0 +1,94 @@
+import unittest
+
+from app.db.database import Database
+from app.db.query_stats import EstadisticasConsultas, normalizar_sql
+from app.services.customer_service import ServicioClientes
+from app.services.sales_service import ServiceVentas
+from tests_base import PruebaConBD
+
+
+class TestEstadisticasConsultas(PruebaConBD):
+    def setUp(self):
+        # Las conexiones se abren instrumentadas (por defecto no lo están)
+        self.instrumentar = Database.INSTRUMENTAR
+        Database.INSTRUMENTAR = True
+        super().setUp()
+        self.stats = EstadisticasConsultas()
+        self.umbral = self.stats.umbral_lenta_ms
+        self.stats.reiniciar()
+
+    def tearDown(self):
+        self.stats.umbral_lenta_ms = self.umbral
+        self.stats.reiniciar()
+        Database.INSTRUMENTAR = self.instrumentar
+        super().tearDown()
+
+    def _buscar(self, fragmento):
+        coincidencias = [e for e in self.stats.top(1000) if fragmento in e.sql]
+        self.assertEqual(len(coincidencias), 1, fragmento)
+        return coincidencias[0]
+
+    def test_filas_y_origen_del_metodo_de_servicio(self):
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO clientes (nombre, cedula, telefono) VALUES (?, ?, '')", [(f"C{i}", f"V{i}") for i in range(7)]
+            )
+        ServiceVentas().obtener_totales_historial()
+        ServicioClientes().obtener_todos_clientes()
+
+        totales = self._buscar("SELECT COUNT(*), COALESCE(SUM(v.precio_final_usd)")
+        self.assertEqual((totales.llamadas, totales.filas), (1, 1))
+        self.assertEqual(list(totales.origenes), ["sales_service.ServiceVentas.obtener_totales_historial"])
+
+        insercion = self._buscar("INSERT INTO clientes")
+        self.assertEqual(insercion.filas, 7)
+        # Cada alta dispara el trigger que mantiene clientes_fts
+        self.assertGreater(insercion.sentencias, 1)
+        self.assertEqual(sum(insercion.histograma), insercion.llamadas)
+        self.assertIn("COMMIT", {e.sql for e in self.stats.top(1000)})
+
+    def test_medicion_se_cierra_al_iterar_o_soltar_el_cursor(self):
+        conn = self.db.get_connection()
+        for _ in conn.execute("SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3"):
+            pass
+        conn.execute("SELECT 42").fetchone()
+        conn.close()
+        self.assertEqual(self._buscar("UNION ALL").filas, 3)
+        self.assertEqual(self._buscar("SELECT 42").llamadas, 1)
+
+    def test_consulta_lenta_va_al_log_sin_valores(self):
+        self.stats.umbral_lenta_ms = 0
+        with self.assertLogs("SmartCredit", level="WARNING") as logs:
+            ServiceVentas().obtener_estado_cuenta(987654)
+        lentas = [l for l in logs.output if "Consulta lenta" in l]
+        self.assertTrue(lentas)
+        self.assertTrue(all("obtener_estado_cuenta" in l for l in lentas))
+        # El id del cliente (parámetro) no aparece, solo el texto con `?`
+        self.assertFalse(any("987654" in l for l in lentas))
+
+    def test_desactivada_por_defecto(self):
+        self.assertFalse(self.instrumentar)
+        Database.INSTRUMENTAR = False
+        Database.reset(self.tmp.name)
+        ServiceVentas().obtener_totales_historial()
+        self.assertEqual(self.stats.top(), [])
+
+    def test_agrupa_por_texto_normalizado_y_limita_sentencias(self):
+        self.assertEqual(normalizar_sql("SELECT *\n    FROM  t "), "SELECT * FROM t")
+        self.stats.registrar("SELECT  1", 3.0)
+        self.stats.registrar("SELECT 1", 700.0)
+        entrada = self._buscar("SELECT 1")
+        self.assertEqual((entrada.llamadas, entrada.max_ms), (2, 700.0))
+        self.assertEqual(entrada.percentil_ms(50), 5)
+        self.assertEqual(entrada.percentil_ms(100), 1000)
+
+        limite = EstadisticasConsultas.MAX_SENTENCIAS
+        for i in range(limite + 10):
+            self.stats.registrar(f"SELECT {i} AS n", 0.1)
+        self.assertEqual(len(self.stats.top(10_000)), limite + 1)
+        # "SELECT 1" ya ocupaba un lugar: entran 499 nuevas y 11 van al grupo
+        self.assertEqual(self._buscar(EstadisticasConsultas.OTRAS).llamadas, 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from app.utils.reconcile import KeyedReconciler
+
+
+class TestKeyedReconciler(unittest.TestCase):
+    def setUp(self):
+        self.log = []
+        self.reconciler = KeyedReconciler(
+            create=lambda item: self.log.append(("create", item[0])) or {"item": item},
+            update=lambda node, item: self.log.append(("update", item[0])),
+            remove=lambda node: self.log.append(("remove", node["item"][0])),
+            place=lambda node, index: self.log.append(("place", node["item"][0], index)),
+            key=lambda item: item[0],
+            signature=lambda item: item,
+        )
+
+    def test_only_changed_rows_touched(self):
+        self.reconciler.reconcile([(1, "A", 5), (2, "B", 3), (3, "C", 9)])
+        self.log.clear()
+
+        stats = self.reconciler.reconcile([(1, "A", 5), (2, "B", 4), (3, "C", 9)])
+
+        self.assertEqual(self.log, [("update", 2)])
+        self.assertEqual((stats.inserted, stats.updated, stats.removed, stats.moved), (0, 1, 0, 0))
+
+    def test_insert_and_delete(self):
+        self.reconciler.reconcile([(1, "A", 5), (3, "C", 9)])
+        self.log.clear()
+
+        stats = self.reconciler.reconcile([(1, "A", 5), (2, "B", 1)])
+
+        self.assertIn(("create", 2), self.log)
+        self.assertIn(("remove", 3), self.log)
+        self.assertEqual((stats.inserted, stats.removed, stats.updated), (1, 1, 0))
+        self.assertEqual(set(self.reconciler.nodes), {1, 2})
+
+    def test_reorder_only_places(self):
+        self.reconciler.reconcile([(1, "A", 5), (2, "B", 3)])
+        self.log.clear()
+
+        stats = self.reconciler.reconcile([(2, "B", 3), (1, "A", 5)])
+
+        self.assertEqual(stats.moved, 2)
+        self.assertTrue(all(entry[0] == "place" for entry in self.log))
+
+
+if __name__ == "__main__":
+    unittest.main()
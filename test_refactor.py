@@ -2,9 +2,12 @@ import unittest
 from app.services.inventory_service import ServiceInventario
 from app.services.sales_service import ServiceVentas
 from app.services.customer_service import ServicioClientes
+from tests_base import PruebaConBD
 
-class TestRefactor(unittest.TestCase):
+class TestRefactor(PruebaConBD):
     def setUp(self):
+        super().setUp()
+
         self.s_inv = ServiceInventario()
         self.s_ventas = ServiceVentas()
         self.s_clientes = ServicioClientes()
@@ -16,7 +19,7 @@ class TestRefactor(unittest.TestCase):
             pass # Ignore if exists (unique constraint)
             
         self.s_inv.agregar_telefono("Test Phone", 100, 10, "path/to/img")
-        
+
     def test_logic_centralization(self):
         print("\nTesting Logic Centralization...")
         # Test calculation
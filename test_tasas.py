@@ -0,0 +1,83 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from app.db.database import Database
+from app.db.migrations import aplicar_migraciones
+from app.services.exchange_rate_service import ServicioTasas
+from tests_base import PruebaConBD
+
+
+class TestServicioTasas(PruebaConBD):
+    def setUp(self):
+        super().setUp()
+        ServicioTasas._instance = None
+        self.service = ServicioTasas()
+        self.service.registrar_tasa(36.0, vigente_desde="2024-01-01 08:00:00")
+        self.service.registrar_tasa(37.5, vigente_desde="2024-01-10 08:00:00")
+        self.service.registrar_tasa(40.0, vigente_desde="2024-02-01 08:00:00")
+
+    def tearDown(self):
+        ServicioTasas._instance = None
+        super().tearDown()
+
+    def test_tasa_actual_en_cache(self):
+        self.assertEqual(self.service.tasa_actual(), 40.0)
+        self.assertTrue(self.service.registrar_tasa(41.0))
+        self.assertFalse(self.service.registrar_tasa(41.0))  # Igual a la vigente: no se duplica
+        self.assertEqual(self.service.tasa_actual(), 41.0)
+
+        # Otra instancia (nuevo arranque) la lee desde la BD
+        ServicioTasas._instance = None
+        self.assertEqual(ServicioTasas().tasa_actual(), 41.0)
+
+    def test_tasa_en_fecha(self):
+        self.assertIsNone(self.service.tasa_en("2023-12-31"))
+        self.assertEqual(self.service.tasa_en("2024-01-09"), 36.0)
+        self.assertEqual(self.service.tasa_en("2024-01-10"), 37.5)  # Vigente durante ese día
+        self.assertEqual(self.service.tasa_en("2024-03-01 12:00:00"), 40.0)
+
+    def test_conversion_de_rango_en_una_pasada(self):
+        movimientos = [("2024-01-05 10:00:00", 10.0), ("2024-01-15 10:00:00", 10.0), ("2024-02-02 10:00:00", 1.0)]
+        resultado = self.service.convertir_a_bs(movimientos, "2024-01-05", "2024-02-28")
+        self.assertEqual([r[2] for r in resultado], [36.0, 37.5, 40.0])
+        self.assertEqual([r[3] for r in resultado], [360.0, 375.0, 40.0])
+
+    def test_indice_por_fecha(self):
+        with Database().connection() as conn:
+            plan = " | ".join(
+                r[3]
+                for r in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT tasa FROM tasas_cambio WHERE vigente_desde <= ? "
+                    "ORDER BY vigente_desde DESC LIMIT 1",
+                    ("2024-01-01",),
+                )
+            )
+        self.assertIn("USING INDEX", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_migracion_respeta_la_tasa_configurada(self):
+        # BD previa a la v8: el historial se arma con ventas viejas, pero la vigente es la de config.json
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = sqlite3.connect(os.path.join(tmp, "smartcredit.db"))
+            aplicar_migraciones(conn)
+            conn.execute("DELETE FROM tasas_cambio")
+            conn.execute(
+                "INSERT INTO ventas (id_cliente, id_telefono, fecha, tipo_venta, precio_final_usd, "
+                "tasa_cambio_usada, estado) VALUES (1, 1, '2024-01-01 10:00:00', 'Contado', 10, 30.0, 'Pagada')"
+            )
+            conn.execute("PRAGMA user_version = 7")
+            conn.commit()
+            with open(os.path.join(tmp, "config.json"), "w") as f:
+                json.dump({"tasa_cambio": "199.1052"}, f)
+
+            aplicar_migraciones(conn)
+            tasas = conn.execute("SELECT tasa, fuente FROM tasas_cambio ORDER BY vigente_desde").fetchall()
+            conn.close()
+        self.assertEqual(tasas, [(30.0, "venta"), (199.1052, "configuracion")])
+
+
+if __name__ == "__main__":
+    unittest.main()
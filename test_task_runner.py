@@ -0,0 +1,94 @@
+import threading
+import time
+import unittest
+
+from app.ui.task_runner import TaskRunner
+
+
+class FakeWidget:
+    """Sustituto mínimo de un widget Tk: after() solo encola el callback."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+        return len(self.callbacks)
+
+    def pump(self, timeout=2.0):
+        limite = time.time() + timeout
+        while self.callbacks and time.time() < limite:
+            self.callbacks.pop(0)()
+            time.sleep(0.005)
+
+
+class TestTaskRunner(unittest.TestCase):
+    def test_result_delivered_on_caller_thread(self):
+        widget = FakeWidget()
+        runner = TaskRunner(widget)
+        received = []
+
+        runner.submit(
+            "k",
+            lambda: threading.current_thread().name,
+            lambda r: received.append((r, threading.current_thread())),
+        )
+        widget.pump()
+
+        self.assertEqual(len(received), 1)
+        worker_name, callback_thread = received[0]
+        self.assertTrue(worker_name.startswith("SmartCreditDB"))
+        self.assertIs(callback_thread, threading.current_thread())
+
+    def test_stale_request_discarded(self):
+        widget = FakeWidget()
+        runner = TaskRunner(widget)
+        gate = threading.Event()
+        received = []
+
+        def slow():
+            gate.wait(1)
+            return "viejo"
+
+        runner.submit("k", slow, received.append)
+        runner.submit("k", lambda: "nuevo", received.append)
+        gate.set()
+        widget.pump()
+
+        self.assertEqual(received, ["nuevo"])
+        self.assertFalse(runner.is_pending("k"))
+
+    def test_error_routed_to_on_error(self):
+        widget = FakeWidget()
+        runner = TaskRunner(widget)
+        errors = []
+
+        def falla():
+            raise ValueError("boom")
+
+        runner.submit("k", falla, lambda r: None, on_error=errors.append)
+        widget.pump()
+
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], ValueError)
+
+
+    def test_pool_de_imagenes_no_bloquea_las_consultas(self):
+        widget = FakeWidget()
+        imagenes = TaskRunner(widget, pool="imagenes")
+        consultas = TaskRunner(widget)
+        gate = threading.Event()
+        received = []
+
+        # Más decodificaciones lentas que hilos en cualquiera de los pools
+        for i in range(4):
+            imagenes.submit(f"img{i}", lambda: gate.wait(2), lambda r: None)
+        consultas.submit("datos", lambda: threading.current_thread().name, received.append)
+        widget.pump(timeout=1.0)
+        gate.set()
+
+        self.assertEqual(len(received), 1)
+        self.assertTrue(received[0].startswith("SmartCreditDB"))
+
+if __name__ == "__main__":
+    unittest.main()
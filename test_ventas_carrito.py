@@ -0,0 +1,129 @@
+import multiprocessing
+import unittest
+
+from app.db.database import Database
+from app.models.dtos import ItemCarritoDTO
+from app.services.customer_service import ServicioClientes
+from app.services.inventory_service import ServiceInventario
+from app.services.notification_service import NotificationService
+from app.services.sales_service import ServiceVentas
+from app.utils.exceptions import InventoryError
+from tests_base import PruebaConBD
+
+
+def _vendedor(db_dir, id_cliente, id_telefono, intentos, resultados):
+    """Proceso hijo: intenta vender una unidad del mismo SKU varias veces."""
+    Database.reset(db_dir)
+    ventas = ServiceVentas()
+    vendidas = 0
+    for _ in range(intentos):
+        try:
+            ventas.procesar_venta_carrito(id_cliente, [ItemCarritoDTO(id_telefono, 1, 100.0)], 100.0, 0, 40)
+            vendidas += 1
+        except InventoryError:
+            pass
+    resultados.put(vendidas)
+
+
+class TestVentasCarrito(PruebaConBD):
+    def setUp(self):
+        super().setUp()
+
+        self.s_inv = ServiceInventario()
+        self.s_ventas = ServiceVentas()
+        ServicioClientes().registrar_cliente("Cliente Carrito", "V-1", "0414")
+        self.id_cliente = ServicioClientes().obtener_todos_clientes()[0].id
+
+        self.s_inv.agregar_telefono("Telefono", 100, 3, "")
+        self.s_inv.agregar_telefono("Forro", 5, 10, "")
+        productos = {p.nombre: p for p in self.s_inv.obtener_todos_telefonos()}
+        self.telefono = productos["Telefono"]
+        self.forro = productos["Forro"]
+
+    def test_venta_con_varias_lineas(self):
+        items = [ItemCarritoDTO(self.telefono.id, 1, 170.0), ItemCarritoDTO(self.forro.id, 2, 8.5)]
+
+        venta_id = self.s_ventas.procesar_venta_carrito(self.id_cliente, items, 37.0, 3, 40)
+
+        self.assertEqual(self.s_inv.obtener_telefono_por_id(self.telefono.id).stock, 2)
+        self.assertEqual(self.s_inv.obtener_telefono_por_id(self.forro.id).stock, 8)
+        with self.db.connection() as conn:
+            total, saldo = conn.execute(
+                "SELECT precio_final_usd, saldo_pendiente_usd FROM ventas WHERE id = ?", (venta_id,)
+            ).fetchone()
+            lineas = conn.execute(
+                "SELECT id_telefono, cantidad, subtotal_usd FROM venta_items WHERE venta_id = ? ORDER BY id",
+                (venta_id,),
+            ).fetchall()
+            cuotas = conn.execute("SELECT COUNT(*) FROM cuotas WHERE venta_id = ?", (venta_id,)).fetchone()[0]
+        self.assertAlmostEqual(total, 187.0)
+        self.assertAlmostEqual(saldo, 150.0)
+        self.assertEqual(lineas, [(self.telefono.id, 1, 170.0), (self.forro.id, 2, 17.0)])
+        self.assertEqual(cuotas, 3)
+
+    def test_historial_muestra_todas_las_lineas(self):
+        items = [ItemCarritoDTO(self.telefono.id, 1, 170.0), ItemCarritoDTO(self.forro.id, 2, 8.5)]
+        self.s_ventas.procesar_venta_carrito(self.id_cliente, items, 37.0, 3, 40)
+
+        (resumen,) = self.s_ventas.obtener_pagina_historial().ventas
+        self.assertEqual(resumen.producto, "Telefono, 2x Forro")
+        (cuenta,) = self.s_ventas.obtener_estado_cuenta(self.id_cliente).ventas
+        self.assertEqual(cuenta.venta.producto, "Telefono, 2x Forro")
+        (credito,) = NotificationService().get_all_credits_status()
+        self.assertEqual(credito.producto_nombre, "Telefono, 2x Forro")
+
+    def test_mismo_producto_a_precios_distintos(self):
+        items = [
+            ItemCarritoDTO(self.forro.id, 2, 8.5),
+            ItemCarritoDTO(self.forro.id, 1, 6.0),
+            ItemCarritoDTO(self.forro.id, 1, 8.5),
+        ]
+
+        venta_id = self.s_ventas.procesar_venta_carrito(self.id_cliente, items, 31.5, 0, 40)
+
+        self.assertEqual(self.s_inv.obtener_telefono_por_id(self.forro.id).stock, 6)
+        with self.db.connection() as conn:
+            total = conn.execute("SELECT precio_final_usd FROM ventas WHERE id = ?", (venta_id,)).fetchone()[0]
+            lineas = conn.execute(
+                "SELECT cantidad, precio_unitario_usd FROM venta_items WHERE venta_id = ? ORDER BY id", (venta_id,)
+            ).fetchall()
+        self.assertAlmostEqual(total, 31.5)
+        self.assertEqual(lineas, [(3, 8.5), (1, 6.0)])
+
+    def test_stock_insuficiente_revierte_todo(self):
+        items = [ItemCarritoDTO(self.forro.id, 1, 8.5), ItemCarritoDTO(self.telefono.id, 4, 170.0)]
+
+        with self.assertRaises(InventoryError):
+            self.s_ventas.procesar_venta_carrito(self.id_cliente, items, 0, 0, 40)
+
+        self.assertEqual(self.s_inv.obtener_telefono_por_id(self.forro.id).stock, 10)
+        with self.db.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM ventas").fetchone()[0], 0)
+
+    def test_actualizar_stock_no_baja_de_cero(self):
+        with self.assertRaises(ValueError):
+            self.s_inv.actualizar_stock(self.telefono.id, -4)
+        self.s_inv.actualizar_stock(self.telefono.id, -3)
+        self.assertEqual(self.s_inv.obtener_telefono_por_id(self.telefono.id).stock, 0)
+
+    def test_procesos_concurrentes_no_sobreventa(self):
+        ctx = multiprocessing.get_context("spawn")
+        resultados = ctx.Queue()
+        procesos = [
+            ctx.Process(target=_vendedor, args=(self.tmp.name, self.id_cliente, self.telefono.id, 3, resultados))
+            for _ in range(4)
+        ]
+        for proceso in procesos:
+            proceso.start()
+        vendidas = sum(resultados.get(timeout=60) for _ in procesos)
+        for proceso in procesos:
+            proceso.join(timeout=60)
+
+        self.assertEqual(vendidas, 3)
+        self.assertEqual(self.s_inv.obtener_telefono_por_id(self.telefono.id).stock, 0)
+        with self.db.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM ventas").fetchone()[0], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
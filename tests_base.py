@@ -0,0 +1,24 @@
+import tempfile
+import unittest
+
+from app.db.database import Database
+
+
+class PruebaConBD(unittest.TestCase):
+    """
+    Base de las pruebas que usan la BD: cada prueba corre sobre una BD nueva en un
+    directorio temporal y al terminar se restaura el DB_DIR original.
+
+    Las subclases que necesitan más preparación llaman a `super().setUp()` primero y
+    a `super().tearDown()` al final.
+    """
+
+    def setUp(self):
+        self.original_dir = Database.DB_DIR
+        self.tmp = tempfile.TemporaryDirectory()
+        Database.reset(self.tmp.name)
+        self.db = Database()
+
+    def tearDown(self):
+        Database.reset(self.original_dir)
+        self.tmp.cleanup()